@@ -0,0 +1,336 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Benchmark suite: times the launcher hot paths against the local stub server (benchmarks/stub_server.py),
+# with a fixed seed, and writes the results to JSON so regressions show up from one run to the next.
+#
+#   python benchmarks/run.py [--seed 1234] [--repeats 5] [--only install,refresh] [--compare results/old.json]
+#
+# Run from the repository root. Everything (Minecraft directory, app storage, downloads) lives in a
+# temporary directory; the network is not used. The refresh benchmark needs Flet and is skipped without it.
+
+import contextlib
+import statistics
+import argparse
+import platform
+import tempfile
+import random
+import shutil
+import json
+import time
+import sys
+import os
+import io
+
+BENCHMARKS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIRECTORY = os.path.join(os.path.dirname(BENCHMARKS_DIRECTORY), "src")
+RESULTS_DIRECTORY = os.path.join(BENCHMARKS_DIRECTORY, "results")
+INSTALLED_VERSIONS = 50 # Fake installed versions for the lookups
+PROFILE_COUNTS = (10, 100, 1000)
+REGRESSION_THRESHOLD = 0.10 # Median slower by more than 10% = regression
+
+sys.path.insert(0, BENCHMARKS_DIRECTORY)
+from stub_server import StubServer, build_dataset, DEFAULT_SEED, DEFAULT_ASSETS, INSTALLABLE_VERSION
+
+
+def measure(function, repeats: int, number: int = 1, setup=None) -> dict:
+    """Runs 'function' 'number' times per repeat (after 'setup()', not timed). Returns per-call timings in seconds."""
+    samples = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    return {"repeats": repeats, "number": number, "min": round(min(samples), 6), "median": round(statistics.median(samples), 6),
+            "mean": round(statistics.fmean(samples), 6), "max": round(max(samples), 6), "samples": [round(s, 6) for s in samples]}
+
+
+
+def get_commit() -> str:
+    try:
+        import subprocess
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=BENCHMARKS_DIRECTORY).stdout.strip() or None
+    except Exception:
+        return None
+
+
+
+class BenchmarkEnvironment():
+    """Temporary app storage and Minecraft directory, with the launcher pointed at the stub server."""
+    def __init__(self, root: str, server_url: str):
+        self.root = root
+        self.server_url = server_url
+        # Read by the launcher modules on import
+        os.environ["FLET_APP_STORAGE_DATA"] = os.path.join(root, "storage")
+        os.environ["FLET_APP_STORAGE_TEMP"] = os.path.join(root, "temp")
+        os.environ["PYZ_MIRROR_URL"] = server_url
+        os.environ["PYZ_LAUNCHER_API"] = f"{server_url}/github"
+        os.environ.pop("PYZ_PROFILE", None)
+        for directory in ("storage", "temp"):
+            os.makedirs(os.path.join(root, directory), exist_ok=True)
+        sys.path.insert(0, SOURCE_DIRECTORY)
+
+        from modules.app_config import app_settings, default_data, AppData
+        self.app_settings = app_settings
+        self.AppData = AppData
+        app_settings.settings = dict(default_data)
+        self.set_minecraft_directory(os.path.join(root, "minecraft"))
+
+    def set_minecraft_directory(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.app_settings.settings[self.AppData.MC_DIRECTORY.value] = path
+
+    def clear_metadata_cache(self):
+        """Drops the cached metadata (files and in-memory HTTP cache) so the next lookup hits the server."""
+        from modules.launcher_core import METADATA_DIRECTORY
+        from modules.http_client import http_client
+        import minecraft_launcher_lib._helper as mll_helper
+        shutil.rmtree(os.path.join(self.root, "storage", METADATA_DIRECTORY), ignore_errors=True)
+        http_client._cache.clear()
+        mll_helper._requests_response_cache.clear()
+
+    def create_installed_versions(self, count: int):
+        """Writes 'count' minimal version JSONs in the 'versions' directory (what the installed lookups read)."""
+        versions_directory = os.path.join(self.app_settings.return_mc_directory(), "versions")
+        for index in range(count):
+            version_id = f"bench-{index}"
+            os.makedirs(os.path.join(versions_directory, version_id), exist_ok=True)
+            with open(os.path.join(versions_directory, version_id, f"{version_id}.json"), "w", encoding="utf-8") as f:
+                json.dump({"id": version_id, "type": "release", "releaseTime": "2024-01-01T00:00:00+00:00"}, f)
+
+    def create_launcher_profiles(self, count: int, seed: int):
+        """Writes a launcher_profiles.json with 'count' custom profiles (and the two default ones)."""
+        rng = random.Random(seed)
+        profiles = {"latest-release": {"name": "", "type": "latest-release", "lastVersionId": "latest-release"},
+                    "latest-snapshot": {"name": "", "type": "latest-snapshot", "lastVersionId": "latest-snapshot"}}
+        for index in range(count):
+            version_id = rng.choice([INSTALLABLE_VERSION, f"bench-{rng.randrange(INSTALLED_VERSIONS)}", f"fabric-loader-0.16.5-{INSTALLABLE_VERSION}"])
+            profiles[f"profile-{index}"] = {"name": f"Profile {index}", "type": "custom", "lastVersionId": version_id,
+                                            "created": "2024-01-01T00:00:00.000Z", "lastUsed": "2024-01-01T00:00:00.000Z", "icon": "Grass"}
+        with open(os.path.join(self.app_settings.return_mc_directory(), "launcher_profiles.json"), "w", encoding="utf-8") as f:
+            json.dump({"profiles": profiles, "version": 3}, f)
+
+
+
+# ----- Benchmarks -----
+
+
+def bench_get_versions(env: BenchmarkEnvironment, args) -> dict:
+    from modules.launcher_core import get_versions
+    return {
+        "cold": measure(lambda: get_versions(), args.repeats, setup=env.clear_metadata_cache),
+        "warm": measure(lambda: get_versions(), args.repeats, number=20),
+        "fabric_cold": measure(lambda: get_versions("fabric"), args.repeats, setup=env.clear_metadata_cache),
+    }
+
+
+
+def bench_is_version_installed(env: BenchmarkEnvironment, args) -> dict:
+    from modules.launcher_core import is_version_installed
+    return {
+        "installed_versions": INSTALLED_VERSIONS,
+        "version_id": measure(lambda: is_version_installed(f"bench-{INSTALLED_VERSIONS - 1}"), args.repeats, number=20),
+        "latest_release": measure(lambda: is_version_installed("latest-release"), args.repeats, number=20),
+    }
+
+
+
+def bench_check_version(env: BenchmarkEnvironment, args) -> dict:
+    from modules.launcher_core import check_version
+    fabric_version = f"fabric-loader-0.16.5-{INSTALLABLE_VERSION}"
+    check_version(fabric_version) # Loader metadata cached by the first call
+    return {
+        "vanilla": measure(lambda: check_version(INSTALLABLE_VERSION), args.repeats, number=50),
+        "fabric": measure(lambda: check_version(fabric_version), args.repeats, number=50),
+        "not_compatible": measure(lambda: check_version("unknown-version"), args.repeats, number=50),
+    }
+
+
+
+def bench_install(env: BenchmarkEnvironment, args) -> dict:
+    from modules.install_queue import InstallQueue
+    directories = [0]
+    failures = []
+
+    def setup():
+        directories[0] += 1
+        env.set_minecraft_directory(os.path.join(env.root, f"install-{directories[0]}"))
+
+    def run():
+        queue = InstallQueue(concurrency=1)
+        queue.add([INSTALLABLE_VERSION])
+        failures.append(queue.run())
+
+    result = measure(run, args.install_repeats, setup=setup)
+    total_bytes = args.dataset["asset_bytes"] + args.dataset["client_bytes"] + sum(
+        os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(os.path.join(env.root, f"install-{directories[0]}", "libraries")) for name in names)
+    env.set_minecraft_directory(os.path.join(env.root, "minecraft"))
+    for index in range(1, directories[0] + 1):
+        shutil.rmtree(os.path.join(env.root, f"install-{index}"), ignore_errors=True)
+    return {"install": result, "failed_jobs": sum(failures), "files": args.dataset["assets"] + args.dataset["libraries"] + 1,
+            "bytes": total_bytes, "mb_per_second": round(total_bytes / (1024 * 1024) / result["median"], 1)}
+
+
+
+def bench_refresh(env: BenchmarkEnvironment, args) -> dict:
+    try:
+        from modules.refresh_handler import refresh, refresh_list
+        from views.launcher_profiles_view import LauncherProfilesView
+    except ImportError as e:
+        return {"skipped": f"Flet is not available ({e})"}
+
+    class Page():
+        # What the views use of ft.Page, without a window
+        title = "PyZ Launcher"
+        def update(self, *controls):
+            pass
+        def error(self, message: str):
+            raise RuntimeError(message)
+
+    page = Page()
+    env.app_settings.page = page
+    view = LauncherProfilesView(page)
+    refresh_list.clear()
+    refresh_list.append(view.refresh_ui)
+    results = {}
+    for count in PROFILE_COUNTS:
+        env.create_launcher_profiles(count, args.seed)
+        results[f"profiles_{count}"] = measure(refresh, args.repeats)
+    refresh_list.clear()
+    return results
+
+
+
+def bench_updater(env: BenchmarkEnvironment, args) -> dict:
+    from modules.app_config import LAUNCHER_REPOSITORY_API
+    from modules.http_client import http_client
+    sys.path.insert(0, os.path.join(SOURCE_DIRECTORY, "update"))
+    from updater_process import plan_jobs, extract_members
+    zip_path = os.path.join(env.root, "temp", "update.zip")
+    extract_directory = os.path.join(env.root, "temp", "extracted")
+
+    def download():
+        release = http_client.get(f"{LAUNCHER_REPOSITORY_API}/releases/latest").json()
+        response = http_client.get(f"{env.server_url}/github/download/{release['assets'][0]['name']}", stream=True)
+        response.raise_for_status()
+        with open(zip_path, "wb") as f:
+            for data in response.iter_content(chunk_size=64 * 1024):
+                f.write(data)
+
+    def extract():
+        extract_members(zip_path, plan_jobs(zip_path, extract_directory))
+
+    download()
+    results = {
+        "download": measure(download, args.repeats),
+        "extract": measure(extract, args.repeats, setup=lambda: shutil.rmtree(extract_directory, ignore_errors=True)),
+        "zip_bytes": os.path.getsize(zip_path), "files": args.dataset["release_files"], "bytes": args.dataset["release_bytes"],
+    }
+    results["extract_mb_per_second"] = round(args.dataset["release_bytes"] / (1024 * 1024) / results["extract"]["median"], 1)
+    return results
+
+
+
+BENCHMARKS = {
+    "get_versions": bench_get_versions,
+    "is_version_installed": bench_is_version_installed,
+    "check_version": bench_check_version,
+    "install": bench_install,
+    "refresh": bench_refresh,
+    "updater": bench_updater,
+}
+
+
+# ----- Comparison -----
+
+
+def iter_medians(results: dict, prefix: str = ""):
+    """Yields (name, median) for every timing of a result tree."""
+    for key, value in results.items():
+        if isinstance(value, dict):
+            if "median" in value:
+                yield f"{prefix}{key}", value["median"]
+            else:
+                yield from iter_medians(value, f"{prefix}{key}.")
+
+
+
+def compare(previous: dict, current: dict, threshold: float) -> list[str]:
+    """Prints the median changes between two runs. Returns the names of the regressions."""
+    old = dict(iter_medians(previous["results"]))
+    regressions = []
+    for name, median in iter_medians(current["results"]):
+        if name not in old or not old[name]:
+            continue
+        change = median / old[name] - 1
+        flag = "REGRESSION" if change > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:45} {old[name] * 1000:10.3f} ms -> {median * 1000:10.3f} ms  {change:+7.1%} {flag}")
+    return regressions
+
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Launcher benchmarks against a local stub server")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--assets", type=int, default=DEFAULT_ASSETS, help="Asset objects in the data set")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--install-repeats", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency per request, in milliseconds")
+    parser.add_argument("--only", help=f"Comma separated benchmarks ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", help="Previous results file: print the changes and exit with 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="Regression threshold (0.10 = 10%% slower)")
+    parser.add_argument("--verbose", action="store_true", help="Show the launcher output (on stderr)")
+    args = parser.parse_args(argv)
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory(prefix="pyz-bench-") as root:
+        args.dataset = build_dataset(os.path.join(root, "stub"), args.seed, args.assets)
+        server = StubServer(os.path.join(root, "stub"), latency=args.latency / 1000).start()
+        env = BenchmarkEnvironment(os.path.join(root, "env"), server.url)
+        env.create_installed_versions(INSTALLED_VERSIONS)
+        report = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": get_commit(), "python": platform.python_version(),
+                  "platform": platform.platform(), "cpu_count": os.cpu_count(), "seed": args.seed, "dataset": args.dataset,
+                  "options": {"repeats": args.repeats, "install_repeats": args.install_repeats, "latency_ms": args.latency}, "results": {}}
+        try:
+            for name in names:
+                print(f"Running {name}...", file=sys.stderr)
+                output = contextlib.redirect_stdout(sys.stderr) if args.verbose else contextlib.redirect_stdout(io.StringIO())
+                with output:
+                    report["results"][name] = BENCHMARKS[name](env, args)
+        finally:
+            server.stop()
+        report["stub_misses"] = sorted(set(server.misses))
+
+    output_path = args.output if args.output else os.path.join(RESULTS_DIRECTORY, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    for name, median in iter_medians(report["results"]):
+        print(f"{name:45} {median * 1000:10.3f} ms")
+    for name, result in report["results"].items():
+        if "skipped" in result:
+            print(f"{name:45} skipped: {result['skipped']}")
+    print(f"Results: {output_path}")
+    if report["stub_misses"]:
+        print(f"Warning: {len(report['stub_misses'])} requests were not in the data set: {report['stub_misses'][:5]}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regressions above {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Local stand-in for the Mojang / Fabric / GitHub endpoints used by the benchmarks.
+#
+# build_dataset() writes a deterministic data set (same seed = same bytes) with the layout of the LAN
+# mirror (modules/mirrors.KNOWN_ENDPOINTS), so the launcher is pointed at it with PYZ_MIRROR_URL and
+# runs its real code paths without touching the network:
+#
+#   meta/launchermeta/mc/game/version_manifest_v2.json     version manifest (VERSIONS entries)
+#   meta/piston-meta/v1/packages/<sha1>/<id>.json           version JSON of INSTALLABLE_VERSION
+#   meta/piston-meta/v1/packages/<sha1>/<assets>.json       asset index
+#   data/piston-data/v1/objects/<sha1>/client.jar           client jar
+#   libraries/...                                           libraries
+#   assets/<sha1[:2]>/<sha1>                                asset objects
+#   fabric-meta/v2/versions/game | loader                   Fabric metadata
+#   github/releases/latest, github/download/portable.zip    launcher release (updater)
+#
+#   python benchmarks/stub_server.py [--port 8080] [--seed 1234] [--assets 2000]
+
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import functools
+import threading
+import argparse
+import tempfile
+import hashlib
+import zipfile
+import random
+import json
+import time
+import os
+
+DEFAULT_SEED = 1234
+VERSIONS = 800 # Entries of the version manifest
+INSTALLABLE_VERSION = "1.21.4"
+ASSET_INDEX_ID = "19"
+DEFAULT_ASSETS = 2000
+ASSET_SIZES = (256, 16 * 1024)
+LIBRARIES = 40
+LIBRARY_SIZES = (16 * 1024, 512 * 1024)
+CLIENT_SIZE = 4 * 1024 * 1024
+LOADER_VERSIONS = 50
+RELEASE_TAG = "v9.9.9"
+RELEASE_FILES = 300
+RELEASE_FILE_SIZES = (1024, 256 * 1024)
+
+
+def write_file(root: str, path: str, data: bytes) -> str:
+    """Writes 'data' at 'path' (mirror layout, '/' separated) under 'root'. Returns the SHA-1."""
+    file_path = os.path.join(root, *path.split("/"))
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "wb") as f:
+        f.write(data)
+    return hashlib.sha1(data).hexdigest()
+
+
+
+def write_json(root: str, path: str, data) -> str:
+    """Writes a JSON document. Returns the SHA-1."""
+    return write_file(root, path, json.dumps(data, indent=1).encode("utf-8"))
+
+
+
+def version_ids(rng: random.Random) -> list[tuple[str, str]]:
+    """Returns (id, type) pairs shaped like the real manifest, newest first."""
+    versions = []
+    for minor in range(21, 0, -1):
+        for patch in range(rng.randint(1, 6), -1, -1):
+            versions.append((f"1.{minor}.{patch}" if patch else f"1.{minor}", "release"))
+    versions = [(INSTALLABLE_VERSION, "release")] + [v for v in versions if v[0] != INSTALLABLE_VERSION]
+    week = 0
+    while len(versions) < VERSIONS * 0.8:
+        week += 1
+        versions.append((f"{24 - week // 52}w{week % 52 + 1:02d}a", "snapshot"))
+    while len(versions) < VERSIONS * 0.9:
+        versions.append((f"b1.{len(versions) % 9}.{len(versions)}", "old_beta"))
+    while len(versions) < VERSIONS:
+        versions.append((f"a1.{len(versions) % 3}.{len(versions)}", "old_alpha"))
+    return versions
+
+
+
+def build_dataset(root: str, seed: int = DEFAULT_SEED, assets: int = DEFAULT_ASSETS) -> dict:
+    """Writes the data set into 'root'. Returns a summary (seed, counts, total bytes)."""
+    rng = random.Random(seed)
+
+    # Asset objects and index
+    objects = {}
+    for index in range(assets):
+        data = rng.randbytes(rng.randint(*ASSET_SIZES))
+        sha1 = hashlib.sha1(data).hexdigest()
+        write_file(root, f"assets/{sha1[:2]}/{sha1}", data)
+        objects[f"minecraft/sounds/bench/{index}.ogg"] = {"hash": sha1, "size": len(data)}
+    content = json.dumps({"objects": objects}).encode("utf-8")
+    index_sha1 = hashlib.sha1(content).hexdigest()
+    write_file(root, f"meta/piston-meta/v1/packages/{index_sha1}/{ASSET_INDEX_ID}.json", content)
+
+    # Libraries and client jar
+    libraries = []
+    for index in range(LIBRARIES):
+        data = rng.randbytes(rng.randint(*LIBRARY_SIZES))
+        path = f"com/example/bench/lib{index}/1.{index}/lib{index}-1.{index}.jar"
+        sha1 = write_file(root, f"libraries/{path}", data)
+        libraries.append({"name": f"com.example.bench:lib{index}:1.{index}", "downloads": {"artifact": {
+            "path": path, "url": f"https://libraries.minecraft.net/{path}", "sha1": sha1, "size": len(data)}}})
+    client = rng.randbytes(CLIENT_SIZE)
+    client_sha1 = hashlib.sha1(client).hexdigest()
+    write_file(root, f"data/piston-data/v1/objects/{client_sha1}/client.jar", client)
+
+    # Version JSON and manifest
+    version = {
+        "id": INSTALLABLE_VERSION, "type": "release", "mainClass": "net.minecraft.client.main.Main",
+        "assets": ASSET_INDEX_ID, "complianceLevel": 1, "minimumLauncherVersion": 21,
+        "releaseTime": "2024-12-03T10:12:57+00:00", "time": "2024-12-03T10:12:57+00:00",
+        "assetIndex": {"id": ASSET_INDEX_ID, "sha1": index_sha1, "size": len(content), "totalSize": sum(o["size"] for o in objects.values()),
+                       "url": f"https://piston-meta.mojang.com/v1/packages/{index_sha1}/{ASSET_INDEX_ID}.json"},
+        "downloads": {"client": {"sha1": client_sha1, "size": len(client), "url": f"https://piston-data.mojang.com/v1/objects/{client_sha1}/client.jar"}},
+        "libraries": libraries,
+        "arguments": {"game": ["--username", "${auth_player_name}", "--version", "${version_name}", "--gameDir", "${game_directory}",
+                               "--assetsDir", "${assets_root}", "--assetIndex", "${assets_index_name}", "--uuid", "${auth_uuid}",
+                               "--accessToken", "${auth_access_token}"],
+                      "jvm": ["-Djava.library.path=${natives_directory}", "-cp", "${classpath}"]},
+    }
+    versions = []
+    for position, (version_id, version_type) in enumerate(version_ids(rng)):
+        if version_id == INSTALLABLE_VERSION:
+            content = json.dumps(version, indent=1).encode("utf-8")
+            sha1 = write_file(root, f"meta/piston-meta/v1/packages/{hashlib.sha1(content).hexdigest()}/{version_id}.json", content)
+        else:
+            sha1 = hashlib.sha1(f"{seed}-{version_id}".encode()).hexdigest() # Listed only, not served
+        versions.append({"id": version_id, "type": version_type, "url": f"https://piston-meta.mojang.com/v1/packages/{sha1}/{version_id}.json",
+                         "time": "2024-12-03T10:12:57+00:00", "releaseTime": f"20{24 - position // 40:02d}-01-01T00:00:00+00:00",
+                         "sha1": sha1, "complianceLevel": 1})
+    latest_snapshot = next(v["id"] for v in versions if v["type"] == "snapshot")
+    write_json(root, "meta/launchermeta/mc/game/version_manifest_v2.json",
+               {"latest": {"release": INSTALLABLE_VERSION, "snapshot": latest_snapshot}, "versions": versions})
+
+    # Fabric metadata
+    write_json(root, "fabric-meta/v2/versions/game", [{"version": v["id"], "stable": v["type"] == "release"} for v in versions[:300]])
+    write_json(root, "fabric-meta/v2/versions/loader", [{"separator": ".", "build": build, "maven": f"net.fabricmc:fabric-loader:0.{16 - build // 10}.{build % 10}",
+                                                         "version": f"0.{16 - build // 10}.{build % 10}", "stable": build % 7 != 0}
+                                                        for build in range(LOADER_VERSIONS)])
+
+    # Launcher release (GitHub API and portable zip)
+    zip_path = os.path.join(root, "github", "download", "portable.zip")
+    os.makedirs(os.path.dirname(zip_path), exist_ok=True)
+    release_bytes = 0
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for index in range(RELEASE_FILES):
+            # Half random (incompressible, like compiled code), half text
+            size = rng.randint(*RELEASE_FILE_SIZES)
+            data = rng.randbytes(size) if index % 2 else (f"# bench file {index}\n" * (size // 16)).encode()
+            archive.writestr(f"app/lib/module_{index}.bin" if index % 2 else f"app/data/file_{index}.txt", data)
+            release_bytes += len(data)
+    write_json(root, "github/releases/latest", {"tag_name": RELEASE_TAG, "name": RELEASE_TAG, "body": "Benchmark release",
+                                                "assets": [{"name": "portable.zip", "size": os.path.getsize(zip_path)}]})
+
+    return {"seed": seed, "versions": len(versions), "libraries": LIBRARIES, "assets": assets,
+            "asset_bytes": sum(o["size"] for o in objects.values()), "client_bytes": len(client),
+            "release_files": RELEASE_FILES, "release_bytes": release_bytes}
+
+
+
+class StubRequestHandler(SimpleHTTPRequestHandler):
+    """Serves the data set (with Last-Modified / If-Modified-Since), optionally with an added latency."""
+    latency = 0.0
+    misses: list[str] = []
+
+    def send_head(self):
+        if self.latency:
+            time.sleep(self.latency)
+        return super().send_head()
+
+    def send_error(self, code, message=None, explain=None):
+        if code == 404:
+            self.misses.append(self.path)
+        super().send_error(code, message, explain)
+
+    def log_message(self, format, *args):
+        pass
+
+
+
+class StubServer():
+    """Data set served on 127.0.0.1 from a background thread."""
+    def __init__(self, root: str, port: int = 0, latency: float = 0.0):
+        handler = type("Handler", (StubRequestHandler,), {"latency": latency, "misses": []})
+        self.handler = handler
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), functools.partial(handler, directory=root))
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @property
+    def misses(self) -> list[str]:
+        """Paths requested but not in the data set (the launcher then falls back to the public endpoint)."""
+        return self.handler.misses
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the benchmark data set (mirror layout)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--assets", type=int, default=DEFAULT_ASSETS)
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency per request, in milliseconds")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="pyz-bench-") as root:
+        print(json.dumps(build_dataset(root, args.seed, args.assets)))
+        server = StubServer(root, args.port, args.latency / 1000).start()
+        print(f"Serving on {server.url} (PYZ_MIRROR_URL={server.url}, PYZ_LAUNCHER_API={server.url}/github)")
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            server.stop()
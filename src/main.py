@@ -4,6 +4,7 @@
 
 import flet as ft
 from modules.app_config import *
+from modules.app_logging import setup_logging
 from modules.refresh_handler import *
 from widgets.app import WindowTittleBar
 
@@ -117,4 +118,5 @@ def main(page: ft.Page):
     refresh()
 
 if __name__ == "__main__":
+    setup_logging()
     ft.app(target=main, assets_dir="assets")
\ No newline at end of file
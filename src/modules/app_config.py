@@ -2,21 +2,29 @@
 # Copyright (c) 2026 Zadkiel Avendano and collaborators
 # License-Identifier: MIT License
 
-import flet as ft
 from enum import Enum
+from typing import TYPE_CHECKING
 import random
 import uuid
 import os
 import pathlib
+import logging
 import platform
 
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING: # Flet is only needed by the UI, the headless CLI runs without it
+    import flet as ft
+
 app_name = "PyZ Launcher"
 app_version = "v0.5.2-alpha" # Enter 'dev' in the name to test
 dev_mode = True if "dev" in app_version else False
 
 SETTINGS_KEY = "pyz.minecraftlauncher.settings"
 LAUNCHER_REPOSITORY = "https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft"
-LAUNCHER_REPOSITORY_API = "https://api.github.com/repos/ZadkielAvendano/PyZ-Launcher-for-Minecraft"
+# The API base can be overridden (e.g. to point the update check at a local stub server)
+LAUNCHER_REPOSITORY_API = os.getenv("PYZ_LAUNCHER_API", "https://api.github.com/repos/ZadkielAvendano/PyZ-Launcher-for-Minecraft").rstrip("/")
+UPDATE_CHECK_INTERVAL = 6 * 60 * 60 # Minimum seconds between two release checks against the API
 
 default_data = {
     "username": f"Player{random.randrange(100, 1000)}",
@@ -26,14 +34,34 @@ default_data = {
     "minecraftDirectory": "", # Empty for the default Minecraft directory
     "executablePath": "", # Empty for the default Java directory
     "jvmArguments": ["-Xmx2G", "-Xms2G"], # JVM Arguments
-    "checkUpdatesOnStartup": True
+    "checkUpdatesOnStartup": True,
+    "installConcurrency": 2, # Versions installed at the same time by the install queue
+    "mirrorUrl": "", # LAN mirror (e.g. "http://192.168.1.10:25580"), empty to use the public endpoints
+    "mirrorRules": [], # Extra rewrite rules: [{"from": "https://libraries.minecraft.net/", "to": "http://host/libraries/"}]
+    "serveCache": False, # Serve this launcher's game files to the LAN (cache server)
+    "serveCachePort": 25580,
+    "profileModSets": {}, # Mod set of each launcher profile: {profile name: mod set name}
+    "backupWorlds": False, # Incremental backup of the worlds after the game closes
+    "backupKeep": 10, # Snapshots kept per world
+    "metricsTextfile": "", # Prometheus textfile (node_exporter textfile collector), empty to disable
+    "profiling": False # Profile the install / launch / refresh hot paths into 'logs/profiles' (see modules/profiling.py)
     }
 
 try:
     FLET_APP_STORAGE_DATA = os.getenv("FLET_APP_STORAGE_DATA")
     FLET_APP_STORAGE_TEMP = os.getenv("FLET_APP_STORAGE_TEMP")
 except Exception as e:
-    print(f"Error: {e}")
+    logger.error(f"Error: {e}")
+
+def get_app_storage_path(*paths: str) -> str:
+    """
+    Returns a path inside the app storage directory (FLET_APP_STORAGE_DATA, or 'storage' in the working directory when it is not set).
+    """
+    storage_directory = FLET_APP_STORAGE_DATA or os.path.join(os.getcwd(), "storage")
+    if not os.path.exists(storage_directory):
+        os.makedirs(storage_directory)
+    return os.path.join(storage_directory, *paths)
+
 
 class AppData(Enum):
     """
@@ -47,13 +75,23 @@ class AppData(Enum):
     EXECUTABLE_PATH = "executablePath"
     JVM_ARGUMENTS = "jvmArguments"
     CHECK_UPDATES_ON_STARTUP = "checkUpdatesOnStartup"
+    INSTALL_CONCURRENCY = "installConcurrency"
+    MIRROR_URL = "mirrorUrl"
+    MIRROR_RULES = "mirrorRules"
+    SERVE_CACHE = "serveCache"
+    SERVE_CACHE_PORT = "serveCachePort"
+    PROFILE_MOD_SETS = "profileModSets"
+    BACKUP_WORLDS = "backupWorlds"
+    BACKUP_KEEP = "backupKeep"
+    METRICS_TEXTFILE = "metricsTextfile"
+    PROFILING = "profiling"
 
 
 class Settings():
     """
     Manages application settings, including loading, saving, and retrieving stored configurations.
     """
-    def __init__(self, page: ft.Page = None, settings: dict = None, views: dict = None):
+    def __init__(self, page: "ft.Page" = None, settings: dict = None, views: dict = None):
         self.page = page
         self.settings = settings
         self.views: dict = views if views else {}
@@ -67,7 +105,7 @@ class Settings():
         else:
             self.page.client_storage.set(SETTINGS_KEY, default_data)
             self.settings = self.page.client_storage.get(SETTINGS_KEY)
-        print(f"Settings loaded: {self.settings}")
+        logger.debug(f"Settings loaded: {self.settings}")
 
     def save_settings(self, key: AppData, save: str):
         """
@@ -77,9 +115,9 @@ class Settings():
             self.settings[key.value] = save
             self.page.client_storage.set(SETTINGS_KEY, self.settings)
             self.settings = self.page.client_storage.get(SETTINGS_KEY)
-            print(f"Settings saved: {self.settings}")
+            logger.debug(f"Settings saved: {self.settings}")
         except Exception as e:
-            print(f"An error occurred while saving data. {e}")
+            logger.error(f"An error occurred while saving data. {e}")
 
     def get_setting(self, setting: AppData):
         """
@@ -88,7 +126,7 @@ class Settings():
         try:
             return self.settings[setting.value]
         except Exception as e:
-            print(f"Data type not found. {e}")
+            logger.error(f"Data type not found. {e}")
             self.save_settings(setting, default_data[setting.value])
             return default_data[setting.value]
         
@@ -118,17 +156,17 @@ class Settings():
                 return minecraft_directory
             
         except Exception as e:
-            print(f"Error: {e}")
+            logger.error(f"Error: {e}")
             return ""
 
             
 
 app_settings = Settings()
 
-def init_settings(page: ft.Page):
+def init_settings(page: "ft.Page"):
     """
     Initializes application settings for the given UI page and ensures Minecraft directory availability.
     """
     app_settings.page = page
     app_settings.load_settings()
-    print("MINECRAFT DIRECTORY:", app_settings.return_mc_directory())
\ No newline at end of file
+    logger.info(f"Minecraft directory: {app_settings.return_mc_directory()}")
\ No newline at end of file
@@ -0,0 +1,136 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Logging backend (no Flet).
+#
+# Every module logs through its own logger (logging.getLogger(__name__)). setup_logging() gives the
+# root logger a QueueHandler, so the thread that logs (UI, install workers, game watcher) only puts
+# the record in a queue; a QueueListener thread writes it to the console and to 'logs/launcher.log'
+# in the app storage. The file rotates by size and the rotated files are gzipped by another
+# background thread (launcher.log.1.gz is the most recent).
+#
+# Extra fields are appended to the message as key=value pairs:
+#   logger.info("Installing mod loader version", extra={"version": version_id, "loader": "fabric"})
+#
+# The log level is INFO, or the PYZ_LOG_LEVEL environment variable (DEBUG, WARNING...).
+
+from modules.app_config import *
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor, Future
+import logging
+import atexit
+import shutil
+import queue
+import gzip
+import json
+import sys
+
+LOGS_DIRECTORY = "logs"
+LOG_FILE = "launcher.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024 # Size at which the log file is rotated
+LOG_BACKUPS = 5 # Rotated (gzipped) files kept
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+# Attributes every LogRecord has: anything else was passed with 'extra'
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+def get_log_file_path() -> str:
+    """Returns the path of the current launcher log file."""
+    return get_app_storage_path(LOGS_DIRECTORY, LOG_FILE)
+
+
+
+class StructuredFormatter(logging.Formatter):
+    """Appends the 'extra' fields of a record to its message as key=value pairs (values as JSON)."""
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        fields = [f"{key}={json.dumps(value, default=str, ensure_ascii=False)}" for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES]
+        return f"{message} {' '.join(fields)}" if fields else message
+
+
+
+class GzipRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler whose rotated files are gzipped by a background thread."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = self.__rotate
+        self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyz-log-gzip")
+        self._compression: Future = None
+
+    def doRollover(self):
+        # The previous file must be compressed before the backups are shifted
+        if self._compression is not None:
+            self._compression.result()
+        super().doRollover()
+
+    def __rotate(self, source: str, destination: str):
+        # Only the rename happens on the listener thread
+        uncompressed = destination[:-len(".gz")]
+        os.replace(source, uncompressed)
+        try:
+            self._compression = self._compressor.submit(self.__compress, uncompressed, destination)
+        except RuntimeError: # Interpreter shutting down
+            self.__compress(uncompressed, destination)
+
+    @staticmethod
+    def __compress(source: str, destination: str):
+        try:
+            with open(source, "rb") as f, gzip.open(f"{destination}.part", "wb") as compressed:
+                shutil.copyfileobj(f, compressed, 1024 * 1024)
+            os.replace(f"{destination}.part", destination)
+            os.remove(source)
+        except OSError as e:
+            sys.stderr.write(f"Could not compress the log file {source}: {e}\n")
+
+    def close(self):
+        super().close()
+        self._compressor.shutdown(wait=True)
+
+
+
+_listeners: list[QueueListener] = []
+
+def start_queue_handler(*handlers: logging.Handler) -> QueueHandler:
+    """Returns a QueueHandler whose records are written to 'handlers' by a background listener thread."""
+    records = queue.SimpleQueue()
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    return QueueHandler(records)
+
+
+
+def stop_logging():
+    """Writes the queued records and stops the listener threads (called at exit)."""
+    while _listeners:
+        listener = _listeners.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+atexit.register(stop_logging)
+
+
+
+def setup_logging(console: bool = True, level: str = None):
+    """Routes the logs of every module to the console (stderr) and the rotating log file. Safe to call twice."""
+    root = logging.getLogger()
+    if any(isinstance(handler, QueueHandler) for handler in root.handlers):
+        return
+    path = get_log_file_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    file_handler = GzipRotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+    handlers = [file_handler]
+    if console:
+        handlers.append(logging.StreamHandler(sys.stderr))
+    for handler in handlers:
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    # The extra fields are rendered on the logging thread, the rest of the line by the listener
+    queue_handler = start_queue_handler(*handlers)
+    queue_handler.setFormatter(StructuredFormatter())
+    root.addHandler(queue_handler)
+    root.setLevel((level or os.getenv("PYZ_LOG_LEVEL") or "INFO").upper())
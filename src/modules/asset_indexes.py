@@ -0,0 +1,224 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Asset index reading (no Flet, no network).
+#
+# Modern asset indexes list thousands of objects. Instead of json.load() building the whole dict, the
+# index is parsed as a stream: one "objects" entry at a time is decoded and yielded as an AssetObject
+# (hash, size, path) to the download, verify and gc pipelines. While streaming, the objects are packed
+# into a binary cache in the app storage, which later reads memory-map, column by column:
+#
+#   header   magic, source size, source mtime (ns), object count, path text length
+#   hashes   SHA-1 digests (20 bytes each)
+#   sizes    object sizes (uint64, native byte order: the cache never leaves the machine)
+#   lengths  path lengths in characters (uint32)
+#   text     the object paths, concatenated (UTF-8)
+#
+# The cache is valid while the index file keeps its size and modification time.
+
+from modules.app_config import *
+from modules.metrics import metrics
+from typing import Iterator, NamedTuple
+import itertools
+import hashlib
+import struct
+import array
+import codecs
+import mmap
+import json
+import threading
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+ASSET_INDEX_CACHE_DIRECTORY = "asset_index_cache"
+CACHE_MAGIC = b"PYZAIDX2"
+HEADER = struct.Struct("<8sQqII")
+CHUNK_SIZE = 256 * 1024 # Characters decoded per read while streaming
+WHITESPACE = " \t\n\r"
+# Fast path for the usual shape of an entry (name without escapes, hash then size); anything else goes through the JSON decoder
+ENTRY_PATTERN = re.compile(r'\s*"([^"\\]*)"\s*:\s*\{\s*"hash"\s*:\s*"([0-9a-f]{40})"\s*,\s*"size"\s*:\s*(\d+)\s*\}\s*([,}])')
+
+
+class AssetObject(NamedTuple):
+    """An object of an asset index."""
+    hash: str
+    size: int
+    path: str
+
+
+class _JsonStream():
+    """Minimal pull parser over a text file: strings and complete values, reading more text as needed."""
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Appends the next chunk (dropping the consumed text). Returns False at the end of the file."""
+        if self.eof:
+            return False
+        data = self.file.read(self.chunk_size)
+        self.eof = not data
+        self.buffer = self.buffer[self.position:] + self.decoder.decode(data, final=self.eof)
+        self.position = 0
+        return True
+
+    def next_char(self) -> str:
+        """Skips whitespace and returns the next character without consuming it ('' at the end)."""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """Consumes one of 'characters'."""
+        char = self.next_char()
+        if not char or char not in characters:
+            raise ValueError(f"Expected one of {characters!r} at offset {self.position}, found {char!r}")
+        self.position += 1
+        return char
+
+    def string(self) -> str:
+        self.expect('"')
+        while True:
+            try:
+                value, end = json.decoder.scanstring(self.buffer, self.position)
+                self.position = end
+                return value
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+
+    def value(self):
+        self.next_char()
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buffer, self.position)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+
+def iter_asset_index_json(path: str) -> Iterator[AssetObject]:
+    """Parses an asset index as a stream, yielding its objects in file order."""
+    with open(path, "rb") as f:
+        stream = _JsonStream(f)
+        stream.expect("{")
+        if stream.next_char() == "}":
+            return
+        while True:
+            key = stream.string()
+            stream.expect(":")
+            if key == "objects":
+                stream.expect("{")
+                if stream.next_char() != "}":
+                    while True:
+                        match = ENTRY_PATTERN.match(stream.buffer, stream.position)
+                        if match:
+                            stream.position = match.end()
+                            yield AssetObject(match[2], int(match[3]), match[1])
+                            if match[4] == "}":
+                                break
+                            continue
+                        name = stream.string()
+                        stream.expect(":")
+                        asset = stream.value()
+                        yield AssetObject(asset["hash"], asset.get("size", 0), name)
+                        if stream.expect(",}") == "}":
+                            break
+                else:
+                    stream.expect("}")
+            else:
+                stream.value() # "virtual", "map_to_resources" (legacy indexes)
+            if stream.expect(",}") == "}":
+                return
+
+
+
+def get_asset_index_cache_path(index_path: str) -> str:
+    """Returns the binary cache file of an asset index (one per index file, whatever the Minecraft directory)."""
+    name = os.path.splitext(os.path.basename(index_path))[0]
+    digest = hashlib.sha1(os.path.abspath(index_path).encode("utf-8")).hexdigest()[:12]
+    return get_app_storage_path(ASSET_INDEX_CACHE_DIRECTORY, f"{name}-{digest}.bin")
+
+
+
+def read_asset_index_cache(cache_path: str, source_size: int, source_mtime: int) -> list[AssetObject]:
+    """Returns the objects of a binary cache, or None if it is missing or was made from another index file."""
+    try:
+        with open(cache_path, "rb") as f:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    with view:
+        if len(view) < HEADER.size:
+            return None
+        magic, size, mtime, count, text_length = HEADER.unpack_from(view, 0)
+        hashes_start = HEADER.size
+        sizes_start = hashes_start + count * 20
+        lengths_start = sizes_start + count * 8
+        text_start = lengths_start + count * 4
+        if magic != CACHE_MAGIC or size != source_size or mtime != source_mtime or len(view) != text_start + text_length:
+            return None
+        # One call per column
+        hashes = view[hashes_start:sizes_start].hex()
+        sizes = array.array("Q", view[sizes_start:lengths_start])
+        lengths = array.array("I", view[lengths_start:text_start])
+        text = view[text_start:].decode("utf-8")
+    ends = list(itertools.accumulate(lengths))
+    starts = [0] + ends[:-1]
+    return list(map(AssetObject, [hashes[i:i + 40] for i in range(0, count * 40, 40)], sizes, map(text.__getitem__, map(slice, starts, ends))))
+
+
+
+def iter_asset_index(index_path: str) -> Iterator[AssetObject]:
+    """
+    Yields the objects of an asset index: from its binary cache when it is current, otherwise by
+    streaming the JSON (the cache is then written once the whole index has been read).
+    """
+    stat = os.stat(index_path)
+    cache_path = get_asset_index_cache_path(index_path)
+    cached = read_asset_index_cache(cache_path, stat.st_size, stat.st_mtime_ns)
+    if cached is not None:
+        metrics.inc("cache_requests_total", cache="asset_index", result="hit")
+        yield from cached
+        return
+    metrics.inc("cache_requests_total", cache="asset_index", result="miss")
+
+    hashes, sizes, lengths, paths = bytearray(), array.array("Q"), array.array("I"), []
+    for asset in iter_asset_index_json(index_path):
+        hashes += bytes.fromhex(asset.hash)
+        sizes.append(asset.size)
+        lengths.append(len(asset.path))
+        paths.append(asset.path)
+        yield asset
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            text = "".join(paths).encode("utf-8")
+            f.write(HEADER.pack(CACHE_MAGIC, stat.st_size, stat.st_mtime_ns, len(paths), len(text)))
+            f.write(hashes)
+            f.write(sizes.tobytes())
+            f.write(lengths.tobytes())
+            f.write(text)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write the asset index cache {cache_path}: {e}")
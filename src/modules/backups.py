@@ -0,0 +1,265 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Incremental, deduplicated world backups (no Flet).
+#
+# World files are split into fixed-size chunks (aligned with the 4 KiB sectors of region files, so
+# a region where a few Minecraft chunks changed only produces a few new backup chunks). Chunks are
+# stored once, compressed and named after their SHA-256; a snapshot is a manifest listing the chunks
+# of every file. Files whose size and mtime did not change since the previous snapshot are not read.
+#
+#   <minecraft directory>/backups/chunks/<sha256[:2]>/<sha256>
+#   <minecraft directory>/backups/snapshots/<world>/<snapshot id>.json
+
+from modules.app_config import *
+from typing import Callable
+import threading
+import platform
+import hashlib
+import psutil
+import shutil
+import zlib
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+BACKUPS_DIRECTORY = "backups"
+CHUNK_SIZE = 64 * 1024 # 16 region file sectors
+COMPRESSION_LEVEL = 3 # Region chunks are already compressed by the game: favour speed
+SKIPPED_FILES = {"session.lock"}
+
+_backup_lock = threading.Lock()
+
+
+def get_backups_directory(*paths: str) -> str:
+    return os.path.join(app_settings.return_mc_directory(), BACKUPS_DIRECTORY, *paths)
+
+
+
+def get_saves_directory(*paths: str) -> str:
+    return os.path.join(app_settings.return_mc_directory(), "saves", *paths)
+
+
+
+def get_chunk_path(chunk_hash: str) -> str:
+    return get_backups_directory("chunks", chunk_hash[:2], chunk_hash)
+
+
+
+def list_worlds() -> list[str]:
+    directory = get_saves_directory()
+    if not os.path.isdir(directory):
+        return []
+    return sorted(entry.name for entry in os.scandir(directory) if entry.is_dir() and os.path.isfile(os.path.join(entry.path, "level.dat")))
+
+
+
+def list_snapshots(world: str) -> list[str]:
+    """Returns the snapshot ids of a world, oldest first."""
+    directory = get_backups_directory("snapshots", world)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name[:-5] for name in os.listdir(directory) if name.endswith(".json"))
+
+
+
+def load_snapshot(world: str, snapshot_id: str) -> dict:
+    with open(get_backups_directory("snapshots", world, f"{snapshot_id}.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+
+def set_low_io_priority(process: bool = False):
+    """
+    Lowers the I/O (and CPU) priority of the calling thread on Linux. On Windows the I/O priority is
+    per process: it is only lowered with 'process', never in the launcher, where it would slow down
+    the installs and updates of the whole session. Best effort.
+    """
+    try:
+        if platform.system() == "Linux":
+            # ioprio and nice values are per thread on Linux
+            thread = psutil.Process(threading.get_native_id())
+            thread.ionice(psutil.IOPRIO_CLASS_IDLE)
+            thread.nice(19)
+        elif platform.system() == "Windows" and process:
+            psutil.Process().ionice(psutil.IOPRIO_LOW)
+    except Exception as e:
+        logger.warning(f"Could not lower the backup I/O priority: {e}")
+
+
+
+def store_chunk(data: bytes) -> tuple[str, bool]:
+    """Stores a chunk (if it is not stored yet). Returns (SHA-256, written)."""
+    chunk_hash = hashlib.sha256(data).hexdigest()
+    path = get_chunk_path(chunk_hash)
+    if os.path.exists(path):
+        return chunk_hash, False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(zlib.compress(data, COMPRESSION_LEVEL))
+    os.replace(temp_path, path)
+    return chunk_hash, True
+
+
+
+def read_chunk(chunk_hash: str) -> bytes:
+    with open(get_chunk_path(chunk_hash), "rb") as f:
+        data = zlib.decompress(f.read())
+    if hashlib.sha256(data).hexdigest() != chunk_hash:
+        raise Exception(f"Corrupt backup chunk {chunk_hash}")
+    return data
+
+
+
+def backup_world(world: str, on_progress: Callable[[int, int], None] = None) -> dict:
+    """
+    Creates a snapshot of a world. Only files changed since the previous snapshot are read and only
+    chunks that are not stored yet are written. Returns the snapshot manifest (with "stats").
+    """
+    world_directory = get_saves_directory(world)
+    if not os.path.isdir(world_directory):
+        raise Exception(f"World not found: {world}")
+    snapshots = list_snapshots(world)
+    previous = load_snapshot(world, snapshots[-1])["files"] if snapshots else {}
+
+    paths = []
+    for root, directories, files in os.walk(world_directory):
+        for name in files:
+            if name not in SKIPPED_FILES:
+                paths.append(os.path.join(root, name))
+
+    stats = {"files": len(paths), "changed_files": 0, "chunks": 0, "written_chunks": 0, "written_bytes": 0, "seconds": 0.0}
+    start = time.perf_counter()
+    manifest_files = {}
+    for index, path in enumerate(paths):
+        relative_path = os.path.relpath(path, world_directory).replace(os.sep, "/")
+        stat = os.stat(path)
+        entry = previous.get(relative_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            manifest_files[relative_path] = entry
+            stats["chunks"] += len(entry["chunks"])
+        else:
+            chunks = []
+            with open(path, "rb") as f:
+                for data in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    chunk_hash, written = store_chunk(data)
+                    chunks.append(chunk_hash)
+                    if written:
+                        stats["written_chunks"] += 1
+                        stats["written_bytes"] += os.path.getsize(get_chunk_path(chunk_hash))
+            manifest_files[relative_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "chunks": chunks}
+            stats["changed_files"] += 1
+            stats["chunks"] += len(chunks)
+        if on_progress:
+            on_progress(index + 1, len(paths))
+
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    snapshot_id = time.strftime("%Y%m%d-%H%M%S")
+    while snapshot_id in snapshots: # Two backups in the same second
+        snapshot_id += "-1"
+    manifest = {"world": world, "id": snapshot_id, "created": time.time(), "files": manifest_files, "stats": stats}
+    path = get_backups_directory("snapshots", world, f"{snapshot_id}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(path + ".tmp", path)
+    logger.info("Backup done", extra={"world": world, "snapshot": snapshot_id, **stats})
+    return manifest
+
+
+
+def restore_snapshot(world: str, snapshot_id: str, destination: str = None) -> str:
+    """
+    Restores a snapshot into 'destination' (default: a new "<world> (<snapshot id>)" folder in 'saves',
+    the current world is never overwritten). Returns the destination directory.
+    """
+    manifest = load_snapshot(world, snapshot_id)
+    destination = destination if destination else get_saves_directory(f"{world} ({snapshot_id})")
+    if os.path.exists(destination) and os.listdir(destination):
+        raise Exception(f"The destination is not empty: {destination}")
+    temp_destination = destination + ".restoring"
+    shutil.rmtree(temp_destination, ignore_errors=True)
+    for relative_path, entry in manifest["files"].items():
+        path = os.path.join(temp_destination, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            for chunk_hash in entry["chunks"]:
+                f.write(read_chunk(chunk_hash))
+        os.utime(path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+    if os.path.exists(destination):
+        os.rmdir(destination)
+    os.replace(temp_destination, destination)
+    return destination
+
+
+
+def prune_snapshots(world: str, keep: int) -> int:
+    """Deletes the oldest snapshots of a world, keeping the last 'keep'. Returns the number deleted (see collect_chunks)."""
+    snapshots = list_snapshots(world)
+    removed = snapshots[:-keep] if keep > 0 else []
+    for snapshot_id in removed:
+        os.remove(get_backups_directory("snapshots", world, f"{snapshot_id}.json"))
+    return len(removed)
+
+
+
+def collect_chunks() -> dict:
+    """Deletes the chunks no snapshot references. Returns {"files": n, "bytes": n}."""
+    referenced = set()
+    snapshots_directory = get_backups_directory("snapshots")
+    if os.path.isdir(snapshots_directory):
+        for world in os.listdir(snapshots_directory):
+            for snapshot_id in list_snapshots(world):
+                for entry in load_snapshot(world, snapshot_id)["files"].values():
+                    referenced.update(bytes.fromhex(chunk_hash) for chunk_hash in entry["chunks"])
+
+    result = {"files": 0, "bytes": 0}
+    chunks_directory = get_backups_directory("chunks")
+    if not os.path.isdir(chunks_directory):
+        return result
+    for prefix in os.scandir(chunks_directory):
+        with os.scandir(prefix.path) as entries:
+            for entry in entries:
+                try:
+                    if bytes.fromhex(entry.name) in referenced:
+                        continue
+                except ValueError: # Leftover temporary file
+                    pass
+                result["bytes"] += entry.stat().st_size
+                os.remove(entry.path)
+                result["files"] += 1
+    return result
+
+
+
+def backup_worlds(worlds: list[str] = None, keep: int = None) -> list[dict]:
+    """Backs up worlds (default: all), prunes old snapshots and unreferenced chunks. Runs one backup at a time."""
+    keep = keep if keep is not None else int(app_settings.get_setting(AppData.BACKUP_KEEP))
+    manifests = []
+    with _backup_lock:
+        for world in (worlds if worlds else list_worlds()):
+            try:
+                manifests.append(backup_world(world))
+                prune_snapshots(world, keep)
+            except Exception as e:
+                logger.error(f"Error backing up {world}: {e}")
+        collect_chunks()
+    return manifests
+
+
+
+def start_backup(worlds: list[str] = None, on_done: Callable[[list[dict]], None] = None) -> threading.Thread:
+    """Runs backup_worlds() on a background thread (with a low I/O priority on Linux, see set_low_io_priority)."""
+    def run():
+        set_low_io_priority()
+        manifests = backup_worlds(worlds)
+        if on_done:
+            on_done(manifests)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,115 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# LAN cache server ("serve my cache"): lets one launcher act as the mirror of the others.
+#
+# Paths follow the layout of modules/mirrors.KNOWN_ENDPOINTS:
+#   /libraries/...  -> <minecraft directory>/libraries
+#   /assets/xx/hash -> <minecraft directory>/assets/objects
+#   anything else   -> fetched once from the public endpoint and kept in the app storage
+# Files that are not available locally are fetched from the public endpoint (and cached).
+
+from modules.app_config import *
+from modules.mirrors import KNOWN_ENDPOINTS, NO_MIRROR_HEADER
+from modules.http_client import http_client
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import unquote
+import threading
+import shutil
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRECTORY = "mirror_cache"
+# Metadata (version manifest, loader versions...) changes over time, other files are immutable
+METADATA_PREFIXES = ("meta/", "fabric-meta/", "quilt-meta/", "forge-files/")
+METADATA_TTL = 10 * 60
+
+UPSTREAMS = {path: endpoint for endpoint, path in KNOWN_ENDPOINTS.items()}
+
+
+def resolve_request(path: str) -> tuple[str, str, bool]:
+    """
+    Maps a mirror path to (local file, upstream URL, is metadata). Returns None for unknown or unsafe paths.
+    """
+    parts = [part for part in path.split("/") if part]
+    if not parts or any(part in {".", ".."} or "\\" in part or ":" in part for part in parts):
+        return None
+    path = "/".join(parts)
+    for prefix, endpoint in UPSTREAMS.items():
+        if path.startswith(prefix):
+            relative = path[len(prefix):]
+            minecraft_directory = app_settings.return_mc_directory()
+            if prefix == "libraries/":
+                local_file = os.path.join(minecraft_directory, "libraries", *relative.split("/"))
+            elif prefix == "assets/":
+                local_file = os.path.join(minecraft_directory, "assets", "objects", *relative.split("/"))
+            else:
+                local_file = get_app_storage_path(CACHE_DIRECTORY, *path.split("/"))
+            return local_file, endpoint + relative, path.startswith(METADATA_PREFIXES)
+    return None
+
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    server_version = f"PyZCacheServer/{app_version}"
+
+    def do_HEAD(self):
+        self.do_GET(send_body=False)
+
+    def do_GET(self, send_body: bool = True):
+        resolved = resolve_request(unquote(self.path.split("?", 1)[0]))
+        if not resolved:
+            self.send_error(404)
+            return
+        local_file, upstream_url, is_metadata = resolved
+
+        fresh = os.path.isfile(local_file) and (not is_metadata or time.time() - os.path.getmtime(local_file) < METADATA_TTL)
+        if not fresh:
+            try:
+                self.fetch_upstream(upstream_url, local_file)
+            except Exception as e:
+                if not os.path.isfile(local_file): # Stale metadata is better than nothing
+                    logger.warning(f"Cache server: {upstream_url} unavailable: {e}")
+                    self.send_error(404)
+                    return
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(os.path.getsize(local_file)))
+        self.send_header("Content-Type", "application/json" if local_file.endswith(".json") else "application/octet-stream")
+        self.end_headers()
+        if send_body:
+            with open(local_file, "rb") as f:
+                shutil.copyfileobj(f, self.wfile, 64 * 1024)
+
+    def fetch_upstream(self, url: str, local_file: str):
+        """Downloads a file from the public endpoint into the cache (through a temporary file)."""
+        response = http_client.get(url, stream=True, headers={NO_MIRROR_HEADER: "1"})
+        response.raise_for_status()
+        os.makedirs(os.path.dirname(local_file), exist_ok=True)
+        temp_file = f"{local_file}.{threading.get_ident()}.part"
+        try:
+            with open(temp_file, "wb") as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+            os.replace(temp_file, local_file)
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+    def log_message(self, format, *args):
+        logger.info(f"Cache server: {self.address_string()} - {format % args}")
+
+
+
+def start_cache_server(port: int = None, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Starts the LAN cache server on a background thread and returns it (call shutdown() to stop it)."""
+    port = port if port else int(app_settings.get_setting(AppData.SERVE_CACHE_PORT))
+    server = ThreadingHTTPServer((host, port), CacheRequestHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    logger.info(f"Cache server listening on {host}:{port}")
+    return server
@@ -0,0 +1,368 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Headless command line interface (no Flet), for scripted provisioning:
+#
+#   python -m modules.cli list [--installed] [--category release] [--loader fabric]
+#   python -m modules.cli install <version_id>... [--jobs 2]
+#   python -m modules.cli verify [<version_id>...] [--hash]
+#   python -m modules.cli verify-assets [--workers 16] [--processes] [--delete-corrupt]
+#   python -m modules.cli launch <version_id> [--mod-set NAME | --profile NAME]
+#   python -m modules.cli mods list | add <set> <jar>... | remove <set> <file>... | capture <set> | activate <set>
+#   python -m modules.cli backup [<world>...] [--keep 10] [--list]
+#   python -m modules.cli restore <world> <snapshot_id | latest> [--to DIR]
+#   python -m modules.cli diagnose [<log or crash report>]
+#   python -m modules.cli crashes [--search "words"] [--limit 20]
+#   python -m modules.cli serve [--port 25580]
+#   python -m modules.cli java [--rescan]
+#   python -m modules.cli gc [--delete] [--verbose]
+#
+# Run from the 'src' directory. Every event is printed to stdout as one JSON object per line;
+# diagnostic output goes to stderr.
+#
+# Global options (before the command): --minecraft-directory, --java, --username, --memory, --mirror, --metrics-textfile.
+#
+# Exit codes: 0 = success, 1 = error, 2 = invalid arguments, 3 = version not installed / verification failed.
+
+from modules.app_config import *
+from modules.launcher_core import *
+from modules.install_queue import InstallQueue
+from modules.java_runtimes import get_java_runtimes
+from modules.garbage_collector import GarbageCollector
+import modules.mod_sets as mod_sets
+import modules.backups as backups
+from modules.log_analyzer import CrashIndex, analyze_file, format_diagnosis
+from modules.hashing import HashStats, hash_files, verify_asset_objects, DEFAULT_WORKERS
+from modules.metrics import metrics
+from modules.app_logging import setup_logging
+import contextlib
+import argparse
+import json
+import time
+import sys
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_NOT_INSTALLED = 3
+
+# Keep a handle on the real stdout: everything else printed by the core goes to stderr
+_stdout = sys.stdout
+
+
+def emit(event: str, **data):
+    """Prints a machine-readable event (JSON line) to stdout."""
+    _stdout.write(json.dumps({"event": event, **data}) + "\n")
+    _stdout.flush()
+
+
+def init_cli_settings(args: argparse.Namespace):
+    """Initializes the settings without a Flet page, from the defaults and the command line options."""
+    app_settings.settings = dict(default_data)
+    if args.minecraft_directory:
+        app_settings.settings[AppData.MC_DIRECTORY.value] = args.minecraft_directory
+    if args.java:
+        app_settings.settings[AppData.EXECUTABLE_PATH.value] = args.java
+    if args.username:
+        app_settings.settings[AppData.USERNAME.value] = args.username
+    if args.memory:
+        app_settings.settings[AppData.JVM_ARGUMENTS.value] = [f"-Xmx{args.memory}G", f"-Xms{args.memory}G"]
+    if args.mirror:
+        app_settings.settings[AppData.MIRROR_URL.value] = args.mirror
+    if args.metrics_textfile:
+        app_settings.settings[AppData.METRICS_TEXTFILE.value] = args.metrics_textfile
+
+
+# ----- Commands -----
+
+
+def command_list(args: argparse.Namespace) -> int:
+    if args.installed:
+        # Local only, no network needed
+        for version in mll.utils.get_installed_versions(app_settings.return_mc_directory()):
+            emit("version", id=version["id"], installed=True)
+        return EXIT_OK
+
+    if args.loader:
+        versions = get_versions(version_type=args.loader)
+        available = versions["version"]
+    else:
+        versions = get_versions()
+        available = versions[args.category]
+    installed = [v["id"] for v in versions["installed"]]
+    for version_id in available:
+        emit("version", id=version_id, installed=version_id in installed)
+    return EXIT_OK
+
+
+def command_install(args: argparse.Namespace) -> int:
+    # Not persisted: the UI queue is left untouched
+    queue = InstallQueue(concurrency=args.jobs)
+    queue.listeners.append(lambda event, data: emit(event, **data) if event != "finished" else None)
+    queue.add(args.versions)
+    return EXIT_ERROR if queue.run() else EXIT_OK
+
+
+def command_verify(args: argparse.Namespace) -> int:
+    installed = [v["id"] for v in mll.utils.get_installed_versions(app_settings.return_mc_directory())]
+    exit_code = EXIT_OK
+    for version_id in ([resolve_version_id(v) for v in args.versions] if args.versions else installed):
+        if version_id not in installed:
+            emit("verified", version=version_id, ok=False, files=0, missing=[], corrupt=[], message="Version not installed")
+            exit_code = EXIT_NOT_INSTALLED
+            continue
+        files, missing, corrupt, expected = 0, [], [], {}
+        for kind, path, sha1, size in iter_version_files(version_id):
+            files += 1
+            if not os.path.isfile(path):
+                missing.append(path)
+            elif size is not None and os.path.getsize(path) != size:
+                corrupt.append(path)
+            elif args.hash and sha1:
+                expected[path] = sha1
+        if expected:
+            stats = HashStats()
+            corrupt += [path for path, digest, size in hash_files(expected, workers=args.workers, stats=stats) if digest != expected[path]]
+            emit("hashed", version=version_id, **stats.to_dict())
+        ok = not missing and not corrupt
+        emit("verified", version=version_id, ok=ok, files=files, missing=missing, corrupt=corrupt)
+        if not ok:
+            exit_code = EXIT_NOT_INSTALLED
+    return exit_code
+
+
+def command_verify_assets(args: argparse.Namespace) -> int:
+    stats = HashStats()
+    last_report = [0.0]
+
+    def on_progress(stats: HashStats):
+        if stats.elapsed - last_report[0] >= 1:
+            last_report[0] = stats.elapsed
+            emit("progress", **stats.to_dict())
+
+    corrupt = []
+    for path in verify_asset_objects(app_settings.return_mc_directory(), workers=args.workers, processes=args.processes, stats=stats, on_progress=on_progress):
+        corrupt.append(path)
+        emit("corrupt", path=path)
+        if args.delete_corrupt:
+            os.remove(path)
+    emit("verified_assets", ok=not corrupt, corrupt=len(corrupt), deleted=len(corrupt) if args.delete_corrupt else 0, **stats.to_dict())
+    return EXIT_OK if not corrupt else EXIT_NOT_INSTALLED
+
+
+def command_launch(args: argparse.Namespace) -> int:
+    version_id = resolve_version_id(args.version)
+    if not is_version_installed(version_id):
+        emit("error", version=version_id, message="Version not installed")
+        return EXIT_NOT_INSTALLED
+    if args.mod_set:
+        mod_sets.activate_mod_set(args.mod_set)
+    else:
+        mod_sets.prepare_mods(args.profile)
+    process = spawn_game(get_launch_command(version_id), stdout=sys.stderr, stderr=sys.stderr)
+    emit("started", version=version_id, pid=process.pid)
+    started = time.time()
+    return_code = process.wait()
+    record_game_exit(return_code, started)
+    emit("exited", version=version_id, code=return_code)
+    return return_code
+
+
+def command_mods(args: argparse.Namespace) -> int:
+    if args.action == "list":
+        active = mod_sets.get_active_mod_set()
+        for name in mod_sets.list_mod_sets():
+            emit("mod_set", name=name, active=name == active, mods=sorted(mod_sets.load_mod_set(name)))
+        return EXIT_OK
+    if not args.name:
+        emit("error", message=f"'mods {args.action}' needs a mod set name")
+        return EXIT_ERROR
+    if args.action == "add":
+        mods = mod_sets.add_mods(args.name, args.files)
+    elif args.action == "remove":
+        mods = mod_sets.remove_mods(args.name, args.files)
+    elif args.action == "capture":
+        mods = mod_sets.capture_mod_set(args.name)
+    else:
+        emit("activated", name=args.name, **mod_sets.activate_mod_set(args.name))
+        return EXIT_OK
+    emit("mod_set", name=args.name, active=args.name == mod_sets.get_active_mod_set(), mods=sorted(mods))
+    return EXIT_OK
+
+
+def command_backup(args: argparse.Namespace) -> int:
+    worlds = args.worlds if args.worlds else backups.list_worlds()
+    if args.list:
+        for world in worlds:
+            emit("snapshots", world=world, snapshots=backups.list_snapshots(world))
+        return EXIT_OK
+    backups.set_low_io_priority(process=True) # The CLI process only backs up
+    manifests = backups.backup_worlds(worlds, keep=args.keep)
+    for manifest in manifests:
+        emit("backup", world=manifest["world"], id=manifest["id"], **manifest["stats"])
+    return EXIT_OK if len(manifests) == len(worlds) else EXIT_ERROR
+
+
+def command_restore(args: argparse.Namespace) -> int:
+    snapshots = backups.list_snapshots(args.world)
+    snapshot_id = snapshots[-1] if args.snapshot == "latest" and snapshots else args.snapshot
+    if snapshot_id not in snapshots:
+        emit("error", world=args.world, message=f"Snapshot not found: {args.snapshot}")
+        return EXIT_NOT_INSTALLED
+    emit("restored", world=args.world, id=snapshot_id, path=backups.restore_snapshot(args.world, snapshot_id, args.to))
+    return EXIT_OK
+
+
+def command_diagnose(args: argparse.Namespace) -> int:
+    path = args.file
+    if not path:
+        crashes = CrashIndex()
+        crashes.update()
+        latest = crashes.search(limit=1)
+        crashes.close()
+        if not latest:
+            emit("error", message="No crash reports found")
+            return EXIT_ERROR
+        path = latest[0]["path"]
+    analysis = analyze_file(path)
+    emit("diagnosis", path=path, summary=format_diagnosis(analysis), **analysis)
+    return EXIT_OK
+
+
+def command_crashes(args: argparse.Namespace) -> int:
+    crashes = CrashIndex()
+    try:
+        crashes.update()
+        for crash in crashes.search(args.search, limit=args.limit):
+            emit("crash", **crash)
+    finally:
+        crashes.close()
+    return EXIT_OK
+
+
+def command_serve(args: argparse.Namespace) -> int:
+    from modules.cache_server import start_cache_server
+    server = start_cache_server(args.port)
+    emit("serving", host=server.server_address[0], port=server.server_address[1])
+    try:
+        while True:
+            time.sleep(3600)
+    finally:
+        server.shutdown()
+
+
+def command_java(args: argparse.Namespace) -> int:
+    for runtime in get_java_runtimes(rescan=args.rescan):
+        emit("java", **{key: value for key, value in runtime.items() if key != "mtime"})
+    return EXIT_OK
+
+
+def command_gc(args: argparse.Namespace) -> int:
+    on_file = (lambda kind, path, size: emit("garbage", kind=kind, path=path, size=size)) if args.verbose else None
+    report = GarbageCollector().collect(delete=args.delete, on_file=on_file)
+    emit("gc", **report)
+    return EXIT_ERROR if report["errors"] else EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m modules.cli", description=f"{app_name} {app_version} - headless command line interface")
+    parser.add_argument("--minecraft-directory", help="Minecraft directory (default: the launcher default)")
+    parser.add_argument("--java", help="Java executable used to install loaders and run the game")
+    parser.add_argument("--username", help="Offline username")
+    parser.add_argument("--memory", type=int, help="Maximum memory (RAM) in GB")
+    parser.add_argument("--mirror", help="LAN mirror URL (e.g. http://192.168.1.10:25580)")
+    parser.add_argument("--metrics-textfile", help="Write Prometheus metrics to this file (node_exporter textfile collector)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="List available or installed versions")
+    list_parser.add_argument("--installed", action="store_true", help="Only list installed versions")
+    list_parser.add_argument("--category", default="release", choices=["release", "snapshot", "old_beta", "old_alpha"])
+    list_parser.add_argument("--loader", choices=mll.mod_loader.list_mod_loader(), help="List the versions supported by a mod loader")
+    list_parser.set_defaults(handler=command_list)
+
+    install_parser = commands.add_parser("install", help="Install one or more versions")
+    install_parser.add_argument("versions", nargs="+", metavar="version_id")
+    install_parser.add_argument("--jobs", type=int, default=2, help="Versions installed at the same time (default: 2)")
+    install_parser.set_defaults(handler=command_install)
+
+    verify_parser = commands.add_parser("verify", help="Check the files of installed versions")
+    verify_parser.add_argument("versions", nargs="*", metavar="version_id", help="Versions to verify (default: all installed)")
+    verify_parser.add_argument("--hash", action="store_true", help="Also compare SHA-1 hashes (slower)")
+    verify_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Files hashed at the same time")
+    verify_parser.set_defaults(handler=command_verify)
+
+    verify_assets_parser = commands.add_parser("verify-assets", help="Check the SHA-1 of every object in the asset store")
+    verify_assets_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Files hashed at the same time")
+    verify_assets_parser.add_argument("--processes", action="store_true", help="Hash in worker processes instead of threads")
+    verify_assets_parser.add_argument("--delete-corrupt", action="store_true", help="Delete corrupt objects (they are downloaded again on the next install or repair)")
+    verify_assets_parser.set_defaults(handler=command_verify_assets)
+
+    launch_parser = commands.add_parser("launch", help="Launch an installed version and wait for it to exit")
+    launch_parser.add_argument("version", metavar="version_id")
+    launch_mod_set = launch_parser.add_mutually_exclusive_group()
+    launch_mod_set.add_argument("--mod-set", help="Mod set linked into the 'mods' directory")
+    launch_mod_set.add_argument("--profile", help="Launcher profile whose mod set is linked into the 'mods' directory (default: the mods folder before the mod sets)")
+    launch_parser.set_defaults(handler=command_launch)
+
+    mods_parser = commands.add_parser("mods", help="Manage the mod sets (one 'mods' directory per profile, linked from a shared pool)")
+    mods_parser.add_argument("action", choices=["list", "add", "remove", "capture", "activate"])
+    mods_parser.add_argument("name", nargs="?", help="Mod set name")
+    mods_parser.add_argument("files", nargs="*", help="Mod jars to add / file names to remove")
+    mods_parser.set_defaults(handler=command_mods)
+
+    backup_parser = commands.add_parser("backup", help="Incremental backup of the worlds in 'saves'")
+    backup_parser.add_argument("worlds", nargs="*", metavar="world", help="Worlds to back up (default: all)")
+    backup_parser.add_argument("--keep", type=int, default=default_data["backupKeep"], help="Snapshots kept per world (0 keeps all)")
+    backup_parser.add_argument("--list", action="store_true", help="List the snapshots instead")
+    backup_parser.set_defaults(handler=command_backup)
+
+    restore_parser = commands.add_parser("restore", help="Restore a world snapshot into a new folder")
+    restore_parser.add_argument("world")
+    restore_parser.add_argument("snapshot", help="Snapshot id or 'latest'")
+    restore_parser.add_argument("--to", help="Destination folder (default: '<world> (<snapshot id>)' in 'saves')")
+    restore_parser.set_defaults(handler=command_restore)
+
+    diagnose_parser = commands.add_parser("diagnose", help="Find the known causes of a crash")
+    diagnose_parser.add_argument("file", nargs="?", help="Game log or crash report (default: the latest crash)")
+    diagnose_parser.set_defaults(handler=command_diagnose)
+
+    crashes_parser = commands.add_parser("crashes", help="Search the past crash reports")
+    crashes_parser.add_argument("--search", help="Words to search for (default: list the latest crashes)")
+    crashes_parser.add_argument("--limit", type=int, default=20)
+    crashes_parser.set_defaults(handler=command_crashes)
+
+    serve_parser = commands.add_parser("serve", help="Serve the game files of this machine to the LAN (mirror for other launchers)")
+    serve_parser.add_argument("--port", type=int, default=default_data["serveCachePort"])
+    serve_parser.set_defaults(handler=command_serve)
+
+    java_parser = commands.add_parser("java", help="List the Java runtimes found on this machine")
+    java_parser.add_argument("--rescan", action="store_true", help="Scan the Java locations again")
+    java_parser.set_defaults(handler=command_java)
+
+    gc_parser = commands.add_parser("gc", help="Report (or delete) libraries and assets no installed version uses")
+    gc_parser.add_argument("--delete", action="store_true", help="Delete the unused files (default: dry run)")
+    gc_parser.add_argument("--verbose", action="store_true", help="Print every unused file")
+    gc_parser.set_defaults(handler=command_gc)
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    setup_logging() # Console output on stderr, stdout stays JSON lines
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            init_cli_settings(args)
+            return args.handler(args)
+    except KeyboardInterrupt:
+        emit("error", message="Interrupted")
+        return EXIT_ERROR
+    except Exception as e:
+        emit("error", message=str(e))
+        return EXIT_ERROR
+    finally:
+        with contextlib.redirect_stdout(sys.stderr):
+            metrics.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
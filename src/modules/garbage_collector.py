@@ -0,0 +1,191 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Mark-and-sweep garbage collector for the shared files of the Minecraft directory (no Flet).
+#
+# Mark: every installed version JSON (with its 'inheritsFrom' chain) and the asset index it uses are
+# parsed to collect the reachable libraries, natives and asset objects.
+# Sweep: 'libraries', 'assets/objects' and 'assets/indexes' are walked with os.scandir (one directory
+# at a time, never a full file list) and everything that was not marked is reported or deleted.
+#
+# Files a mod loader installer generates next to its libraries (e.g. Forge's patched client jars) are
+# not listed in the version JSON: every file in the directory of a reachable library is kept, as well
+# as the generated files of the installed Forge and NeoForge versions (LOADER_GENERATED_FILES).
+# minecraft-launcher-lib reads the install_profile.json from the installer in a temporary directory,
+# so the processor outputs are matched by path instead.
+
+from modules.app_config import *
+from modules.launcher_core import *
+from modules.version_ids import parse_version_id
+from modules.asset_indexes import iter_asset_index
+import logging
+import fnmatch
+
+logger = logging.getLogger(__name__)
+
+SWEPT_DIRECTORIES = {
+    "library": ("libraries",),
+    "asset": ("assets", "objects"),
+    "asset_index": ("assets", "indexes"),
+}
+# Library paths written by the installer processors, per loader (formatted with the parsed version id)
+LOADER_GENERATED_FILES = {
+    "forge": (
+        "net/minecraftforge/forge/{minecraft_version}-{loader_version}/*",
+        "net/minecraft/client/{minecraft_version}-*",
+        "de/oceanlabs/mcp/mcp_config/{minecraft_version}-*",
+    ),
+    "neoforge": (
+        "net/neoforged/neoforge/{loader_version}/*",
+        "net/minecraft/client/{minecraft_version}-*",
+        "net/neoforged/neoform/{minecraft_version}-*",
+    ),
+}
+
+
+def iter_files(directory: str):
+    """Yields os.DirEntry objects for every file below 'directory' (depth first, one directory listing in memory per level)."""
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from iter_files(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+    except FileNotFoundError:
+        return
+
+
+
+def remove_empty_directories(directory: str):
+    """Removes the empty directories below 'directory' (the directory itself is kept)."""
+    try:
+        with os.scandir(directory) as entries:
+            subdirectories = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return
+    for subdirectory in subdirectories:
+        remove_empty_directories(subdirectory)
+        try:
+            os.rmdir(subdirectory)
+        except OSError:
+            pass
+
+
+
+class GarbageCollector():
+    """
+    Finds (and optionally deletes) the libraries, natives, asset objects and asset indexes that no
+    installed version references.
+
+    The mark set is kept compact: relative library paths, their directories, and asset hashes as
+    20-byte digests, so its size depends on the installed versions, not on the number of files swept.
+    """
+    def __init__(self, minecraft_directory: str = None):
+        self.minecraft_directory = minecraft_directory if minecraft_directory else app_settings.return_mc_directory()
+        self.libraries: set[str] = set()
+        self.library_directories: set[str] = set()
+        self.protected_patterns: list[str] = []
+        self.asset_hashes: set[bytes] = set()
+        self.asset_indexes: set[str] = set()
+        self.versions: list[str] = []
+        self.errors: list[str] = []
+
+    def __relative_library(self, path: str) -> str:
+        return os.path.relpath(path, os.path.join(self.minecraft_directory, "libraries")).replace(os.sep, "/")
+
+    def mark(self):
+        """Marks the files reachable from the installed versions."""
+        versions_directory = os.path.join(self.minecraft_directory, "versions")
+        try:
+            version_ids = [entry.name for entry in os.scandir(versions_directory) if entry.is_dir()]
+        except FileNotFoundError:
+            version_ids = []
+
+        for version_id in version_ids:
+            if not os.path.isfile(os.path.join(versions_directory, version_id, f"{version_id}.json")):
+                continue
+            try:
+                for kind, path, sha1, size in iter_version_files(version_id, self.minecraft_directory, include_assets=False):
+                    if kind in {"library", "native"}:
+                        library = self.__relative_library(path)
+                        self.libraries.add(library)
+                        self.library_directories.add(library.rsplit("/", 1)[0])
+                asset_index = next((data["assetIndex"] for data in get_version_chain(version_id, self.minecraft_directory) if data.get("assetIndex")), None)
+                if asset_index:
+                    self.__mark_asset_index(os.path.join(self.minecraft_directory, "assets", "indexes", f"{asset_index['id']}.json"))
+                self.__mark_loader_files(version_id)
+                self.versions.append(version_id)
+            except Exception as e:
+                self.errors.append(f"{version_id}: {e}")
+
+    def __mark_asset_index(self, index_path: str):
+        index_name = os.path.basename(index_path)
+        if index_name in self.asset_indexes:
+            return
+        self.asset_indexes.add(index_name)
+        if not os.path.isfile(index_path):
+            return
+        for asset in iter_asset_index(index_path):
+            self.asset_hashes.add(bytes.fromhex(asset.hash))
+
+    def __mark_loader_files(self, version_id: str):
+        """Protects the files generated by the Forge / NeoForge installer (patched client, MCP / NeoForm data) of an installed version."""
+        parsed = parse_version_id(version_id)
+        if parsed and parsed.loader in LOADER_GENERATED_FILES:
+            self.protected_patterns += [pattern.format(**parsed._asdict()) for pattern in LOADER_GENERATED_FILES[parsed.loader]]
+
+    def is_reachable(self, kind: str, entry: os.DirEntry) -> bool:
+        if kind == "asset":
+            try:
+                return bytes.fromhex(entry.name) in self.asset_hashes
+            except ValueError:
+                return False
+        if kind == "asset_index":
+            return entry.name in self.asset_indexes
+        library = self.__relative_library(entry.path)
+        if library in self.libraries or library.rsplit("/", 1)[0] in self.library_directories:
+            return True
+        return any(fnmatch.fnmatch(library, pattern) for pattern in self.protected_patterns)
+
+    def iter_garbage(self):
+        """Yields (kind, path, size) for every unreachable file. mark() must be called first."""
+        for kind, directory in SWEPT_DIRECTORIES.items():
+            for entry in iter_files(os.path.join(self.minecraft_directory, *directory)):
+                if not self.is_reachable(kind, entry):
+                    yield kind, entry.path, entry.stat(follow_symlinks=False).st_size
+
+    def collect(self, delete: bool = False, on_file=None) -> dict:
+        """
+        Runs a full mark-and-sweep pass and returns a size report ({"files", "bytes", "kinds": {kind: {"files", "bytes"}}}).
+
+        Nothing is deleted unless 'delete' is True, and never when an installed version could not be
+        parsed (its files would be treated as garbage). 'on_file(kind, path, size)' is called per unreachable file.
+        """
+        self.mark()
+        if delete and self.errors:
+            raise Exception("Some installed versions could not be read, nothing was deleted: " + "; ".join(self.errors))
+        if delete and not self.versions:
+            raise Exception("No installed versions found, nothing was deleted.")
+
+        report = {"versions": len(self.versions), "files": 0, "bytes": 0, "deleted": delete, "errors": self.errors,
+                  "kinds": {kind: {"files": 0, "bytes": 0} for kind in SWEPT_DIRECTORIES}}
+        for kind, path, size in self.iter_garbage():
+            if delete:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning(f"Could not delete {path}: {e}")
+                    continue
+            report["files"] += 1
+            report["bytes"] += size
+            report["kinds"][kind]["files"] += 1
+            report["kinds"][kind]["bytes"] += size
+            if on_file:
+                on_file(kind, path, size)
+
+        if delete:
+            for directory in SWEPT_DIRECTORIES.values():
+                remove_empty_directories(os.path.join(self.minecraft_directory, *directory))
+        return report
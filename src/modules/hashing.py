@@ -0,0 +1,138 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Bulk hashing service (no Flet) used by the integrity checks ('verify --hash', 'verify-assets').
+#
+# Files are hashed in batches by a pool of workers. Threads are the default: hashlib releases the GIL
+# while hashing large buffers, so the pool keeps several reads in flight and the check is bound by the
+# disk. Small files are read in one call, big files (client jars, large libraries) are memory-mapped.
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable
+import hashlib
+import mmap
+import time
+import os
+
+MMAP_THRESHOLD = 4 * 1024 * 1024 # Files from this size are memory-mapped
+BATCH_SIZE = 64 # Files per task (tens of thousands of small asset objects would otherwise cost one task each)
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+
+def hash_file(path: str, algorithm: str = "sha1") -> tuple[str, int]:
+    """Returns (hex digest, size) of a file."""
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        else:
+            digest.update(f.read())
+    return digest.hexdigest(), size
+
+
+
+def _hash_batch(paths: list[str], algorithm: str) -> list[tuple[str, str, int]]:
+    """Hashes a batch of files: [(path, hex digest or None if unreadable, size)]. Top level so process pools can pickle it."""
+    results = []
+    for path in paths:
+        try:
+            digest, size = hash_file(path, algorithm)
+        except OSError:
+            digest, size = None, 0
+        results.append((path, digest, size))
+    return results
+
+
+
+class HashStats():
+    """Throughput of a hashing run."""
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add(self, size: int):
+        self.files += 1
+        self.bytes += size
+        self.elapsed = time.perf_counter() - self.start
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / (1024 * 1024) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        return {"files": self.files, "bytes": self.bytes, "seconds": round(self.elapsed, 3),
+                "mb_per_second": round(self.mb_per_second, 1), "files_per_second": round(self.files_per_second, 1)}
+
+
+
+def hash_files(paths: Iterable[str], algorithm: str = "sha1", workers: int = DEFAULT_WORKERS, processes: bool = False,
+               stats: HashStats = None, on_progress: Callable[[HashStats], None] = None):
+    """
+    Yields (path, hex digest or None if unreadable, size) for every path, in completion order.
+
+    'paths' is consumed lazily and at most 2 batches per worker are in flight, so a store with
+    hundreds of thousands of files is hashed in bounded memory. 'stats' accumulates the throughput.
+    """
+    stats = stats if stats else HashStats()
+    workers = max(1, workers) # 0 or less would submit nothing and report every file as checked
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    paths = iter(paths)
+
+    def next_batch() -> list[str]:
+        batch = []
+        for path in paths:
+            batch.append(path)
+            if len(batch) >= BATCH_SIZE:
+                break
+        return batch
+
+    with executor_class(max_workers=workers) as executor:
+        pending = set()
+        while True:
+            while len(pending) < workers * 2:
+                batch = next_batch()
+                if not batch:
+                    break
+                pending.add(executor.submit(_hash_batch, batch, algorithm))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for path, digest, size in future.result():
+                    stats.add(size)
+                    yield path, digest, size
+                if on_progress:
+                    on_progress(stats)
+
+
+
+def iter_asset_objects(minecraft_directory: str):
+    """Yields the paths of the objects in 'assets/objects' (their file name is their SHA-1)."""
+    objects_directory = os.path.join(minecraft_directory, "assets", "objects")
+    try:
+        prefixes = sorted(entry.path for entry in os.scandir(objects_directory) if entry.is_dir())
+    except FileNotFoundError:
+        return
+    for prefix in prefixes:
+        with os.scandir(prefix) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False) and not entry.name.endswith(".part"):
+                    yield entry.path
+
+
+
+def verify_asset_objects(minecraft_directory: str, workers: int = DEFAULT_WORKERS, processes: bool = False,
+                         stats: HashStats = None, on_progress: Callable[[HashStats], None] = None):
+    """Yields the paths of the asset objects whose content does not match their name (SHA-1)."""
+    for path, digest, size in hash_files(iter_asset_objects(minecraft_directory), "sha1", workers, processes, stats, on_progress):
+        if digest != os.path.basename(path).lower():
+            yield path
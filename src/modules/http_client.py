@@ -0,0 +1,116 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+from modules.app_config import app_name, app_version
+from modules.mirrors import install_requests_hook
+from modules.metrics import metrics
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlsplit
+import requests
+import threading
+import time
+
+DEFAULT_TIMEOUT = (5, 30) # (connect, read) seconds
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5 # 0.5s, 1s, 2s...
+POOL_SIZE = 16
+
+
+class HttpClient():
+    """
+    Launcher-wide HTTP client.
+
+    One keep-alive session (pooled connections, no new TCP+TLS handshake per request) with default timeouts,
+    bounded retries with exponential backoff for idempotent requests, optional conditional-GET caching
+    and per-host request timing metrics.
+    """
+    def __init__(self, timeout: tuple = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES, backoff_factor: float = DEFAULT_BACKOFF, pool_size: int = POOL_SIZE):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = f"{app_name.replace(' ', '')}/{app_version}"
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._cache: dict[str, dict] = {}
+        self.metrics: dict[str, dict] = {}
+
+    def request(self, method: str, url: str, cache: bool = False, **kwargs) -> requests.Response:
+        """
+        Sends a request through the shared session.
+
+        With 'cache=True' (GET without streaming), the response is kept in memory and revalidated
+        with 'If-None-Match' / 'If-Modified-Since'; a 304 returns the cached response.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        cache = cache and method.upper() == "GET" and not kwargs.get("stream")
+        entry = self._cache.get(url) if cache else None
+        if entry:
+            headers = dict(kwargs.pop("headers", None) or {})
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+            kwargs["headers"] = headers
+
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self.__record(url, time.perf_counter() - start, 0, error=True)
+            raise
+        self.__record(url, time.perf_counter() - start, int(response.headers.get("content-length", 0) or 0),
+                      error=response.status_code >= 400, cache_hit=response.status_code == 304 and entry is not None)
+
+        if cache:
+            metrics.inc("cache_requests_total", cache="http", result="hit" if response.status_code == 304 and entry else "miss")
+            if response.status_code == 304 and entry:
+                return entry["response"]
+            if response.status_code == 200 and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+                with self._lock:
+                    self._cache[url] = {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "response": response
+                    }
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def __record(self, url: str, elapsed: float, size: int, error: bool = False, cache_hit: bool = False):
+        """Accumulates request timing metrics per host."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            metric = self.metrics.setdefault(host, {"requests": 0, "errors": 0, "cache_hits": 0, "bytes": 0, "total_time": 0.0, "max_time": 0.0})
+            metric["requests"] += 1
+            metric["errors"] += 1 if error else 0
+            metric["cache_hits"] += 1 if cache_hit else 0
+            metric["bytes"] += size
+            metric["total_time"] += elapsed
+            metric["max_time"] = max(metric["max_time"], elapsed)
+
+    def get_metrics(self) -> dict:
+        """Returns a copy of the per-host metrics, including the average request time."""
+        with self._lock:
+            return {host: dict(metric, avg_time=metric["total_time"] / metric["requests"]) for host, metric in self.metrics.items()}
+
+
+# Mirror rewrite rules for every request (ours and minecraft-launcher-lib's)
+install_requests_hook()
+
+http_client = HttpClient()
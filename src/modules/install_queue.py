@@ -0,0 +1,409 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Persistent install queue shared by the UI and the CLI (no Flet).
+#
+# Queued targets are installed in batches:
+#   1. The libraries, natives, client jars and asset objects of every Minecraft version in the batch
+#      are collected into one de-duplicated set and downloaded once, by a pool of workers.
+#   2. The installs run with a configurable concurrency. Targets that share the same Minecraft
+#      version (vanilla + its mod loaders) run one after another, vanilla first.
+# minecraft-launcher-lib then only verifies the files that were already downloaded.
+
+from modules.app_config import *
+from modules.launcher_core import *
+from modules.http_client import http_client
+from modules.hashing import hash_file
+from modules.asset_indexes import iter_asset_index
+from modules.metrics import metrics
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+import threading
+import hashlib
+import logging
+import shutil
+import json
+
+logger = logging.getLogger(__name__)
+
+QUEUE_FILE = "install_queue.json"
+PREFETCH_DIRECTORY = "prefetch" # Version JSONs fetched before the version is installed (in the app storage)
+ASSET_OBJECTS_URL = "https://resources.download.minecraft.net"
+
+# Job states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+
+
+# ----- Shared artifacts -----
+
+
+def get_version_manifest_entry(version_id: str) -> dict:
+    """Returns the entry of a vanilla version in Mojang's version manifest (None if not found)."""
+    for version in get_version_manifest()["versions"]:
+        if version["id"] == version_id:
+            return version
+    return None
+
+
+
+def get_prefetched_version_path(version_id: str) -> str:
+    return get_app_storage_path(PREFETCH_DIRECTORY, f"{version_id}.json")
+
+
+
+def remove_prefetched_versions():
+    """Deletes the prefetched version JSONs of the versions that are installed (by the queue or any other way)."""
+    directory = get_app_storage_path(PREFETCH_DIRECTORY)
+    if not os.path.isdir(directory):
+        return
+    try:
+        installed = get_installed_version_ids()
+        for name in os.listdir(directory):
+            if name.endswith(".json") and name[:-5] in installed:
+                os.remove(os.path.join(directory, name))
+    except Exception as e:
+        logger.warning(f"Could not remove the prefetched version JSONs: {e}")
+
+
+
+def collect_version_artifacts(version_id: str, artifacts: dict, prefetch: bool = False):
+    """
+    Adds the files of a vanilla version to 'artifacts' ({path: (url, sha1, size)}), keyed by
+    destination path so files shared by several versions are only listed once.
+    The version JSON and asset index are stored in the Minecraft directory as well. With 'prefetch',
+    the version JSON is kept in the app storage instead (in 'versions' it would make the version look
+    installed) and moved into place by the next install.
+    """
+    minecraft_directory = app_settings.return_mc_directory()
+    entry = get_version_manifest_entry(version_id)
+    if not entry:
+        return
+    version_path = os.path.join(minecraft_directory, "versions", version_id, f"{version_id}.json")
+    prefetched_path = get_prefetched_version_path(version_id)
+    if prefetch:
+        version_path = prefetched_path
+    elif os.path.isfile(prefetched_path) and not os.path.isfile(version_path):
+        # Verified by download_artifact below (downloaded again if it does not match)
+        try:
+            os.makedirs(os.path.dirname(version_path), exist_ok=True)
+            shutil.move(prefetched_path, version_path)
+        except OSError as e:
+            logger.warning(f"Could not use the prefetched version JSON of {version_id}: {e}")
+    download_artifact(version_path, entry["url"], entry.get("sha1"))
+    with open(version_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    client = data.get("downloads", {}).get("client")
+    if client:
+        artifacts[os.path.join(minecraft_directory, "versions", version_id, f"{version_id}.jar")] = (client["url"], client.get("sha1"), client.get("size"))
+
+    os_name = get_os_name()
+    for library in data.get("libraries", []):
+        if not rules_allow(library.get("rules")):
+            continue
+        downloads = library.get("downloads", {})
+        artifact = downloads.get("artifact")
+        if artifact and artifact.get("url"):
+            artifacts[os.path.join(minecraft_directory, "libraries", artifact["path"])] = (artifact["url"], artifact.get("sha1"), artifact.get("size"))
+        classifier = library.get("natives", {}).get(os_name)
+        native = downloads.get("classifiers", {}).get(classifier.replace("${arch}", get_arch_bits())) if classifier else None
+        if native and native.get("url"):
+            artifacts[os.path.join(minecraft_directory, "libraries", native["path"])] = (native["url"], native.get("sha1"), native.get("size"))
+
+    asset_index = data.get("assetIndex")
+    if asset_index:
+        index_path = os.path.join(minecraft_directory, "assets", "indexes", f"{asset_index['id']}.json")
+        download_artifact(index_path, asset_index["url"], asset_index.get("sha1"))
+        for asset in iter_asset_index(index_path):
+            artifacts[os.path.join(minecraft_directory, "assets", "objects", asset.hash[:2], asset.hash)] = (f"{ASSET_OBJECTS_URL}/{asset.hash[:2]}/{asset.hash}", asset.hash, asset.size)
+
+
+
+class _Download():
+    """A download in progress: the calls waiting for it get its result."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = False
+        self.error: Exception = None
+
+
+
+_in_flight: dict[str, _Download] = {}
+_in_flight_lock = threading.Lock()
+
+def download_artifact(path: str, url: str, sha1: str = None, size: int = None) -> bool:
+    """
+    Downloads a file unless it is already present (same size when known, otherwise same SHA-1).
+
+    The file is written to '<path>.part', verified and renamed into place. Concurrent calls for the
+    same path wait for the first one instead of downloading it again, and return (or raise) what it
+    did. Returns True if downloaded.
+    """
+    with _in_flight_lock:
+        download = _in_flight.get(path)
+        waiting = download is not None
+        if not waiting:
+            download = _in_flight[path] = _Download()
+    if waiting:
+        download.done.wait()
+        if download.error:
+            raise Exception(f"Download of {url} failed: {download.error}")
+        return download.result
+
+    try:
+        if os.path.isfile(path):
+            if (size is not None and os.path.getsize(path) == size) or (size is None and (sha1 is None or get_file_sha1(path) == sha1)):
+                metrics.inc("cache_requests_total", cache="artifact", result="hit")
+                return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        response = http_client.get(url, stream=True)
+        response.raise_for_status()
+        digest = hashlib.sha1()
+        temp_path = path + ".part"
+        try:
+            with open(temp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    digest.update(chunk)
+                    f.write(chunk)
+            if sha1 and digest.hexdigest() != sha1:
+                raise Exception(f"Invalid checksum for {url}")
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        metrics.inc("cache_requests_total", cache="artifact", result="miss")
+        metrics.inc("downloaded_files_total")
+        metrics.inc("downloaded_bytes_total", os.path.getsize(path))
+        download.result = True
+        return True
+    except Exception as e:
+        download.error = e
+        raise
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(path).done.set()
+
+
+
+def get_file_sha1(path: str) -> str:
+    return hash_file(path, "sha1")[0]
+
+
+
+def download_artifacts(artifacts: dict, workers: int = 4, on_progress: Callable[[int, int], None] = None) -> int:
+    """Downloads the de-duplicated artifacts with a pool of workers. Returns the number of downloaded files."""
+    total = len(artifacts)
+    done = 0
+    downloaded = 0
+    lock = threading.Lock()
+
+    def worker(item):
+        nonlocal done, downloaded
+        path, (url, sha1, size) = item
+        result = download_artifact(path, url, sha1, size)
+        with lock:
+            done += 1
+            downloaded += 1 if result else 0
+            if on_progress:
+                on_progress(done, total)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for _ in executor.map(worker, artifacts.items()):
+            pass
+    return downloaded
+
+
+# ----- Queue -----
+
+
+class InstallQueue():
+    """
+    Queue of versions to install (vanilla or mod loader ids), persisted to the app storage so
+    pending installs resume after a restart. Events are sent to 'listeners' as (event, data):
+    "job" (version, state, error), "status" (version, status), "progress" (version, progress, max),
+    "artifacts" (done, total) and "finished".
+    """
+    def __init__(self, path: str = None, concurrency: int = None):
+        self.path = path
+        self.concurrency = concurrency
+        self.jobs: list[dict] = []
+        self.listeners: list[Callable[[str, dict], None]] = []
+        self.running = False
+        self._lock = threading.RLock()
+        self._thread: threading.Thread = None
+        self.load()
+
+    def load(self):
+        """Loads the persisted queue. Jobs interrupted while running are queued again."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.jobs = [job for job in json.load(f) if job.get("state") in {PENDING, RUNNING}]
+            for job in self.jobs:
+                job["state"] = PENDING
+        except Exception as e:
+            logger.error(f"Error loading the install queue: {e}")
+            self.jobs = []
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            try:
+                with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump(self.jobs, f)
+                os.replace(self.path + ".tmp", self.path)
+            except Exception as e:
+                logger.error(f"Error saving the install queue: {e}")
+
+    def emit(self, event: str, **data):
+        for listener in list(self.listeners):
+            try:
+                listener(event, data)
+            except Exception as e:
+                logger.error(f"Install queue listener error: {e}")
+
+    def add(self, version_ids: list[str]) -> bool:
+        """
+        Queues versions (already queued versions are ignored). Returns True if the queue is running:
+        the versions are then installed by the current run, otherwise start() must be called.
+        """
+        with self._lock:
+            queued = {job["version"] for job in self.jobs if job["state"] in {PENDING, RUNNING}}
+            for version_id in version_ids:
+                version_id = resolve_version_id(version_id)
+                if version_id not in queued:
+                    self.jobs.append({"version": version_id, "state": PENDING, "error": None})
+                    queued.add(version_id)
+            running = self.running
+        self.save()
+        return running
+
+    def pending(self) -> list[dict]:
+        with self._lock:
+            return [job for job in self.jobs if job["state"] == PENDING]
+
+    def set_state(self, job: dict, state: str, error: str = None):
+        with self._lock:
+            job["state"] = state
+            job["error"] = error
+            # Finished jobs leave the queue (failures are reported by the "job" event)
+            if state in {DONE, ERROR}:
+                self.jobs.remove(job)
+        self.save()
+        self.emit("job", version=job["version"], state=state, error=error)
+
+    def get_concurrency(self) -> int:
+        if self.concurrency:
+            return self.concurrency
+        return max(1, int(app_settings.get_setting(AppData.INSTALL_CONCURRENCY)))
+
+    def start(self):
+        """Processes the queue on a background thread (no-op if it is already running)."""
+        with self._lock:
+            if self.running:
+                return
+            self.running = True
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def run(self):
+        """Processes queued jobs until the queue is empty. Returns the number of failed jobs."""
+        with self._lock:
+            self.running = True
+        failed = 0
+        try:
+            while True:
+                # Checked under the lock so that a version added by add() is either seen here or starts a new run
+                with self._lock:
+                    batch = self.pending()
+                    if not batch:
+                        self.running = False
+                        break
+                failed += self.__run_batch(batch)
+        finally:
+            with self._lock:
+                self.running = False
+            remove_prefetched_versions()
+            metrics.flush()
+            self.emit("finished", failed=failed)
+        return failed
+
+    def __run_batch(self, batch: list[dict]) -> int:
+        # Group targets by Minecraft version: vanilla first, then its mod loaders
+        groups: dict[str, list[dict]] = {}
+        vanilla_jobs = set()
+        for job in batch:
+            try:
+                check = check_version(job["version"])
+                if not check or check == "not_compatible":
+                    raise Exception("This version is not compatible with the launcher or mod loaders installed.")
+                base_version = check[1] if check[0] == "vanilla" else check[3]
+                if check[0] == "vanilla":
+                    vanilla_jobs.add(job["version"])
+                groups.setdefault(base_version, []).append(job)
+            except Exception as e:
+                self.set_state(job, ERROR, str(e))
+        for jobs in groups.values():
+            jobs.sort(key=lambda job: job["version"] not in vanilla_jobs)
+
+        # Shared artifacts of every Minecraft version in the batch, downloaded once
+        artifacts = {}
+        for base_version in groups:
+            try:
+                collect_version_artifacts(base_version, artifacts)
+            except Exception as e:
+                logger.warning(f"Could not prefetch the files of {base_version}: {e}")
+        if artifacts:
+            self.emit("status", version=None, status=f"Downloading {len(artifacts)} shared files...")
+            # Libraries (with client jars and natives) and asset objects are timed as separate phases
+            assets_directory = os.path.join(app_settings.return_mc_directory(), "assets", "objects")
+            assets = {path: artifact for path, artifact in artifacts.items() if path.startswith(assets_directory)}
+            libraries = {path: artifact for path, artifact in artifacts.items() if path not in assets}
+            done_before = 0
+            for phase, phase_artifacts in (("library_download", libraries), ("asset_download", assets)):
+                try:
+                    with metrics.phase(phase):
+                        download_artifacts(phase_artifacts, workers=self.get_concurrency() * 4,
+                                           on_progress=lambda done, total, offset=done_before: self.emit("artifacts", done=offset + done, total=len(artifacts)))
+                except Exception as e:
+                    logger.warning(f"Prefetch error (the installers will retry): {e}")
+                done_before += len(phase_artifacts)
+
+        def run_group(jobs: list[dict]):
+            for job in jobs:
+                self.__install(job)
+
+        with ThreadPoolExecutor(max_workers=self.get_concurrency()) as executor:
+            for _ in executor.map(run_group, groups.values()):
+                pass
+        return len([job for job in batch if job["state"] == ERROR])
+
+    def __install(self, job: dict) -> bool:
+        version_id = job["version"]
+        maximum = {"value": 0}
+
+        def set_max(value):
+            maximum["value"] = value
+
+        callback = {
+            "setStatus": lambda status: self.emit("status", version=version_id, status=status),
+            "setProgress": lambda progress: self.emit("progress", version=version_id, progress=progress, max=maximum["value"]),
+            "setMax": set_max
+        }
+        self.set_state(job, RUNNING)
+        try:
+            install(version_id, callback)
+            self.set_state(job, DONE)
+            return True
+        except Exception as e:
+            self.set_state(job, ERROR, str(e))
+            return False
+
+
+install_queue = InstallQueue(path=get_app_storage_path(QUEUE_FILE))
@@ -0,0 +1,236 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Java runtime discovery index (no Flet).
+#
+# The usual JDK locations and the Mojang runtime directory are scanned once per session. The version,
+# vendor and architecture of every Java binary are cached in the app storage, keyed by path and mtime,
+# so a binary is only probed again when it changes. The 'release' file of the JDK is read when present,
+# 'java -XshowSettings:properties -version' is only run for installations without one.
+
+from modules.app_config import *
+import subprocess
+import threading
+import platform
+import glob
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+RUNTIME_INDEX_FILE = "java_runtimes.json"
+PROBE_TIMEOUT = 10 # Seconds to wait for 'java -version'
+
+_index: dict[str, dict] = None
+_lock = threading.Lock()
+
+
+def get_java_binary_name() -> str:
+    return "javaw.exe" if platform.system() == "Windows" else "java"
+
+
+
+def normalize_arch(arch: str) -> str:
+    """Normalizes an architecture name ("amd64", "x86_64" -> "x64", "aarch64" -> "arm64"...)."""
+    arch = (arch or "").lower()
+    if arch in {"amd64", "x86_64", "x64"}:
+        return "x64"
+    if arch in {"aarch64", "arm64"}:
+        return "arm64"
+    if arch in {"x86", "i386", "i586", "i686"}:
+        return "x86"
+    return arch
+
+
+
+def get_system_arch() -> str:
+    return normalize_arch(platform.machine())
+
+
+
+def parse_major_version(version: str) -> int:
+    """Returns the major version of a Java version string ("1.8.0_392" -> 8, "17.0.2" -> 17). 0 if unknown."""
+    match = re.match(r"(\d+)(?:\.(\d+))?", version or "")
+    if not match:
+        return 0
+    major = int(match.group(1))
+    if major == 1 and match.group(2):
+        return int(match.group(2))
+    return major
+
+
+
+def get_search_patterns() -> list[str]:
+    """Returns the glob patterns of the Java binaries in the usual JDK locations and the Mojang runtime directory."""
+    binary = get_java_binary_name()
+    home = os.path.expanduser("~")
+    patterns = [
+        # Runtimes installed by the launcher (minecraft-launcher-lib / the official launcher)
+        os.path.join(app_settings.return_mc_directory(), "runtime", "*", "*", "*", "bin", binary),
+        os.path.join(home, ".jdks", "*", "bin", binary),
+        os.path.join(home, ".sdkman", "candidates", "java", "*", "bin", binary),
+    ]
+    if os.getenv("JAVA_HOME"):
+        patterns.append(os.path.join(os.getenv("JAVA_HOME"), "bin", binary))
+
+    system = platform.system()
+    if system == "Windows":
+        for program_files in {os.getenv("ProgramFiles", "C:\\Program Files"), os.getenv("ProgramFiles(x86)", "C:\\Program Files (x86)")}:
+            for vendor in ["Java", "Eclipse Adoptium", "Eclipse Foundation", "AdoptOpenJDK", "Zulu", "Microsoft", "BellSoft", "Amazon Corretto", "Semeru"]:
+                patterns.append(os.path.join(program_files, vendor, "*", "bin", binary))
+    elif system == "Darwin":
+        patterns += [
+            os.path.join("/Library", "Java", "JavaVirtualMachines", "*", "Contents", "Home", "bin", binary),
+            os.path.join(home, "Library", "Java", "JavaVirtualMachines", "*", "Contents", "Home", "bin", binary),
+            os.path.join("/opt", "homebrew", "opt", "openjdk*", "bin", binary),
+        ]
+    else:
+        patterns += [
+            os.path.join("/usr", "lib", "jvm", "*", "bin", binary),
+            os.path.join("/usr", "lib64", "jvm", "*", "bin", binary),
+            os.path.join("/usr", "java", "*", "bin", binary),
+            os.path.join("/opt", "*", "bin", binary),
+        ]
+    return patterns
+
+
+
+def find_java_binaries() -> list[str]:
+    """Returns the real paths of the Java binaries found in the search locations and on the PATH."""
+    binaries = set()
+    for pattern in get_search_patterns():
+        for path in glob.glob(pattern):
+            if os.path.isfile(path):
+                binaries.add(os.path.realpath(path))
+    for directory in os.getenv("PATH", "").split(os.pathsep):
+        path = os.path.join(directory, get_java_binary_name())
+        if directory and os.path.isfile(path):
+            binaries.add(os.path.realpath(path))
+    return sorted(binaries)
+
+
+
+def read_release_file(java_path: str) -> dict:
+    """Reads the 'release' file of the JDK that contains 'java_path' (empty dict if there is none)."""
+    release_path = os.path.join(os.path.dirname(os.path.dirname(java_path)), "release")
+    properties = {}
+    try:
+        with open(release_path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                key, separator, value = line.partition("=")
+                if separator:
+                    properties[key.strip()] = value.strip().strip('"')
+    except OSError:
+        pass
+    return properties
+
+
+
+def probe_java(java_path: str) -> dict:
+    """Returns the version, vendor and architecture of a Java binary (None if it cannot be identified)."""
+    properties = read_release_file(java_path)
+    if properties.get("JAVA_VERSION"):
+        version = properties["JAVA_VERSION"]
+        vendor = properties.get("IMPLEMENTOR", "")
+        arch = properties.get("OS_ARCH", "")
+    else:
+        java_cli = os.path.join(os.path.dirname(java_path), "java.exe") if java_path.endswith("javaw.exe") else java_path
+        try:
+            kwargs = {"creationflags": subprocess.CREATE_NO_WINDOW} if platform.system() == "Windows" else {}
+            result = subprocess.run([java_cli, "-XshowSettings:properties", "-version"], capture_output=True, text=True,
+                                    encoding="utf-8", errors="replace", timeout=PROBE_TIMEOUT, **kwargs)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"Could not probe {java_path}: {e}")
+            return None
+        output = result.stderr + result.stdout
+        settings = dict(re.findall(r"^\s*(java\.version|java\.vendor|os\.arch) = (.*)$", output, re.MULTILINE))
+        version = settings.get("java.version")
+        if not version:
+            match = re.search(r'version "([^"]+)"', output)
+            version = match.group(1) if match else None
+        if not version:
+            return None
+        vendor = settings.get("java.vendor", "")
+        arch = settings.get("os.arch", "")
+
+    return {
+        "path": java_path,
+        "version": version,
+        "major": parse_major_version(version),
+        "vendor": vendor,
+        "arch": normalize_arch(arch) or get_system_arch(),
+        "mojang": java_path.startswith(os.path.realpath(os.path.join(app_settings.return_mc_directory(), "runtime")))
+    }
+
+
+
+def __load_index() -> dict:
+    try:
+        with open(get_app_storage_path(RUNTIME_INDEX_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+
+def __save_index(index: dict):
+    path = get_app_storage_path(RUNTIME_INDEX_FILE)
+    try:
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        logger.error(f"Error saving the Java runtime index: {e}")
+
+
+
+def get_java_runtimes(rescan: bool = False) -> list[dict]:
+    """
+    Returns the Java runtimes of this machine (path, version, major, vendor, arch, mojang).
+
+    The locations are scanned once per session (or when 'rescan' is True); binaries whose mtime did
+    not change since the last scan are taken from the cached index instead of being probed.
+    """
+    global _index
+    with _lock:
+        if _index is None or rescan:
+            cached = __load_index()
+            index = {}
+            for path in find_java_binaries():
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                entry = cached.get(path)
+                if not entry or entry.get("mtime") != mtime:
+                    entry = probe_java(path)
+                    if not entry:
+                        continue
+                    entry["mtime"] = mtime
+                index[path] = entry
+            if index != cached:
+                __save_index(index)
+            _index = index
+        return list(_index.values())
+
+
+
+def find_java(major_version: int) -> str:
+    """
+    Returns the best Java binary for a required major version, or None if there is no exact match.
+
+    Runtimes matching the system architecture come first, then the Mojang runtimes (the ones the game
+    is tested with), then the newest update of that major version.
+    """
+    candidates = [runtime for runtime in get_java_runtimes() if runtime["major"] == major_version and os.path.isfile(runtime["path"])]
+    if not candidates:
+        return None
+    system_arch = get_system_arch()
+
+    def version_key(runtime: dict) -> list[int]:
+        return [int(number) for number in re.findall(r"\d+", runtime["version"])]
+
+    candidates.sort(key=lambda runtime: (runtime["arch"] == system_arch, runtime["mojang"], version_key(runtime)), reverse=True)
+    return candidates[0]["path"]
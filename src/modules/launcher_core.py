@@ -0,0 +1,449 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Launcher logic shared by the Flet UI (modules/launcher.py) and the headless CLI (modules/cli.py).
+# Nothing in this module may import Flet.
+
+import minecraft_launcher_lib as mll
+from modules.app_config import *
+from modules.mirrors import install_requests_hook, rewrite_url
+from modules.http_client import http_client
+from modules.java_runtimes import find_java
+from modules.metrics import metrics
+from modules.profiling import profiled
+from modules.version_ids import parse_version_id
+from modules.asset_indexes import iter_asset_index
+from urllib.parse import urlsplit
+from typing import Callable
+import subprocess
+import functools
+import threading
+import platform
+import socket
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+VERSION_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+PROBE_TIMEOUT = 1.5 # Seconds to wait for the connectivity probe
+CONNECTIVITY_TTL = 30 # Seconds the connectivity state is reused
+METADATA_TTL = 10 * 60 # Seconds cached metadata (version manifest, loader versions) is used without a request
+METADATA_DIRECTORY = "metadata"
+
+
+# LAN mirror rules also apply to the requests made by minecraft-launcher-lib
+install_requests_hook()
+
+
+# ----- Connectivity & cached metadata -----
+
+
+_connectivity = {"online": None, "checked": 0.0}
+
+def is_online(force: bool = False) -> bool:
+    """
+    Returns whether the version manifest host (or the LAN mirror) is reachable.
+
+    The probe is a TCP connection with a short timeout (DNS included), cached for CONNECTIVITY_TTL seconds.
+    """
+    if not force and _connectivity["online"] is not None and time.time() - _connectivity["checked"] < CONNECTIVITY_TTL:
+        return _connectivity["online"]
+
+    url = urlsplit(rewrite_url(VERSION_MANIFEST_URL) or VERSION_MANIFEST_URL)
+    port = url.port or (443 if url.scheme == "https" else 80)
+    result = {"online": False}
+
+    def probe():
+        try:
+            socket.create_connection((url.hostname, port), timeout=PROBE_TIMEOUT).close()
+            result["online"] = True
+        except OSError:
+            pass
+
+    # getaddrinfo() has no timeout: probe on a thread and stop waiting after PROBE_TIMEOUT
+    thread = threading.Thread(target=probe, daemon=True)
+    thread.start()
+    thread.join(PROBE_TIMEOUT)
+    if _connectivity["online"] != result["online"]:
+        logger.info(f"Connectivity: {'online' if result['online'] else 'offline'}")
+    _connectivity.update(online=result["online"], checked=time.time())
+    return result["online"]
+
+
+
+_metadata_memory: dict[str, tuple[float, object]] = {} # {name: (cache file mtime, data)}
+
+def cached_metadata(name: str, fetch: Callable[[], object], ttl: int = METADATA_TTL):
+    """
+    Returns metadata from the local cache when it is recent (or when offline), otherwise from 'fetch()'
+    which is then cached. Returns None if the metadata was never cached and cannot be fetched.
+
+    The parsed cache file is kept in memory until the file changes, so repeated lookups do not read it again.
+    """
+    path = get_app_storage_path(METADATA_DIRECTORY, f"{name}.json")
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    cached = mtime is not None
+    fresh = cached and time.time() - mtime < ttl
+    memory = _metadata_memory.get(name)
+    if fresh and memory and memory[0] == mtime:
+        return memory[1]
+    if not fresh:
+        if is_online():
+            try:
+                with metrics.phase("manifest_fetch"):
+                    data = fetch()
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(path + ".tmp", path)
+                _metadata_memory[name] = (os.path.getmtime(path), data)
+                metrics.inc("cache_requests_total", cache="metadata", result="miss")
+                return data
+            except Exception as e:
+                logger.warning(f"Error fetching {name}, using the cached copy: {e}")
+    if cached and memory and memory[0] == mtime:
+        return memory[1]
+    metrics.inc("cache_requests_total", cache="metadata", result="hit" if fresh else "stale")
+    if cached:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            _metadata_memory[name] = (mtime, data)
+            return data
+        except Exception as e:
+            logger.warning(f"Invalid cached metadata {name}: {e}")
+    return None
+
+
+
+def get_version_manifest() -> dict:
+    """Returns Mojang's version manifest (cached, available offline once fetched)."""
+    return cached_metadata("version_manifest", lambda: http_client.get(VERSION_MANIFEST_URL, cache=True).json()) or {"latest": {}, "versions": []}
+
+
+
+def get_loader_minecraft_versions(loader: str, stable_only: bool = True) -> list[str]:
+    """Returns the Minecraft versions supported by a mod loader (cached, available offline once fetched)."""
+    mod_loader = mll.mod_loader.get_mod_loader(loader)
+    return cached_metadata(f"{loader}_minecraft_versions{'_stable' if stable_only else ''}",
+                           lambda: mod_loader.get_minecraft_versions(stable_only=stable_only)) or []
+
+
+
+def get_loader_versions(loader: str, minecraft_version: str, stable_only: bool = True) -> list[str]:
+    """Returns the loader versions available for a Minecraft version (cached, available offline once fetched)."""
+    mod_loader = mll.mod_loader.get_mod_loader(loader)
+    return cached_metadata(f"{loader}_loader_versions_{minecraft_version}{'_stable' if stable_only else ''}",
+                           lambda: mod_loader.get_loader_versions(minecraft_version, stable_only=stable_only)) or []
+
+
+# ----- Versions -----
+
+
+def get_installed_version_ids() -> list[str]:
+    """Returns the ids of the versions in the local 'versions' directory (no network)."""
+    return [v["id"] for v in mll.utils.get_installed_versions(app_settings.return_mc_directory())]
+
+
+
+def is_version_installed(version_id: str) -> bool:
+    """Checks if the specified Minecraft version is installed."""
+    version_id = resolve_version_id(version_id)
+    return version_id in get_installed_version_ids()
+
+
+
+_vanilla_ids = {"manifest": None, "ids": frozenset()}
+
+def get_vanilla_version_ids() -> frozenset:
+    """Returns the ids of the version manifest as a set (rebuilt only when the manifest changes)."""
+    manifest = get_version_manifest()
+    if manifest is not _vanilla_ids["manifest"]:
+        _vanilla_ids.update(manifest=manifest, ids=frozenset(v["id"] for v in manifest["versions"]))
+    return _vanilla_ids["ids"]
+
+
+
+def is_vanilla_version(version_id: str) -> bool:
+    """Checks if the id is a vanilla version (from the cached version manifest, or the local version JSON)."""
+    versions = get_vanilla_version_ids()
+    if versions:
+        return version_id in versions
+    try:
+        return "inheritsFrom" not in get_version_chain(version_id)[0]
+    except Exception:
+        return False
+
+
+
+def check_version(version: str) -> tuple:
+    """
+    Returns:\n
+    ("vanilla", version id) -> Vanilla version\n
+    ("mod_loader", loader, loader version, Minecraft version) -> Mod loader version\n
+    "not_compatible" -> Not compatible version
+
+    No network request: the loader support is checked against the cached loader metadata.
+    """
+    if is_vanilla_version(version):
+        return "vanilla", version
+    parsed = parse_version_id(version)
+    if parsed:
+        installed = os.path.isfile(os.path.join(app_settings.return_mc_directory(), "versions", version, f"{version}.json"))
+        if installed or parsed.minecraft_version in get_loader_minecraft_versions(parsed.loader, stable_only=False):
+            return "mod_loader", parsed.loader, parsed.loader_version, parsed.minecraft_version
+    return "not_compatible"
+
+
+
+def get_versions(version_type: str = "vanilla") -> dict:
+    """Returns a dict of all Minecraft versions (installed, release, snapshot, old_beta, old_alpha)"""
+    # Mod loaders
+    if version_type in mll.mod_loader.list_mod_loader():
+        return {
+            "installed": mll.utils.get_installed_versions(app_settings.return_mc_directory()),
+            "version": get_loader_minecraft_versions(version_type)
+        }
+    # Vanilla versions
+    else:
+        versions = get_version_manifest()["versions"]
+        installed = mll.utils.get_installed_versions(app_settings.return_mc_directory())
+        return {
+            "installed": installed,
+            "release": [v["id"] for v in versions if v["type"] == "release"],
+            "snapshot": [v["id"] for v in versions if v["type"] == "snapshot"],
+            "old_beta": [v["id"] for v in versions if v["type"] == "old_beta"],
+            "old_alpha": [v["id"] for v in versions if v["type"] == "old_alpha"]
+    }
+
+
+
+def get_latest_version() -> dict:
+    """Returns the latest release and snapshot ids ({"release": ..., "snapshot": ...}) from the cached version manifest."""
+    return get_version_manifest().get("latest", {})
+
+
+
+def resolve_version_id(version_id: str) -> str:
+    """Resolves the 'latest-release' and 'latest-snapshot' aliases to a version id (unchanged if unknown offline)."""
+    if version_id == "latest-release":
+        return get_latest_version().get("release", version_id)
+    elif version_id == "latest-snapshot":
+        return get_latest_version().get("snapshot", version_id)
+    return version_id
+
+
+# ----- Install & Launch -----
+
+
+@profiled("install")
+def install(version_id: str, callback: mll.types.CallbackDict = None) -> tuple:
+    """
+    Installs a vanilla or mod loader version into the Minecraft directory.
+
+    Returns the result of check_version(). Raises an exception if the version is not compatible.
+    """
+    check = check_version(version_id)
+    callback = callback if callback else {}
+
+    if check != "not_compatible" and type(check) != str and check is not None:
+        if check[0] == "vanilla":
+            # Vanilla installer
+            logger.info("Installing vanilla version", extra={"version": version_id})
+            with metrics.phase("vanilla_install"):
+                mll.install.install_minecraft_version(version=version_id, minecraft_directory=app_settings.return_mc_directory(), callback=callback)
+            return check
+
+        elif check[0] == "mod_loader":
+            # Mod loader installer
+            logger.info("Installing mod loader version", extra={"version": version_id, "loader": check[1], "loader_version": check[2], "minecraft_version": check[3]})
+            mod_loader = mll.mod_loader.get_mod_loader(check[1])
+            java = get_java_executable(check[3])
+            # The loader installer installs the Minecraft version, the loader libraries and runs the processors (Forge), all timed as one phase
+            with metrics.phase("loader_install", loader=check[1]):
+                mod_loader.install(minecraft_version=check[3], minecraft_directory=app_settings.return_mc_directory(), loader_version=check[2], callback=callback,
+                                   java=java)
+            return check
+
+    raise Exception("This version is not compatible with the launcher or mod loaders installed.")
+
+
+
+def get_required_java_version(version_id: str) -> int:
+    """Returns the Java major version required by an installed version ('javaVersion', Java 8 if not specified)."""
+    for data in get_version_chain(version_id):
+        if data.get("javaVersion"):
+            return data["javaVersion"].get("majorVersion", 8)
+    return 8
+
+
+
+def get_java_executable(version_id: str) -> str:
+    """
+    Returns the Java binary for a version: the 'executablePath' setting if set, otherwise the best match
+    of the runtime index. None lets minecraft-launcher-lib use its runtime (or the 'java' on the PATH).
+    """
+    java = app_settings.get_setting(AppData.EXECUTABLE_PATH)
+    if java:
+        return java
+    try:
+        java = find_java(get_required_java_version(version_id))
+    except Exception as e:
+        logger.warning(f"Java runtime lookup failed: {e}", extra={"version": version_id})
+        return None
+    if java:
+        logger.info("Using Java runtime", extra={"version": version_id, "java": java})
+    return java
+
+
+
+def get_launch_command(version_id: str) -> list[str]:
+    """Returns the command that starts the given version with the user settings."""
+    # Launch options
+    options: mll.types.MinecraftOptions = {
+        "username": app_settings.get_setting(AppData.USERNAME),
+        "uuid": app_settings.get_setting(AppData.UUID), # UUID offline
+        "token": "", # offline
+        "jvmArguments": app_settings.get_setting(AppData.JVM_ARGUMENTS), # JVM Arguments
+        # Launcher info
+        "launcherName": app_name,
+        "launcherVersion": app_version,
+    }
+
+    java = get_java_executable(version_id)
+    if java:
+        options["executablePath"] = java
+
+    with metrics.phase("command_build"):
+        return mll.command.get_minecraft_command(version=version_id,
+                                                 minecraft_directory=app_settings.return_mc_directory(),
+                                                 options=options)
+
+
+
+def spawn_game(command: list[str], **kwargs) -> subprocess.Popen:
+    """Starts the game process (without a console window on Windows)."""
+    if platform.system() == "Windows":
+        kwargs.setdefault("creationflags", subprocess.CREATE_NO_WINDOW)
+    with metrics.phase("spawn"):
+        return subprocess.Popen(command, **kwargs)
+
+
+
+def record_game_exit(return_code: int, started: float):
+    """Records the exit code and session duration of a game process ('started' from time.time())."""
+    metrics.inc("game_exits_total", code=str(return_code))
+    metrics.observe("game_session_seconds", time.time() - started)
+    metrics.flush()
+
+
+# ----- Version files -----
+
+
+def get_os_name() -> str:
+    """Returns the OS name used in version JSON rules ("windows", "osx" or "linux")."""
+    system = platform.system()
+    if system == "Windows":
+        return "windows"
+    elif system == "Darwin":
+        return "osx"
+    return "linux"
+
+
+
+@functools.lru_cache(maxsize=1)
+def get_arch_bits() -> str:
+    """Returns "64" or "32" (the ${arch} of native classifiers). platform.architecture() runs 'file' on every call."""
+    return platform.architecture()[0][:2]
+
+
+
+def rules_allow(rules: list) -> bool:
+    """Evaluates a version JSON rule list for the current OS (features are treated as disabled)."""
+    if not rules:
+        return True
+    allowed = False
+    for rule in rules:
+        matches = True
+        os_rule = rule.get("os", {})
+        if "name" in os_rule and os_rule["name"] != get_os_name():
+            matches = False
+        if "arch" in os_rule and os_rule["arch"] == "x86" and get_arch_bits() != "32":
+            matches = False
+        if rule.get("features"):
+            matches = False
+        if matches:
+            allowed = rule.get("action") == "allow"
+    return allowed
+
+
+
+def get_library_path(name: str) -> str:
+    """Converts a maven name (group:artifact:version[:classifier][@ext]) to its path inside 'libraries'."""
+    name, _, extension = name.partition("@")
+    parts = name.split(":")
+    group, artifact, version = parts[0], parts[1], parts[2]
+    classifier = f"-{parts[3]}" if len(parts) > 3 else ""
+    return "/".join(group.split(".") + [artifact, version, f"{artifact}-{version}{classifier}.{extension or 'jar'}"])
+
+
+
+def get_version_chain(version_id: str, minecraft_directory: str = None) -> list[dict]:
+    """Returns the installed version JSON followed by every version it inherits from."""
+    minecraft_directory = minecraft_directory if minecraft_directory else app_settings.return_mc_directory()
+    chain = []
+    while version_id:
+        with open(os.path.join(minecraft_directory, "versions", version_id, f"{version_id}.json"), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        chain.append(data)
+        version_id = data.get("inheritsFrom")
+    return chain
+
+
+
+def iter_version_files(version_id: str, minecraft_directory: str = None, include_assets: bool = True):
+    """
+    Yields (kind, path, sha1, size) for every file the version needs: client jars, libraries,
+    natives for this OS, the asset index and its asset objects. 'sha1' and 'size' may be None.
+    """
+    minecraft_directory = minecraft_directory if minecraft_directory else app_settings.return_mc_directory()
+    os_name = get_os_name()
+    asset_index = None
+
+    for data in get_version_chain(version_id, minecraft_directory):
+        client = data.get("downloads", {}).get("client")
+        if client:
+            yield "client", os.path.join(minecraft_directory, "versions", data["id"], f"{data['id']}.jar"), client.get("sha1"), client.get("size")
+
+        for library in data.get("libraries", []):
+            if not rules_allow(library.get("rules")):
+                continue
+            downloads = library.get("downloads", {})
+            artifact = downloads.get("artifact")
+            if artifact and artifact.get("path"):
+                yield "library", os.path.join(minecraft_directory, "libraries", artifact["path"]), artifact.get("sha1"), artifact.get("size")
+            elif not downloads and "name" in library:
+                yield "library", os.path.join(minecraft_directory, "libraries", get_library_path(library["name"])), library.get("sha1"), library.get("size")
+
+            classifier = library.get("natives", {}).get(os_name)
+            if classifier:
+                classifier = classifier.replace("${arch}", get_arch_bits())
+                native = downloads.get("classifiers", {}).get(classifier)
+                if native:
+                    yield "native", os.path.join(minecraft_directory, "libraries", native["path"]), native.get("sha1"), native.get("size")
+
+        if asset_index is None and data.get("assetIndex"):
+            asset_index = data["assetIndex"]
+
+    if asset_index and include_assets:
+        index_path = os.path.join(minecraft_directory, "assets", "indexes", f"{asset_index['id']}.json")
+        yield "asset_index", index_path, asset_index.get("sha1"), asset_index.get("size")
+        if os.path.exists(index_path):
+            for asset in iter_asset_index(index_path):
+                yield "asset", os.path.join(minecraft_directory, "assets", "objects", asset.hash[:2], asset.hash), asset.hash, asset.size
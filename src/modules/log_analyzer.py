@@ -0,0 +1,228 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Crash and log analyzer (no Flet).
+#
+# Known failure signatures are compiled into a single regular expression (one named group per
+# signature) and a log is classified in one streaming pass, one search per line. Analyzed crash
+# reports ('crash-reports/*.txt' and the output of failed launches) are kept in a SQLite full-text
+# index in the app storage, so past crashes can be searched.
+
+from modules.app_config import *
+from typing import Iterable
+import sqlite3
+import json
+import time
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+CRASH_INDEX_FILE = "crash_index.sqlite3"
+CRASH_LOGS_DIRECTORY = "crash_logs"
+MAX_SAMPLES = 3 # Matching lines kept per signature
+INDEXED_TEXT_LIMIT = 256 * 1024 # Characters of each report stored in the full-text index
+
+# (id, title, advice, pattern)
+SIGNATURES = [
+    ("java_version", "Wrong Java version",
+     "This version needs a different Java. Clear the Java executable setting to let the launcher pick a matching runtime, or select the required version.",
+     r"UnsupportedClassVersionError|compiled by a more recent version of the Java Runtime|requires (?:Java|java) \d+|Unsupported Java detected|Minecraft \S+ requires Java"),
+    ("out_of_memory", "Out of memory",
+     "The game ran out of memory. Increase the maximum memory (RAM) in the settings, or lower it if the system itself has too little free memory.",
+     r"java\.lang\.OutOfMemoryError|Could not reserve enough space for (?:object heap|\d+KB object heap)|insufficient memory for the Java Runtime"),
+    ("missing_natives", "Missing native libraries",
+     "The native libraries (LWJGL) could not be loaded. Repair the version to download them again.",
+     r"UnsatisfiedLinkError|no lwjgl\w* in java\.library\.path|Failed to locate library: \S*lwjgl|Can't load library"),
+    ("mod_conflict", "Incompatible or duplicate mods",
+     "Two mods conflict, a mod is duplicated or a dependency is missing. Check the mods listed below in the 'mods' folder (or the profile's mod set).",
+     r"Incompatible mods? found|Mod resolution failed|ModResolutionException|DuplicateModsFoundException|Found duplicate mods|Missing or unsupported mandatory dependencies|requires (?:any version|version \S+) of \S+, which is missing|Mod \S+ requires"),
+    ("mixin", "Mod mixin failure",
+     "A mod failed to patch the game (mixin). The mod is probably made for another Minecraft or loader version.",
+     r"MixinApplyError|InvalidInjectionException|Mixin apply (?:for mod \S+ )?failed|MixinTransformerError"),
+    ("opengl", "Graphics driver / OpenGL error",
+     "The graphics driver does not support the required OpenGL version. Update the graphics driver.",
+     r"Pixel format not accelerated|GLFW error 6554[2-5]|No OpenGL context|does not appear to support OpenGL|OpenGL 3\.2 (?:is|not) (?:not )?supported"),
+    ("corrupt_file", "Corrupt game file",
+     "A game file is corrupt. Repair the version (or run 'verify --hash').",
+     r"java\.util\.zip\.ZipException|invalid LOC header|zip END header not found|Invalid or corrupt jarfile"),
+    ("missing_class", "Missing class",
+     "A class could not be found: a library or a mod dependency is missing.",
+     r"ClassNotFoundException|NoClassDefFoundError"),
+    ("jvm_arguments", "Invalid JVM arguments",
+     "Java could not start with the current JVM arguments.",
+     r"Unrecognized VM option|Could not create the Java Virtual Machine|Invalid maximum heap size|Unrecognized option: "),
+    ("world_locked", "World already in use",
+     "The world is open in another game instance.",
+     r"session\.lock: already locked|SessionLock"),
+]
+
+COMBINED_PATTERN = re.compile("|".join(f"(?P<{signature_id}>{pattern})" for signature_id, title, advice, pattern in SIGNATURES))
+SIGNATURE_INFO = {signature_id: (title, advice) for signature_id, title, advice, pattern in SIGNATURES}
+EXCEPTION_PATTERN = re.compile(r"^(?:Exception in thread \"[^\"]*\" )?(?:Caused by: )?([\w$.]+(?:Exception|Error))(?::\s*(.*))?$")
+CRASH_REPORT_PATTERN = re.compile(r"Crash report saved to:\s*(?:#@!@#\s*)?(.+?\.txt)")
+DESCRIPTION_PATTERN = re.compile(r"^Description:\s*(.+)$")
+
+
+def analyze_lines(lines: Iterable[str]) -> dict:
+    """
+    Classifies a log in one pass. Returns {"signatures": [{"id", "title", "advice", "count", "first_line", "samples"}],
+    "exception": first exception, "root_cause": last 'Caused by', "description", "crash_report", "lines"}.
+    """
+    found: dict[str, dict] = {}
+    result = {"signatures": [], "exception": None, "root_cause": None, "description": None, "crash_report": None, "lines": 0}
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        result["lines"] = number
+        match = COMBINED_PATTERN.search(line)
+        if match:
+            signature = found.get(match.lastgroup)
+            if not signature:
+                title, advice = SIGNATURE_INFO[match.lastgroup]
+                signature = found[match.lastgroup] = {"id": match.lastgroup, "title": title, "advice": advice, "count": 0, "first_line": number, "samples": []}
+            signature["count"] += 1
+            if len(signature["samples"]) < MAX_SAMPLES:
+                signature["samples"].append(line.strip()[:300])
+
+        stripped = line.strip()
+        if stripped.endswith(("Exception", "Error")) or "Exception: " in stripped or "Error: " in stripped:
+            exception = EXCEPTION_PATTERN.match(stripped)
+            if exception:
+                if result["exception"] is None:
+                    result["exception"] = stripped[:300]
+                if stripped.startswith("Caused by: "):
+                    result["root_cause"] = stripped[:300]
+        if result["description"] is None and line.startswith("Description:"):
+            result["description"] = DESCRIPTION_PATTERN.match(line).group(1)
+        if "Crash report saved to:" in line:
+            report = CRASH_REPORT_PATTERN.search(line)
+            if report:
+                result["crash_report"] = report.group(1).strip()
+
+    # Most specific first: the order of SIGNATURES, 'missing_class' is usually a symptom of the others
+    result["signatures"] = sorted(found.values(), key=lambda signature: [s[0] for s in SIGNATURES].index(signature["id"]))
+    return result
+
+
+
+def analyze_text(text: str) -> dict:
+    return analyze_lines(text.splitlines())
+
+
+
+def analyze_file(path: str) -> dict:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return analyze_lines(f)
+
+
+
+def format_diagnosis(analysis: dict) -> str:
+    """Returns a short, human readable diagnosis."""
+    lines = []
+    for signature in analysis["signatures"]:
+        lines.append(f"{signature['title']}: {signature['advice']}")
+        lines += [f"    {sample}" for sample in signature["samples"][:1]]
+    if analysis["description"]:
+        lines.append(f"Description: {analysis['description']}")
+    if analysis["root_cause"] or analysis["exception"]:
+        lines.append(f"Error: {analysis['root_cause'] or analysis['exception']}")
+    if analysis["crash_report"]:
+        lines.append(f"Crash report: {analysis['crash_report']}")
+    return "\n".join(lines) if lines else "No known cause found."
+
+
+# ----- Crash index -----
+
+
+class CrashIndex():
+    """Full-text index of the analyzed crash reports (SQLite FTS5, or LIKE queries if FTS5 is not available)."""
+    def __init__(self, path: str = None):
+        self.path = path if path else get_app_storage_path(CRASH_INDEX_FILE)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS crashes (id INTEGER PRIMARY KEY, path TEXT UNIQUE, mtime REAL, created REAL, version TEXT, signatures TEXT, summary TEXT)")
+        try:
+            self.connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS crash_text USING fts5(content)")
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS crash_text (rowid INTEGER PRIMARY KEY, content TEXT)")
+            self.fts = False
+        self.connection.commit()
+
+    def add(self, path: str, version: str = None) -> dict:
+        """Analyzes and indexes a crash report / log (re-indexed if it changed). Returns the analysis."""
+        mtime = os.path.getmtime(path)
+        row = self.connection.execute("SELECT id, mtime FROM crashes WHERE path = ?", (path,)).fetchone()
+        analysis = analyze_file(path)
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            content = f.read(INDEXED_TEXT_LIMIT)
+        with self.connection:
+            if row:
+                self.connection.execute("DELETE FROM crash_text WHERE rowid = ?", (row[0],))
+                self.connection.execute("DELETE FROM crashes WHERE id = ?", (row[0],))
+            cursor = self.connection.execute("INSERT INTO crashes (path, mtime, created, version, signatures, summary) VALUES (?, ?, ?, ?, ?, ?)",
+                                             (path, mtime, time.time(), version, json.dumps([s["id"] for s in analysis["signatures"]]), format_diagnosis(analysis)))
+            self.connection.execute("INSERT INTO crash_text (rowid, content) VALUES (?, ?)", (cursor.lastrowid, content))
+        return analysis
+
+    def update(self, directory: str = None) -> int:
+        """Indexes the new or changed crash reports of 'crash-reports' (and the launcher crash logs). Returns the number indexed."""
+        directories = [directory] if directory else [os.path.join(app_settings.return_mc_directory(), "crash-reports"), get_app_storage_path(CRASH_LOGS_DIRECTORY)]
+        indexed = dict(self.connection.execute("SELECT path, mtime FROM crashes").fetchall())
+        count = 0
+        for crash_directory in directories:
+            if not os.path.isdir(crash_directory):
+                continue
+            for entry in os.scandir(crash_directory):
+                if entry.is_file() and entry.name.endswith((".txt", ".log")) and indexed.get(entry.path) != entry.stat().st_mtime:
+                    try:
+                        self.add(entry.path)
+                        count += 1
+                    except Exception as e:
+                        logger.warning(f"Could not index {entry.path}: {e}")
+        return count
+
+    def search(self, query: str = None, limit: int = 20) -> list[dict]:
+        """Returns the crashes matching a full-text query (newest first), or the latest crashes without a query."""
+        columns = "crashes.path, crashes.mtime, crashes.version, crashes.signatures, crashes.summary"
+        if not query:
+            rows = self.connection.execute(f"SELECT {columns} FROM crashes ORDER BY crashes.mtime DESC LIMIT ?", (limit,)).fetchall()
+        elif self.fts:
+            # Every word as a quoted term: no FTS syntax errors on user input
+            fts_query = " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+            rows = self.connection.execute(f"SELECT {columns} FROM crash_text JOIN crashes ON crashes.id = crash_text.rowid WHERE crash_text MATCH ? ORDER BY crashes.mtime DESC LIMIT ?",
+                                           (fts_query, limit)).fetchall()
+        else:
+            rows = self.connection.execute(f"SELECT {columns} FROM crash_text JOIN crashes ON crashes.id = crash_text.rowid WHERE crash_text.content LIKE ? ORDER BY crashes.mtime DESC LIMIT ?",
+                                           (f"%{query}%", limit)).fetchall()
+        return [{"path": path, "mtime": mtime, "version": version, "signatures": json.loads(signatures), "summary": summary}
+                for path, mtime, version, signatures, summary in rows]
+
+    def close(self):
+        self.connection.close()
+
+
+
+def record_crash(output: str, version_id: str) -> tuple[str, dict]:
+    """
+    Saves the output of a failed launch to the crash logs, indexes it (with the crash report the game
+    wrote, if any) and returns (log path, analysis).
+    """
+    file_name = re.sub(r"[^\w.-]", "_", f"{time.strftime('%Y-%m-%d_%H.%M.%S')}-{version_id}.log")
+    path = get_app_storage_path(CRASH_LOGS_DIRECTORY, file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(output)
+    index = CrashIndex()
+    try:
+        analysis = index.add(path, version_id)
+        if analysis["crash_report"] and os.path.isfile(analysis["crash_report"]):
+            report = index.add(analysis["crash_report"], version_id)
+            # The crash report is usually more precise than the console output
+            known = {signature["id"] for signature in analysis["signatures"]}
+            analysis["signatures"] += [signature for signature in report["signatures"] if signature["id"] not in known]
+            analysis["description"] = analysis["description"] or report["description"]
+            analysis["root_cause"] = report["root_cause"] or analysis["root_cause"]
+    finally:
+        index.close()
+    return path, analysis
@@ -0,0 +1,160 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Install / launch metrics (no Flet).
+#
+# Counters and histograms are kept in memory. Every update is appended (from the logging listener
+# thread) to a rotating JSONL file in the app storage ("metrics/metrics.jsonl") and, when a path is configured ('metricsTextfile' setting,
+# PYZ_METRICS_TEXTFILE or the CLI --metrics-textfile option), the current values are written in the
+# Prometheus text format for the node_exporter textfile collector.
+
+from modules.app_config import *
+from modules.app_logging import start_queue_handler
+from logging.handlers import RotatingFileHandler
+from contextlib import contextmanager
+import threading
+import logging
+import json
+import time
+
+logger = logging.getLogger(__name__)
+
+METRICS_DIRECTORY = "metrics"
+JSONL_FILE = "metrics.jsonl"
+JSONL_MAX_BYTES = 5 * 1024 * 1024
+JSONL_BACKUPS = 3
+TEXTFILE_INTERVAL = 5 # Minimum seconds between two textfile writes (flush() writes immediately)
+PREFIX = "pyz_launcher_"
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+HELP = {
+    "downloaded_bytes_total": "Bytes downloaded by the install queue",
+    "downloaded_files_total": "Files downloaded by the install queue",
+    "cache_requests_total": "Cache lookups by cache and result (hit / miss / stale)",
+    "phase_duration_seconds": "Duration of the install and launch phases",
+    "game_exits_total": "Game exits by exit code",
+    "game_session_seconds": "Duration of the game sessions",
+}
+
+
+def format_labels(labels: tuple) -> str:
+    """Formats label pairs as {key="value",...} (escaped as the text format requires)."""
+    items = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        items.append(f'{key}="{value}"')
+    return "{" + ",".join(items) + "}" if items else ""
+
+
+
+class Metrics():
+    """Counters and histograms with labels, exported as JSON lines and Prometheus text."""
+    def __init__(self):
+        self.counters: dict[tuple, float] = {}
+        self.histograms: dict[tuple, dict] = {}
+        self.textfile: str = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_textfile_write = 0.0
+        self._logger: logging.Logger = None
+
+    def __jsonl_logger(self) -> logging.Logger:
+        if self._logger is None:
+            path = get_app_storage_path(METRICS_DIRECTORY, JSONL_FILE)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._logger = logging.getLogger("pyz.metrics")
+            self._logger.propagate = False # Not in the launcher log
+            self._logger.setLevel(logging.INFO)
+            # Written by a listener thread, like the launcher log
+            self._logger.addHandler(start_queue_handler(RotatingFileHandler(path, maxBytes=JSONL_MAX_BYTES, backupCount=JSONL_BACKUPS, encoding="utf-8")))
+        return self._logger
+
+    def __record(self, metric_type: str, name: str, value: float, labels: dict):
+        try:
+            self.__jsonl_logger().info(json.dumps({"ts": round(time.time(), 3), "type": metric_type, "name": name, "value": value, "labels": labels}))
+        except Exception as e:
+            logger.error(f"Error writing metrics: {e}")
+        if self.get_textfile() and time.time() - self._last_textfile_write >= TEXTFILE_INTERVAL:
+            self.flush()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increments a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+        self.__record("counter", name, value, labels)
+
+    def observe(self, name: str, value: float, **labels):
+        """Adds an observation to a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.setdefault(key, {"buckets": [0] * len(DURATION_BUCKETS), "sum": 0.0, "count": 0})
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+        self.__record("histogram", name, round(value, 6), labels)
+
+    @contextmanager
+    def phase(self, phase: str, **labels):
+        """Times a block as 'phase_duration_seconds{phase=...}' (also when it raises, with result="error")."""
+        start = time.perf_counter()
+        result = "ok"
+        try:
+            yield
+        except Exception:
+            result = "error"
+            raise
+        finally:
+            self.observe("phase_duration_seconds", time.perf_counter() - start, phase=phase, result=result, **labels)
+
+    def get_textfile(self) -> str:
+        if self.textfile is not None:
+            return self.textfile
+        try:
+            return os.getenv("PYZ_METRICS_TEXTFILE") or (app_settings.settings or {}).get(AppData.METRICS_TEXTFILE.value, "")
+        except Exception:
+            return ""
+
+    def to_prometheus(self) -> str:
+        """Returns the current values in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+        written = set()
+        for (name, labels), value in counters:
+            if name not in written:
+                written.add(name)
+                lines += [f"# HELP {PREFIX}{name} {HELP.get(name, name)}", f"# TYPE {PREFIX}{name} counter"]
+            lines.append(f"{PREFIX}{name}{format_labels(labels)} {value}")
+        for (name, labels), histogram in histograms:
+            if name not in written:
+                written.add(name)
+                lines += [f"# HELP {PREFIX}{name} {HELP.get(name, name)}", f"# TYPE {PREFIX}{name} histogram"]
+            for bound, count in zip(DURATION_BUCKETS + ("+Inf",), histogram["buckets"] + [histogram["count"]]):
+                bucket_labels = format_labels(labels + (("le", bound),))
+                lines.append(f"{PREFIX}{name}_bucket{bucket_labels} {count}")
+            lines.append(f"{PREFIX}{name}_sum{format_labels(labels)} {round(histogram['sum'], 6)}")
+            lines.append(f"{PREFIX}{name}_count{format_labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        """Writes the Prometheus textfile now (atomically, the collector never reads a partial file)."""
+        textfile = self.get_textfile()
+        if not textfile:
+            return
+        with self._flush_lock:
+            self._last_textfile_write = time.time()
+            temp_file = f"{textfile}.{os.getpid()}.tmp"
+            try:
+                with open(temp_file, "w", encoding="utf-8") as f:
+                    f.write(self.to_prometheus())
+                os.replace(temp_file, textfile)
+            except Exception as e:
+                logger.error(f"Error writing the metrics textfile: {e}")
+
+
+metrics = Metrics()
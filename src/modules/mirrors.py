@@ -0,0 +1,100 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Base-URL rewrite rules that send Mojang / Fabric / Quilt / Forge requests to a local mirror
+# (for example another launcher running the LAN cache server, see modules/cache_server.py).
+#
+# The rules are applied to every request made with 'requests' (the launcher HTTP client and
+# minecraft-launcher-lib alike). When the mirror fails, the public endpoint is used instead.
+
+from modules.app_config import *
+from urllib.parse import urlsplit
+import requests
+import threading
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Public endpoints and their path on a mirror (the layout served by the LAN cache server)
+KNOWN_ENDPOINTS = {
+    "https://launchermeta.mojang.com/": "meta/launchermeta/",
+    "https://piston-meta.mojang.com/": "meta/piston-meta/",
+    "https://piston-data.mojang.com/": "data/piston-data/",
+    "https://launcher.mojang.com/": "data/launcher/",
+    "https://libraries.minecraft.net/": "libraries/",
+    "https://resources.download.minecraft.net/": "assets/",
+    "https://meta.fabricmc.net/": "fabric-meta/",
+    "https://maven.fabricmc.net/": "fabric-maven/",
+    "https://meta.quiltmc.org/": "quilt-meta/",
+    "https://maven.quiltmc.org/": "quilt-maven/",
+    "https://maven.minecraftforge.net/": "forge-maven/",
+    "https://files.minecraftforge.net/": "forge-files/",
+}
+
+# Requests sent with this header skip the mirror (used by the cache server to reach the upstream)
+NO_MIRROR_HEADER = "X-PyZ-No-Mirror"
+# Seconds a mirror host is skipped after a connection error
+MIRROR_RETRY_AFTER = 60
+
+_down_until: dict[str, float] = {}
+_lock = threading.Lock()
+_original_request = requests.Session.request
+
+
+def get_rules() -> list[tuple[str, str]]:
+    """
+    Returns the (public prefix, mirror prefix) rewrite rules from the settings and environment.
+
+    'mirrorUrl' (or PYZ_MIRROR_URL) maps every known endpoint to a mirror with the cache server layout,
+    'mirrorRules' adds explicit {"from": ..., "to": ...} rules which take precedence.
+    """
+    settings = app_settings.settings or {}
+    rules = [(rule["from"], rule["to"]) for rule in settings.get(AppData.MIRROR_RULES.value, []) if rule.get("from") and rule.get("to")]
+    mirror_url = os.getenv("PYZ_MIRROR_URL") or settings.get(AppData.MIRROR_URL.value, "")
+    if mirror_url:
+        mirror_url = mirror_url.rstrip("/") + "/"
+        rules += [(endpoint, mirror_url + path) for endpoint, path in KNOWN_ENDPOINTS.items()]
+    return rules
+
+
+
+def rewrite_url(url: str) -> str:
+    """Returns the mirror URL for 'url', or None if no rule matches (or the mirror is marked as down)."""
+    for prefix, mirror_prefix in get_rules():
+        if url.startswith(prefix):
+            if time.time() < _down_until.get(urlsplit(mirror_prefix).netloc, 0):
+                return None
+            return mirror_prefix + url[len(prefix):]
+    return None
+
+
+
+def _mirrored_request(self, method, url, *args, **kwargs):
+    """requests.Session.request with the mirror rules applied and the public endpoint as fallback."""
+    headers = kwargs.get("headers")
+    if headers and NO_MIRROR_HEADER in headers:
+        kwargs["headers"] = {key: value for key, value in headers.items() if key != NO_MIRROR_HEADER}
+        return _original_request(self, method, url, *args, **kwargs)
+
+    mirror_url = rewrite_url(url) if isinstance(url, str) else None
+    if mirror_url:
+        try:
+            response = _original_request(self, method, mirror_url, *args, **kwargs)
+            if response.status_code < 400:
+                return response
+            response.close()
+            logger.warning(f"Mirror returned {response.status_code} for {mirror_url}, using {url}")
+        except requests.RequestException as e:
+            logger.warning(f"Mirror unavailable ({e}), using the public endpoints for {MIRROR_RETRY_AFTER}s")
+            with _lock:
+                _down_until[urlsplit(mirror_url).netloc] = time.time() + MIRROR_RETRY_AFTER
+    return _original_request(self, method, url, *args, **kwargs)
+
+
+
+def install_requests_hook():
+    """Applies the mirror rules to every requests.Session (idempotent)."""
+    if requests.Session.request is not _mirrored_request:
+        requests.Session.request = _mirrored_request
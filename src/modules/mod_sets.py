@@ -0,0 +1,304 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Per-profile mod sets (no Flet).
+#
+# Every mod jar is stored once in a content-addressed pool and each mod set is a small JSON file
+# ({file name: SHA-1}). Before a launcher profile starts, the 'mods' directory is assembled from the
+# mod set assigned to it with hardlinks (symlinks or copies as fallbacks), so switching between
+# modpacks only links / unlinks the files that differ and uses no extra disk. A profile without a mod
+# set gets the 'mods' directory back as it was before the mod sets (DEFAULT_MOD_SET).
+#
+# A linked jar shares its content with the pool: a jar rewritten in place (by a mod or by hand) is
+# detected by its SHA-1 when the set is captured again and stored as a new pool object; the other
+# sets that used the old content lose that mod instead of silently running the changed one.
+#
+#   <minecraft directory>/mod_sets/pool/<sha1[:2]>/<sha1>
+#   <minecraft directory>/mod_sets/<name>.json
+#   <minecraft directory>/mod_sets/state.json       (active mod set)
+
+from modules.app_config import *
+from modules.hashing import hash_file
+import shutil
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+MOD_SETS_DIRECTORY = "mod_sets"
+STATE_FILE = "state.json"
+DEFAULT_MOD_SET = "default" # Receives the mods found in 'mods' before the first mod set is activated
+
+_verified_pool_objects: dict[str, tuple[int, int]] = {} # {SHA-1: (size, mtime)} of the pool objects hashed by this process
+
+
+def get_mod_sets_directory(*paths: str) -> str:
+    return os.path.join(app_settings.return_mc_directory(), MOD_SETS_DIRECTORY, *paths)
+
+
+
+def get_mods_directory() -> str:
+    return os.path.join(app_settings.return_mc_directory(), "mods")
+
+
+
+def get_mod_set_path(name: str) -> str:
+    if not re.fullmatch(r"[\w .-]+", name or "") or name.strip(". ") == "" or name in {"pool", STATE_FILE[:-5]}:
+        raise ValueError(f"Invalid mod set name: {name!r}")
+    return get_mod_sets_directory(f"{name}.json")
+
+
+
+def get_pool_path(sha1: str) -> str:
+    return get_mod_sets_directory("pool", sha1[:2], sha1)
+
+
+
+def __read_json(path: str, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+
+def __write_json(path: str, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+
+def list_mod_sets() -> list[str]:
+    directory = get_mod_sets_directory()
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name[:-5] for name in os.listdir(directory) if name.endswith(".json") and name != STATE_FILE)
+
+
+
+def load_mod_set(name: str) -> dict[str, str]:
+    """Returns the mods of a set ({file name: SHA-1})."""
+    return __read_json(get_mod_set_path(name), {"mods": {}})["mods"]
+
+
+
+def save_mod_set(name: str, mods: dict[str, str]):
+    __write_json(get_mod_set_path(name), {"mods": dict(sorted(mods.items()))})
+
+
+
+def get_active_mod_set() -> str:
+    return __read_json(get_mod_sets_directory(STATE_FILE), {}).get("active")
+
+
+
+def __set_active_mod_set(name: str):
+    __write_json(get_mod_sets_directory(STATE_FILE), {"active": name})
+
+
+
+def link_file(source: str, destination: str):
+    """Creates 'destination' as a hardlink of 'source' (symlink, then copy, when hardlinks are not possible)."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        try:
+            os.symlink(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+
+
+
+def is_pool_file(path: str, sha1: str) -> bool:
+    """Checks if 'path' is the pool object 'sha1' (same inode for hardlinks, same target for symlinks)."""
+    pool_path = get_pool_path(sha1)
+    try:
+        return os.path.samefile(path, pool_path)
+    except OSError:
+        return False
+
+
+
+def is_pool_object_intact(sha1: str) -> bool:
+    """Checks that a pool object still has its SHA-1 (hashed again only when its size or modification time changed)."""
+    pool_path = get_pool_path(sha1)
+    try:
+        stat = os.stat(pool_path)
+        if _verified_pool_objects.get(sha1) != (stat.st_size, stat.st_mtime_ns):
+            if hash_file(pool_path, "sha1")[0] != sha1:
+                return False
+            _verified_pool_objects[sha1] = (stat.st_size, stat.st_mtime_ns)
+        return True
+    except OSError:
+        return False
+
+
+
+def add_to_pool(path: str, link: bool = False) -> str:
+    """Stores a file in the pool (once per content) and returns its SHA-1. With 'link', the file is hardlinked instead of copied."""
+    sha1 = hash_file(path, "sha1")[0]
+    pool_path = get_pool_path(sha1)
+    if not os.path.exists(pool_path):
+        os.makedirs(os.path.dirname(pool_path), exist_ok=True)
+        temp_path = f"{pool_path}.tmp"
+        if link:
+            try:
+                os.link(path, temp_path)
+            except OSError: # Another file system
+                link = False
+        if not link:
+            shutil.copy2(path, temp_path)
+        os.replace(temp_path, pool_path)
+    return sha1
+
+
+
+def add_mods(name: str, paths: list[str]) -> dict[str, str]:
+    """Adds mod jars to a mod set (created if needed, linked into 'mods' if the set is active). Returns the updated set."""
+    mods = load_mod_set(name) if name in list_mod_sets() else {}
+    active = get_active_mod_set() == name
+    for path in paths:
+        file_name = os.path.basename(path)
+        mods[file_name] = add_to_pool(path)
+        if active:
+            destination = os.path.join(get_mods_directory(), file_name)
+            if os.path.lexists(destination):
+                os.remove(destination)
+            link_file(get_pool_path(mods[file_name]), destination)
+    save_mod_set(name, mods)
+    return mods
+
+
+
+def remove_mods(name: str, file_names: list[str]) -> dict[str, str]:
+    """Removes mods from a mod set (and from the 'mods' directory if the set is active). Returns the updated set."""
+    mods = load_mod_set(name)
+    for file_name in file_names:
+        sha1 = mods.pop(file_name, None)
+        path = os.path.join(get_mods_directory(), file_name)
+        if sha1 and get_active_mod_set() == name and is_pool_file(path, sha1):
+            os.remove(path)
+    save_mod_set(name, mods)
+    return mods
+
+
+
+def capture_mod_set(name: str) -> dict[str, str]:
+    """
+    Saves the current 'mods' directory as a mod set. Files already linked from the pool are only hashed
+    again if they changed; new (or changed) files are added to the pool.
+    """
+    mods_directory = get_mods_directory()
+    previous = load_mod_set(name) if name in list_mod_sets() else {}
+    mods = {}
+    if os.path.isdir(mods_directory):
+        with os.scandir(mods_directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                sha1 = previous.get(entry.name)
+                if sha1 and is_pool_file(entry.path, sha1):
+                    if is_pool_object_intact(sha1):
+                        mods[entry.name] = sha1
+                        continue
+                    # Rewritten in place through the link: the pool object no longer has its content
+                    logger.warning(f"Mod {entry.name} was modified in place, the other mod sets that used it lose it", extra={"mod_set": name, "sha1": sha1})
+                    os.remove(get_pool_path(sha1))
+                mods[entry.name] = add_to_pool(entry.path, link=True)
+    save_mod_set(name, mods)
+    return mods
+
+
+
+def activate_mod_set(name: str) -> dict:
+    """
+    Assembles the 'mods' directory from a mod set. Only the files that differ are linked / removed.
+
+    The 'mods' directory is first captured into the active set (DEFAULT_MOD_SET the first time), so
+    files added or removed by hand are kept. Returns {"linked": n, "removed": n, "kept": n}.
+    """
+    mods_directory = get_mods_directory()
+    os.makedirs(mods_directory, exist_ok=True)
+    active = get_active_mod_set()
+    if active or os.listdir(mods_directory) or DEFAULT_MOD_SET in list_mod_sets():
+        capture_mod_set(active if active else DEFAULT_MOD_SET)
+    mods = load_mod_set(name)
+
+    result = {"linked": 0, "removed": 0, "kept": 0}
+    with os.scandir(mods_directory) as entries:
+        current = {entry.name: entry.path for entry in entries if entry.is_file() or entry.is_symlink()}
+    for file_name, path in current.items():
+        sha1 = mods.get(file_name)
+        if sha1 and is_pool_file(path, sha1):
+            result["kept"] += 1
+            continue
+        os.remove(path)
+        result["removed"] += 1
+
+    for file_name, sha1 in mods.items():
+        path = os.path.join(mods_directory, file_name)
+        if os.path.lexists(path):
+            continue
+        if not is_pool_object_intact(sha1):
+            logger.warning(f"Mod {file_name} ({sha1}) is missing from the pool")
+            continue
+        link_file(get_pool_path(sha1), path)
+        result["linked"] += 1
+
+    __set_active_mod_set(name)
+    logger.info("Mod set activated", extra={"mod_set": name, **result})
+    return result
+
+
+
+def deactivate_mod_set() -> dict:
+    """
+    Puts back the 'mods' directory as it was before the first mod set was activated (DEFAULT_MOD_SET),
+    with no active set. No-op if no mod set is active.
+    """
+    if not get_active_mod_set():
+        return {"linked": 0, "removed": 0, "kept": 0}
+    result = activate_mod_set(DEFAULT_MOD_SET)
+    __set_active_mod_set(None)
+    return result
+
+
+
+def get_profile_mod_set(profile_name: str) -> str:
+    return app_settings.get_setting(AppData.PROFILE_MOD_SETS).get(profile_name) if profile_name else None
+
+
+
+def set_profile_mod_set(profile_name: str, name: str = None):
+    """Assigns a mod set to a launcher profile (None to remove it)."""
+    mod_sets = dict(app_settings.get_setting(AppData.PROFILE_MOD_SETS))
+    if name:
+        get_mod_set_path(name) # Validates the name
+        mod_sets[profile_name] = name
+    else:
+        mod_sets.pop(profile_name, None)
+    app_settings.save_settings(AppData.PROFILE_MOD_SETS, mod_sets)
+
+
+
+def needs_mod_preparation(profile_name: str) -> bool:
+    """Checks if prepare_mods() has anything to do for a launcher profile."""
+    return bool(get_profile_mod_set(profile_name) or get_active_mod_set())
+
+
+
+def prepare_mods(profile_name: str):
+    """
+    Activates the mod set assigned to a launcher profile before it starts. Without one (or for a
+    launch that is not from a profile), the 'mods' directory is put back as it was before the mod sets.
+    """
+    name = get_profile_mod_set(profile_name)
+    if name and name in list_mod_sets():
+        activate_mod_set(name)
+    else:
+        deactivate_mod_set()
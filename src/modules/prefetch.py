@@ -0,0 +1,99 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Speculative prefetch of the selected version (no Flet).
+#
+# When a version is selected in the UI, its version JSON and asset index (and for mod loaders the
+# loader metadata) are fetched on one low priority thread, so pressing
+# Install goes straight to the bulk download. The asset index and the loader metadata land where the
+# install queue looks for them; the version JSON is staged in the app storage (nothing is written to
+# 'versions', where it would make the version look installed) and moved into place when the version
+# is installed (collect_version_artifacts). A new selection cancels the remaining steps of the
+# previous one; installing a version cancels the prefetch.
+
+from modules.app_config import *
+from modules.launcher_core import *
+from modules.install_queue import collect_version_artifacts, remove_prefetched_versions
+from modules.backups import set_low_io_priority
+from modules.version_ids import parse_version_id
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_DELAY = 0.5 # Seconds a selection must be kept before it is prefetched (scrolling through the list fetches nothing)
+
+
+class Prefetcher():
+    """Prefetches the metadata of the last selected version; every new selection cancels the previous one."""
+    def __init__(self, delay: float = PREFETCH_DELAY):
+        self.delay = delay
+        self._selection: str = None
+        self._generation = 0
+        self._condition = threading.Condition()
+        self._thread: threading.Thread = None
+
+    def select(self, version_id: str):
+        """Schedules the prefetch of a version (vanilla or mod loader id)."""
+        if not version_id:
+            return
+        with self._condition:
+            self._generation += 1
+            self._selection = version_id
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.__run, name="pyz-prefetch", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def cancel(self):
+        """Stops the pending prefetch (the current download finishes, the next steps are skipped)."""
+        with self._condition:
+            self._generation += 1
+            self._selection = None
+
+    def is_cancelled(self, generation: int) -> bool:
+        return generation != self._generation
+
+    def __run(self):
+        set_low_io_priority() # This thread only (a no-op where priorities are per process)
+        while True:
+            with self._condition:
+                while self._selection is None:
+                    self._condition.wait()
+                generation, version_id = self._generation, self._selection
+                self._selection = None
+                # Wait for the selection to settle
+                self._condition.wait(self.delay)
+                if self.is_cancelled(generation):
+                    continue
+            try:
+                self.prefetch(version_id, generation)
+            except Exception as e:
+                logger.warning(f"Prefetch failed: {e}", extra={"version": version_id})
+
+    def prefetch(self, version_id: str, generation: int = None):
+        """Fetches the metadata of a version, step by step, until the prefetch is cancelled."""
+        generation = generation if generation is not None else self._generation
+        version_id = resolve_version_id(version_id)
+        if is_version_installed(version_id):
+            remove_prefetched_versions() # Installed without the install queue (e.g. by the official launcher)
+            return
+        if not is_online():
+            return
+        parsed = parse_version_id(version_id)
+        base_version = parsed.minecraft_version if parsed else version_id
+
+        steps = [lambda: collect_version_artifacts(base_version, {}, prefetch=True)]
+        if parsed:
+            steps += [lambda: get_loader_versions(parsed.loader, base_version, stable_only=True),
+                      lambda: get_loader_minecraft_versions(parsed.loader, stable_only=False)] # Read by check_version() when installing
+        for step in steps:
+            if self.is_cancelled(generation):
+                logger.debug("Prefetch cancelled", extra={"version": version_id})
+                return
+            step()
+        logger.info("Prefetched", extra={"version": version_id})
+
+
+prefetcher = Prefetcher()
@@ -0,0 +1,182 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Opt-in profiling of the launcher hot paths (no Flet).
+#
+# Functions decorated with @profiled run unchanged unless profiling is enabled, with the 'profiling'
+# setting (Settings > Launcher) or the PYZ_PROFILE environment variable, a comma separated list of modes:
+#
+#   cprofile     cProfile of the calling thread          -> <name>-<time>.prof  (python -m pstats, snakeviz)
+#   tracemalloc  heap snapshot at the end of the call     -> <name>-<time>.heap  (tracemalloc.Snapshot.load)
+#                and its top allocations                  -> <name>-<time>.heap.txt
+#   sample       stack of every other thread each N ms    -> <name>-<time>.folded (flamegraph.pl, speedscope)
+#
+# PYZ_PROFILE=1 (or the setting) enables every mode. PYZ_PROFILE_INTERVAL sets the sampling interval
+# in milliseconds. Files are written to 'logs/profiles' in the app storage, one set per call.
+#
+# tracemalloc (and cProfile since Python 3.12) is process-wide, so one call is profiled at a time:
+# a profiled call made while another one runs, in any thread, runs unprofiled.
+
+from modules.app_config import *
+from modules.app_logging import LOGS_DIRECTORY
+from typing import Callable
+import collections
+import tracemalloc
+import functools
+import threading
+import cProfile
+import itertools
+import time
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIRECTORY = os.path.join(LOGS_DIRECTORY, "profiles") # In the app storage
+MODES = ("cprofile", "tracemalloc", "sample")
+DEFAULT_SAMPLE_INTERVAL = 10 # Milliseconds
+TRACEMALLOC_FRAMES = 25
+TOP_ALLOCATIONS = 50
+
+_active = threading.Lock() # Held by the call being profiled
+_counter = itertools.count(1)
+
+
+def get_profiling_modes() -> set[str]:
+    """Returns the enabled profiling modes (empty when profiling is disabled)."""
+    value = os.getenv("PYZ_PROFILE")
+    if value is None:
+        try:
+            value = "1" if (app_settings.settings or {}).get(AppData.PROFILING.value) else ""
+        except Exception:
+            value = ""
+    value = value.strip().lower()
+    if value in {"", "0", "false", "off"}:
+        return set()
+    if value in {"1", "true", "on", "all"}:
+        return set(MODES)
+    return {mode.strip() for mode in value.split(",") if mode.strip() in MODES}
+
+
+
+def get_sample_interval() -> float:
+    """Returns the sampling interval in seconds."""
+    try:
+        return max(1, int(os.getenv("PYZ_PROFILE_INTERVAL", DEFAULT_SAMPLE_INTERVAL))) / 1000
+    except ValueError:
+        return DEFAULT_SAMPLE_INTERVAL / 1000
+
+
+
+class StackSampler():
+    """Samples the stacks of the other threads on a background thread and aggregates them as folded stacks."""
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: collections.Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self.__run, name="pyz-stack-sampler", daemon=True)
+
+    def __run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)).replace(";", ":"))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+
+def __write_heap_snapshot(path: str, snapshot: tracemalloc.Snapshot):
+    snapshot.dump(path)
+    with open(f"{path}.txt", "w", encoding="utf-8") as f:
+        for statistic in snapshot.statistics("traceback")[:TOP_ALLOCATIONS]:
+            f.write(f"{statistic.size / 1024:.1f} KiB in {statistic.count} blocks\n")
+            for line in statistic.traceback.format():
+                f.write(f"{line}\n")
+            f.write("\n")
+
+
+
+def profile_call(name: str, function: Callable, *args, **kwargs):
+    """Runs 'function' with the enabled profiling modes and writes the results to PROFILES_DIRECTORY."""
+    modes = get_profiling_modes()
+    if not modes or not _active.acquire(blocking=False):
+        return function(*args, **kwargs)
+    try:
+        return __profile_call(name, modes, function, *args, **kwargs)
+    finally:
+        _active.release()
+
+
+
+def __profile_call(name: str, modes: set[str], function: Callable, *args, **kwargs):
+    directory = get_app_storage_path(PROFILES_DIRECTORY)
+    os.makedirs(directory, exist_ok=True)
+    base_path = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_counter)}")
+    profiler = cProfile.Profile() if "cprofile" in modes else None
+    sampler = StackSampler(get_sample_interval()) if "sample" in modes else None
+    started_tracemalloc = "tracemalloc" in modes and not tracemalloc.is_tracing()
+
+    start = time.perf_counter()
+    try:
+        if started_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        if sampler:
+            sampler.start()
+        if profiler:
+            try:
+                profiler.enable()
+            except ValueError as e: # Another profiler (a debugger, an IDE) is active
+                logger.warning(f"cProfile unavailable for {name}: {e}")
+                profiler = None
+        return function(*args, **kwargs)
+    finally:
+        if profiler:
+            profiler.disable()
+        if sampler:
+            sampler.stop()
+        try:
+            if profiler:
+                profiler.dump_stats(f"{base_path}.prof")
+            if sampler:
+                sampler.write(f"{base_path}.folded")
+            if "tracemalloc" in modes and tracemalloc.is_tracing():
+                __write_heap_snapshot(f"{base_path}.heap", tracemalloc.take_snapshot())
+            logger.info(f"Profiled {name} ({time.perf_counter() - start:.3f}s): {base_path}.*")
+        except Exception as e:
+            logger.error(f"Error writing the profile of {name}: {e}")
+        finally:
+            if started_tracemalloc:
+                tracemalloc.stop()
+
+
+
+def profiled(name: str = None):
+    """Decorator: profiles every call of the function when profiling is enabled (see profile_call)."""
+    def decorator(function: Callable):
+        profile_name = name if name else function.__qualname__
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return profile_call(profile_name, function, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -2,12 +2,18 @@
 # Copyright (c) 2026 Zadkiel Avendano and collaborators
 # License-Identifier: MIT License
 
+import flet as ft
 from typing import Callable
 from modules.app_config import *
+from modules.profiling import profiled
+import logging
+
+logger = logging.getLogger(__name__)
 
 # List of registered event functions that should be executed upon refresh
 refresh_list: list[Callable[[], None]] = []
 
+@profiled("refresh")
 def refresh(e: ft.Control = None):
     """
     Executes all registered refresh events and updates the UI.
@@ -23,8 +29,8 @@ def refresh(e: ft.Control = None):
             for event in refresh_list:
                 event()
             app_settings.page.update()
-            print("Refresh!")
+            logger.debug("Refresh!")
         except Exception as ex:
-            print(f"Error: {ex}")
+            logger.error(f"Error: {ex}")
     else:
-        print("No events recorded.")
\ No newline at end of file
+        logger.debug("No events recorded.")
\ No newline at end of file
@@ -0,0 +1,108 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Central dispatcher for the control updates made from worker threads (install queue, game, updater).
+#
+# Workers post attribute changes instead of mutating controls and calling page.update() themselves.
+# One loop applies them in posting order, merging several edits of the same control (the last value
+# wins), and sends a single page.update() per tick, so a burst of progress events costs one diff.
+# flush() is the only place the worker code paths call page.update().
+
+from modules.app_config import *
+from typing import Iterable
+import threading
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+TICK = 1 / 30 # Minimum seconds between two page updates
+
+
+class UiDispatcher():
+    """
+    Batches control mutations posted from any thread into one page.update() per tick.
+
+    post() may be called from any number of worker threads: it only records the change. Controls are
+    mutated and page.update() is called in flush() alone, under its lock, so two threads never send
+    an update at the same time (flush() runs on the dispatcher thread, or on a worker that needs its
+    changes sent before closing a dialog).
+    """
+    def __init__(self, page: "ft.Page" = None, tick: float = TICK):
+        self.page = page # Default: app_settings.page
+        self.tick = tick
+        self._pending: dict[int, tuple[object, dict]] = {}
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread = None
+        self._last_update = 0.0
+
+    def post(self, control, **attributes):
+        """Sets attributes of a control on the next tick (merged with the changes already posted for it)."""
+        if control is None:
+            return
+        with self._condition:
+            entry = self._pending.get(id(control))
+            if entry:
+                entry[1].update(attributes)
+            else:
+                self._pending[id(control)] = (control, dict(attributes))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.__run, name="pyz-ui-dispatcher", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def __run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            # Edits posted while waiting for the tick are merged into the same update
+            delay = self._last_update + self.tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.flush()
+
+    def flush(self):
+        """Applies the pending changes now, from the calling thread, with one page.update()."""
+        with self._flush_lock:
+            with self._condition:
+                pending = list(self._pending.values())
+                self._pending = {}
+            if not pending:
+                return
+            for control, attributes in pending:
+                for name, value in attributes.items():
+                    setattr(control, name, value)
+            self._last_update = time.monotonic()
+            page = self.page if self.page else app_settings.page
+            if page:
+                try:
+                    page.update()
+                except Exception as e:
+                    logger.error(f"UI update error: {e}")
+
+
+ui_dispatcher = UiDispatcher()
+
+
+def update_status(control, message: str):
+    """Posts a new text for a status control."""
+    ui_dispatcher.post(control, value=message)
+
+
+
+def set_controls_enabled(controls: Iterable, enabled: bool):
+    """Posts the enabled state of several controls."""
+    for control in controls:
+        ui_dispatcher.post(control, disabled=not enabled)
+
+
+
+def set_progress(progress_bar, ratio: float):
+    """Posts the value of a progress bar, mirrored in the window (taskbar) progress."""
+    page = ui_dispatcher.page if ui_dispatcher.page else app_settings.page
+    ui_dispatcher.post(progress_bar, value=ratio)
+    if page:
+        ui_dispatcher.post(page.window, progress_bar=ratio)
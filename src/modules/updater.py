@@ -5,6 +5,8 @@
 import flet as ft
 from modules.app_config import *
 from modules.utils import *
+from modules.http_client import http_client
+from modules.ui_dispatcher import ui_dispatcher, update_status, set_controls_enabled, set_progress
 import requests
 import os
 import time
@@ -12,86 +14,216 @@ import sys
 import subprocess
 import logging
 import shutil
+import hashlib
+import zipfile
+import json
 
-# ----- UI Helper Functions -----
+logger = logging.getLogger(__name__)
 
-def __update_status_safe(page: ft.Page, control, message):
-    """Update a Flet control safely from a thread."""
-    if page and control:
-        control.value = message
-        try:
-            page.update()
-        except Exception:
-            pass
-
-def __set_controls_enabled_safe(page: ft.Page, controls, enabled):
-    """Safely enable or disable Flet controls."""
-    if page:
-        for control in controls:
-            control.disabled = not enabled
-        try:
-            page.update()
-        except Exception:
-            pass
-
-def __update_progress_safe(page: ft.Page, progress_bar: ft.ProgressBar, progress_text: ft.Text, downloaded: int, total: int):
-    """Update progress bar safely."""
-    if page and progress_bar and total > 0:
-        ratio = downloaded / total
-        page.window.progress_bar = ratio
-        progress_bar.value = ratio
-        if progress_text:
-            pct = ratio * 100
-            downloaded_mb = downloaded / (1024 * 1024)
-            total_mb = total / (1024 * 1024)
-            progress_text.value = f"{pct:.1f}% ({downloaded_mb:.2f} MB / {total_mb:.2f} MB)"
-        try:
-            page.update()
-        except Exception:
-            pass
+MANIFEST_FILE = "update_manifest.json"
 
 # ----- Updater Logic -----
 
 def check_link_exists(url) -> bool:
     try:
-        response = requests.head(url, allow_redirects=True)
+        response = http_client.head(url, allow_redirects=True)
         if response.status_code == 200:
-            print("The link exists!")
+            logger.info("The link exists!")
             return True
         else:
-            print("The link is not available. Status code:", response.status_code)
+            logger.warning(f"The link is not available. Status code: {response.status_code}")
             return False
     except requests.RequestException as e:
-        print("Error while checking the link:", e)
+        logger.error(f"Error while checking the link: {e}")
         return False
 
 
-def has_update() -> tuple[bool, str, str]:
+RELEASE_CACHE_FILE = "release_cache.json"
+
+def __load_release_cache() -> dict:
+    """Loads the cached release metadata (ETag, last check time and latest release data)."""
+    try:
+        with open(get_app_storage_path(RELEASE_CACHE_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def __save_release_cache(cache: dict):
+    try:
+        with open(get_app_storage_path(RELEASE_CACHE_FILE), "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except Exception as e:
+        logger.error(f"Error saving release cache: {e}")
+
+
+def get_latest_release(force: bool = False) -> dict:
+    """
+    Returns the metadata of the latest release.
+
+    The response is cached with its ETag: within UPDATE_CHECK_INTERVAL the cache is used without any request,
+    afterwards (or when forced) it is revalidated with 'If-None-Match' (a 304 does not count against the rate limit).
+    When the API is rate limited, the cache is used until the limit resets.
+    """
+    cache = __load_release_cache()
+    now = time.time()
+    if cache.get("data") and not force and now < cache.get("next_check", 0):
+        return cache["data"]
+    if cache.get("data") and now < cache.get("rate_limited_until", 0):
+        return cache["data"]
+
+    headers = {"Accept": "application/vnd.github+json"}
+    if cache.get("etag") and cache.get("data"):
+        headers["If-None-Match"] = cache["etag"]
+
+    response = http_client.get(f"{LAUNCHER_REPOSITORY_API}/releases/latest", headers=headers)
+    if response.status_code == 304:
+        logger.info("Release metadata not modified.")
+    elif response.status_code == 200:
+        cache["data"] = response.json()
+        cache["etag"] = response.headers.get("ETag", "")
+    elif response.status_code in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0":
+        cache["rate_limited_until"] = float(response.headers.get("X-RateLimit-Reset", now + UPDATE_CHECK_INTERVAL))
+        __save_release_cache(cache)
+        logger.warning(f"GitHub API rate limit reached until {cache['rate_limited_until']}")
+        if cache.get("data"):
+            return cache["data"]
+        raise Exception("GitHub API rate limit reached")
+    else:
+        raise Exception(f"Failed to fetch update info: {response.status_code}")
+
+    cache["next_check"] = now + UPDATE_CHECK_INTERVAL
+    cache.pop("rate_limited_until", None)
+    __save_release_cache(cache)
+    return cache["data"]
+
+
+def has_update(force: bool = False) -> tuple[bool, str, str]:
     try:
         if dev_mode:
             return False, app_version
-        response = requests.get(f"{LAUNCHER_REPOSITORY_API}/releases/latest")
-        if response.status_code == 200:
-            data: dict = response.json()
-            latest_version = data.get("tag_name", app_version)
-            print(f"Latest version: {latest_version}, Current version: {app_version}")
-            return latest_version != app_version, app_version if latest_version == app_version else latest_version
-        else:
-            print(f"Failed to fetch update info: {response.status_code}")
-            return False, app_version, "Error checking API"
+        data = get_latest_release(force=force)
+        latest_version = data.get("tag_name", app_version)
+        logger.info(f"Latest version: {latest_version}, Current version: {app_version}")
+        return latest_version != app_version, app_version if latest_version == app_version else latest_version
     except Exception as e:
-        print(f"Error checking for updates: {e}")
+        logger.error(f"Error checking for updates: {e}")
         return False, app_version, str(e)
 
 
+# ----- Delta Updates -----
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Returns the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_stored_manifest(base_dir: str) -> dict:
+    """Returns the release manifest stored by the last update, or None if there is none (or it is invalid)."""
+    manifest_path = os.path.join(base_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Invalid local manifest, rebuilding: {e}")
+    return None
+
+
+def build_local_manifest(base_dir: str) -> dict:
+    """
+    Returns the manifest of the installed launcher.
+
+    Uses the manifest stored by the last update if present, otherwise hashes the install directory.
+    """
+    stored = load_stored_manifest(base_dir)
+    if stored is not None:
+        return stored
+
+    files = {}
+    for root, dirs, names in os.walk(base_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, base_dir).replace(os.sep, "/")
+            if rel_path == MANIFEST_FILE:
+                continue
+            files[rel_path] = {"sha256": file_sha256(path), "size": os.path.getsize(path)}
+    return {"version": app_version, "files": files}
+
+
+def fetch_release_manifest(latest_version: str) -> dict:
+    """Downloads the per-file hash manifest of a release. Returns None if the release has no manifest."""
+    manifest_url = f"{LAUNCHER_REPOSITORY}/releases/download/{latest_version}/pyz_launcher_{latest_version}_{app_settings.page.platform.name.lower()}_manifest.json"
+    try:
+        response = http_client.get(manifest_url, cache=True)
+        if response.status_code == 200:
+            return response.json()
+        logger.warning(f"Release manifest not available: {response.status_code}")
+    except Exception as e:
+        logger.error(f"Error fetching release manifest: {e}")
+    return None
+
+
+def diff_manifests(local: dict, remote: dict, released: dict = None) -> tuple[list, list]:
+    """
+    Compares two manifests.
+
+    Returns (changed, removed): files to download/overwrite and files that no longer exist in the release.
+    Only files of a previous release ('released', the stored manifest) are removed: without one nothing
+    is, so files the launcher or the user added to the install directory are kept.
+    """
+    local_files = local.get("files", {})
+    remote_files = remote.get("files", {})
+    changed = [path for path, info in remote_files.items() if local_files.get(path, {}).get("sha256") != info.get("sha256")]
+    removed = [path for path in released.get("files", {}) if path not in remote_files] if released else []
+    return changed, removed
+
+
+
+def zip_contains(zip_path: str, rel_paths: list) -> bool:
+    """Returns whether a zip holds every one of the given relative paths."""
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            names = {name.replace("\\", "/") for name in zip_ref.namelist()}
+    except zipfile.BadZipFile:
+        return False
+    return all(path in names for path in rel_paths)
+
+
+def __update_progress(progress_bar: ft.ProgressBar, progress_text: ft.Text, downloaded: int, total: int):
+    """Posts the download progress."""
+    if progress_bar and total > 0:
+        ratio = downloaded / total
+        set_progress(progress_bar, ratio)
+        update_status(progress_text, f"{ratio * 100:.1f}% ({downloaded / (1024 * 1024):.2f} MB / {total / (1024 * 1024):.2f} MB)")
+
+
+def __download_file(url: str, file_path: str, page: ft.Page, progress_bar: ft.ProgressBar, progress_text: ft.Text):
+    """Downloads a file in chunks while updating the progress bar."""
+    ui_dispatcher.post(page.window, progress_bar=0)
+    response = http_client.get(url, stream=True)
+    response.raise_for_status()
+    total_size = int(response.headers.get('content-length', 0))
+    downloaded_size = 0
+
+    with open(file_path, 'wb') as file:
+        for data in response.iter_content(chunk_size=64 * 1024):
+            file.write(data)
+            downloaded_size += len(data)
+            __update_progress(progress_bar, progress_text, downloaded_size, total_size)
+
+
 def download_launcher_update(latest_version: str, page: ft.Page, status_text: ft.Text, progress_bar: ft.ProgressBar, progress_text: ft.Text,
                     buttons_to_disable: list, dialog: ft.AlertDialog):
     """
     Downloads the update interacting with the Flet UI similar to launcher.py
     """
     try:
-        __set_controls_enabled_safe(page, buttons_to_disable, False)
-        __update_status_safe(page, status_text, "Initializing download...")
+        set_controls_enabled(buttons_to_disable, False)
+        update_status(status_text, "Initializing download...")
         
         download_url = f"{LAUNCHER_REPOSITORY}/releases/download/{latest_version}/pyz_launcher_{latest_version}_{app_settings.page.platform.name.lower()}_portable.zip"
         # download_url = f"{LAUNCHER_REPOSITORY}/releases/download/v0.4.0-alpha/pyz_launcher_v0.4.0_portable.zip" # test link
@@ -99,43 +231,59 @@ def download_launcher_update(latest_version: str, page: ft.Page, status_text: ft
         if not check_link_exists(download_url):
             raise Exception("Update download link not found.")
 
-        __update_status_safe(page, status_text, "Downloading update...")
-        page.window.progress_bar = 0
-        response = requests.get(download_url, stream=True)
-        response.raise_for_status()
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded_size = 0
-
         # Ensure temporary directory exists
         if not os.path.exists(FLET_APP_STORAGE_TEMP):
             raise Exception("Temporary storage path not found.")
 
         temp_file_path = os.path.join(FLET_APP_STORAGE_TEMP, "update.zip")
+        plan_path = None
+
+        # Compare the release manifest with the installed files
+        update_status(status_text, "Checking changed files...")
+        remote_manifest = fetch_release_manifest(latest_version)
+        delta_url = None
+        if remote_manifest:
+            stored_manifest = load_stored_manifest(get_app_path())
+            local_manifest = stored_manifest if stored_manifest is not None else build_local_manifest(get_app_path())
+            changed, removed = diff_manifests(local_manifest, remote_manifest, stored_manifest)
+            logger.info(f"Delta update: {len(changed)} changed files, {len(removed)} removed files")
+            plan_path = os.path.join(FLET_APP_STORAGE_TEMP, "update_plan.json")
+            with open(plan_path, "w", encoding="utf-8") as f:
+                json.dump({"version": latest_version, "changed": changed, "removed": removed, "manifest": remote_manifest}, f)
+
+            # Patch bundle with only the files changed since the installed version
+            delta_url = f"{LAUNCHER_REPOSITORY}/releases/download/{latest_version}/pyz_launcher_{latest_version}_{app_settings.page.platform.name.lower()}_delta_{app_version}.zip"
+            if not check_link_exists(delta_url):
+                delta_url = None
 
-        with open(temp_file_path, 'wb') as file:
-            for data in response.iter_content(chunk_size=4096):
-                file.write(data)
-                downloaded_size += len(data)
-                __update_progress_safe(page, progress_bar, progress_text, downloaded_size, total_size)
+        update_status(status_text, "Downloading update...")
+        __download_file(delta_url or download_url, temp_file_path, page, progress_bar, progress_text)
+        if delta_url and not zip_contains(temp_file_path, changed):
+            # The installed files differ from the release the delta was made against (modified, or
+            # no stored manifest): the full package has every file of the plan
+            logger.warning("The delta package misses changed files, downloading the full package")
+            update_status(status_text, "Downloading the full update...")
+            __download_file(download_url, temp_file_path, page, progress_bar, progress_text)
 
-        __update_status_safe(page, status_text, "Download completed successfully!")
+        update_status(status_text, "Download completed successfully!")
         time.sleep(1)
-        install_update_and_restart(temp_file_path, page, status_text)
+        install_update_and_restart(temp_file_path, page, status_text, plan_path)
 
     except Exception as e:
         error_msg = f"Error downloading update: {str(e)}"
-        print(error_msg)
-        __update_status_safe(page, status_text, error_msg)
+        logger.error(error_msg)
+        update_status(status_text, error_msg)
         
     finally:
         time.sleep(2)
-        page.window.progress_bar = 0
+        ui_dispatcher.post(page.window, progress_bar=0)
+        set_controls_enabled(buttons_to_disable, True)
+        ui_dispatcher.flush()
         if dialog:
             page.close(dialog)
-        __set_controls_enabled_safe(page, buttons_to_disable, True)
 
 
-def install_update_and_restart(zip_path: str, page: ft.Page, status_text: ft.Text):
+def install_update_and_restart(zip_path: str, page: ft.Page, status_text: ft.Text, plan_path: str = None):
     """
     Calls the external updater.exe and closes the current app.
     """
@@ -143,31 +291,37 @@ def install_update_and_restart(zip_path: str, page: ft.Page, status_text: ft.Tex
         if dev_mode:
             raise Exception("It is not possible to apply an update to a development version.")
         
-        logging.info(f"Copying 'updater.exe' to temporary storage: {os.path.abspath("assets/updater/updater.exe")}")
+        logger.info(f"Copying 'updater.exe' to temporary storage: {os.path.abspath('assets/updater/updater.exe')}")
         shutil.copy(os.path.abspath("assets/updater/updater.exe"), FLET_APP_STORAGE_TEMP)
         
         executable_path = os.path.join(get_app_path(), "pyz_launcher.exe")
         updater_exe = os.path.join(FLET_APP_STORAGE_TEMP, "updater.exe")
 
-        logging.info(f"Executable path: {executable_path!r}")
-        logging.info(f"Updater path: {updater_exe!r}")
-        logging.info(f"Zip path: {zip_path!r}")
+        logger.info(f"Executable path: {executable_path!r}")
+        logger.info(f"Updater path: {updater_exe!r}")
+        logger.info(f"Zip path: {zip_path!r}")
 
         if not os.path.exists(updater_exe):
-            logging.error("Error: updater.exe not found.")
+            logger.error("Error: updater.exe not found.")
             return
 
-        logging.info(f"Launching {updater_exe}...")
-        __update_status_safe(page, status_text, f"Launching {updater_exe}...")
+        logger.info(f"Launching {updater_exe}...")
+        update_status(status_text, f"Launching {updater_exe}...")
 
-        # ARGUMENTS: [Updater Path, Zip Path, Main App Path]
-        subprocess.Popen([updater_exe, zip_path, executable_path])
+        # ARGUMENTS: [Updater Path, Zip Path, Main App Path, --pid Launcher PID, (Optional) Delta Plan Path]
+        arguments = [updater_exe, zip_path, executable_path, "--pid", str(os.getpid())]
+        if plan_path:
+            logger.info(f"Delta plan path: {plan_path!r}")
+            arguments.append(plan_path)
+        # Not started in the install directory: Windows cannot rename a directory that is a process's cwd
+        subprocess.Popen(arguments, cwd=FLET_APP_STORAGE_TEMP)
 
         # Close this app immediately so the updater can overwrite files
+        ui_dispatcher.flush()
         page.window.close()
         sys.exit(0)
 
     except Exception as e:
         error_msg = f"Failed to launch updater: {e}"
-        __update_status_safe(page, status_text, error_msg)
-        logging.error(error_msg)
\ No newline at end of file
+        update_status(status_text, error_msg)
+        logger.error(error_msg)
\ No newline at end of file
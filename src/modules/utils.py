@@ -6,8 +6,11 @@ import subprocess
 import platform
 import psutil
 import sys
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 def system_ram():
     '''
     Returns system RAM information.
@@ -24,7 +27,7 @@ def get_app_path():
     try:
         return os.path.dirname(sys.executable)
     except Exception as e:
-        print(f"Error getting app path: {e}")
+        logger.error(f"Error getting app path: {e}")
         return None
 
 def open_file(file):
@@ -34,7 +37,7 @@ def open_file(file):
     try:
         file = os.path.abspath(file)
         if not os.path.exists(file):
-            print(f"The file does not exist: {file}")
+            logger.warning(f"The file does not exist: {file}")
             return
         system = platform.system()
         if system == 'Windows':
@@ -44,6 +47,6 @@ def open_file(file):
         elif system == 'Linux':
             subprocess.run(['xdg-open', file])
         else:
-            print(f'Unsupported system:: {system}')
+            logger.warning(f'Unsupported system:: {system}')
     except Exception as e:
-        print(f"An error occurred while trying to open the file: {file}.\nError: {e}")
\ No newline at end of file
+        logger.error(f"An error occurred while trying to open the file: {file}.\nError: {e}")
\ No newline at end of file
@@ -0,0 +1,51 @@
+# This file is part of PYZ-LAUNCHER-FOR-MINECRAFT (https://github.com/ZadkielAvendano/PyZ-Launcher-for-Minecraft)
+# Copyright (c) 2026 Zadkiel Avendano and collaborators
+# License-Identifier: MIT License
+
+# Mod loader version ids (no Flet, no network).
+#
+# The ids are the ones minecraft-launcher-lib gives the installed loader versions:
+#   fabric-loader-<loader version>-<minecraft version>     fabric-loader-0.16.5-1.21.1
+#   quilt-loader-<loader version>-<minecraft version>      quilt-loader-0.26.4-beta.5-1.21
+#   <minecraft version>-forge-<loader version>             1.20.1-forge-47.3.0
+#   neoforge-<loader version>                              neoforge-21.1.77 (Minecraft 1.21.1)
+
+from typing import NamedTuple, Optional
+import functools
+import re
+
+# Loader versions may have a pre-release suffix ("0.26.4-beta.5"), Minecraft versions too ("1.21-rc1")
+FABRIC_QUILT_PATTERN = re.compile(r"(?P<loader>fabric|quilt)-loader-(?P<loader_version>[^-]+(?:-(?:alpha|beta|pre|rc)[^-]*)?)-(?P<minecraft_version>.+)")
+FORGE_PATTERN = re.compile(r"(?P<minecraft_version>.+?)-(?P<loader>forge)-(?P<loader_version>.+)")
+NEOFORGE_PATTERN = re.compile(r"(?P<loader>neoforge)-(?P<loader_version>(?P<major>\d+)\.(?P<minor>\d+)\..+)")
+
+
+class LoaderVersionId(NamedTuple):
+    """A parsed mod loader version id."""
+    loader: str
+    loader_version: str
+    minecraft_version: str
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_version_id(version_id: str) -> Optional[LoaderVersionId]:
+    """Parses a mod loader version id. Returns None for vanilla or unknown ids."""
+    match = FABRIC_QUILT_PATTERN.fullmatch(version_id) or FORGE_PATTERN.fullmatch(version_id)
+    if match:
+        return LoaderVersionId(match["loader"], match["loader_version"], match["minecraft_version"])
+    match = NEOFORGE_PATTERN.fullmatch(version_id)
+    if match:
+        # NeoForge 21.1.x is for Minecraft 1.21.1, 21.0.x for 1.21
+        minecraft_version = f"1.{match['major']}" if match["minor"] == "0" else f"1.{match['major']}.{match['minor']}"
+        return LoaderVersionId(match["loader"], match["loader_version"], minecraft_version)
+    return None
+
+
+
+def build_version_id(loader: str, loader_version: str, minecraft_version: str) -> str:
+    """Returns the id of a mod loader version (the inverse of parse_version_id)."""
+    if loader == "forge":
+        return f"{minecraft_version}-forge-{loader_version}"
+    if loader == "neoforge":
+        return f"neoforge-{loader_version}"
+    return f"{loader}-loader-{loader_version}-{minecraft_version}"
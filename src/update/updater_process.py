@@ -3,18 +3,37 @@
 # License-Identifier: MIT License
 
 # This file is executed as a separate process to handle the update installation.
-# It waits for the main application to close, then replaces the necessary files,
-# and finally restarts the main application.
+# It builds the new version in a sibling staging directory, waits for the main
+# application to close, then switches the directories with two renames (keeping the
+# previous version for rollback).
 
 # Compiled with PyInstaller.
 
 import sys
 import os
 import time
+import json
 import zipfile
-import shutil
+import hashlib
+import tempfile
+import threading
 import subprocess
 import platform
+import shutil
+import psutil
+from concurrent.futures import ThreadPoolExecutor
+
+MANIFEST_FILE = "update_manifest.json"
+CHUNK_SIZE = 1024 * 1024
+# Archives above these limits are extracted with a thread pool
+PARALLEL_MIN_FILES = 64
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+MAX_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+# Sibling directories used for the staged swap: <install>.staging / <install>.previous
+STAGING_SUFFIX = ".staging"
+PREVIOUS_SUFFIX = ".previous"
+PARENT_EXIT_TIMEOUT = 60
+UPDATER_PATH = os.path.abspath(sys.argv[0]) # Resolved before leave_install_directory() changes the cwd
 
 def show_message(title, message, is_error=False):
     """
@@ -58,75 +77,357 @@ def show_message(title, message, is_error=False):
 
 
 
+def file_sha256(path, chunk_size=1024 * 1024):
+    """
+    Returns the SHA-256 hex digest of a file.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(directory, version=""):
+    """
+    Hashes every file under 'directory' and returns a release manifest:
+    {"version": ..., "files": {relative_path: {"sha256": ..., "size": ...}}}
+    """
+    files = {}
+    for root, dirs, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, directory).replace(os.sep, "/")
+            if rel_path == MANIFEST_FILE:
+                continue
+            files[rel_path] = {"sha256": file_sha256(path), "size": os.path.getsize(path)}
+    return {"version": version, "files": files}
+
+
+def extract_member(zip_ref, member, dest_file, expected_sha256=None):
+    """
+    Streams a zip member straight to its destination.
+
+    The data is written to a temporary file in the target directory and renamed into place,
+    so the destination never holds a partially written file and no extra copy pass is needed.
+    """
+    dest_dir = os.path.dirname(dest_file)
+    os.makedirs(dest_dir, exist_ok=True)
+    fd, temp_file = tempfile.mkstemp(prefix=".pyz_update_", suffix=".tmp", dir=dest_dir)
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as dst, zip_ref.open(member) as src:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+        if expected_sha256 and digest.hexdigest() != expected_sha256:
+            raise Exception(f"Hash mismatch after extracting {member.filename}")
+        os.replace(temp_file, dest_file)
+        mtime = time.mktime(member.date_time + (0, 0, -1))
+        os.utime(dest_file, (mtime, mtime))
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def extract_members(zip_path, jobs):
+    """
+    Extracts a list of (zip member, destination, expected sha256) jobs.
+
+    Large archives are spread across a thread pool (zlib releases the GIL), each worker
+    reading through its own ZipFile handle.
+    """
+    total_bytes = sum(member.file_size for member, _, _ in jobs)
+    if len(jobs) < PARALLEL_MIN_FILES and total_bytes < PARALLEL_MIN_BYTES:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for member, dest_file, expected in jobs:
+                extract_member(zip_ref, member, dest_file, expected)
+        return
+
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+
+    def worker(job):
+        if not hasattr(local, "zip_ref"):
+            local.zip_ref = zipfile.ZipFile(zip_path, 'r')
+            with handles_lock:
+                handles.append(local.zip_ref)
+        member, dest_file, expected = job
+        extract_member(local.zip_ref, member, dest_file, expected)
+
+    # Biggest files first so the pool does not finish on one long tail
+    jobs = sorted(jobs, key=lambda job: job[0].file_size, reverse=True)
+    print(f"Extracting {len(jobs)} files ({total_bytes / (1024 * 1024):.1f} MB) with {MAX_WORKERS} workers...")
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for _ in executor.map(worker, jobs):
+                pass
+    finally:
+        for zip_ref in handles:
+            zip_ref.close()
+
+
+def resolve_inside(base_dir, rel_path):
+    """
+    Returns the destination of a relative path (zip member or manifest entry) under 'base_dir'.
+    Raises an exception for absolute paths or paths escaping 'base_dir' ('..').
+    """
+    base = os.path.realpath(base_dir)
+    dest_file = os.path.realpath(os.path.join(base, *rel_path.split("/")))
+    if os.path.isabs(rel_path) or os.path.splitdrive(rel_path)[0] or os.path.commonpath([base, dest_file]) != base or dest_file == base:
+        raise Exception(f"Unsafe path in update package: {rel_path}")
+    return dest_file
+
+
+def plan_jobs(zip_path, base_dir, rel_paths=None, manifest=None):
+    """
+    Returns the extraction jobs for the given relative paths (all files if None),
+    skipping the running updater itself.
+    """
+    manifest_files = manifest.get("files", {}) if manifest else {}
+    jobs = []
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        members = {info.filename.replace("\\", "/"): info for info in zip_ref.infolist() if not info.is_dir()}
+    for rel_path in (rel_paths if rel_paths is not None else list(members)):
+        if rel_path not in members:
+            raise Exception(f"Missing file in update package: {rel_path}")
+        dest_file = resolve_inside(base_dir, rel_path)
+
+        # CRITICAL: Do not try to overwrite the updater itself if it's running
+        if os.path.abspath(dest_file) == UPDATER_PATH:
+            continue
+
+        jobs.append((members[rel_path], dest_file, manifest_files.get(rel_path, {}).get("sha256")))
+    return jobs
+
+
+def apply_plan(zip_path, base_dir, plan):
+    """
+    Applies a delta update plan: extracts only the changed files from the zip,
+    deletes the files removed in the new release and stores the new manifest.
+    """
+    extract_members(zip_path, plan_jobs(zip_path, base_dir, plan.get("changed", []), plan.get("manifest")))
+
+    for rel_path in plan.get("removed", []):
+        try:
+            dest_file = resolve_inside(base_dir, rel_path)
+            if os.path.isfile(dest_file):
+                os.remove(dest_file)
+        except Exception as e:
+            print(f"Warning removing {rel_path}: {e}")
+
+    store_manifest(base_dir, plan.get("manifest"))
+
+
+
+def store_manifest(base_dir, manifest):
+    """
+    Stores the manifest of the release installed in 'base_dir'. Without one, the manifest of the
+    previous release is deleted (the next update then hashes the install directory instead).
+    """
+    manifest_path = os.path.join(base_dir, MANIFEST_FILE)
+    if manifest:
+        # Written through a new file: the staged manifest may be a hardlink to the installed one
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(manifest_path + ".tmp", manifest_path)
+    elif os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+
+
+def wait_for_parent_exit(parent_pid, main_exe_path, timeout=PARENT_EXIT_TIMEOUT):
+    """
+    Waits for the launcher process to exit.
+
+    Uses the PID passed by the launcher; older launchers don't pass it, so in that case
+    every process running the main executable is waited for.
+    """
+    processes = []
+    if parent_pid:
+        try:
+            processes.append(psutil.Process(parent_pid))
+        except psutil.NoSuchProcess:
+            pass
+    else:
+        target = os.path.normcase(os.path.abspath(main_exe_path))
+        for process in psutil.process_iter(["exe"]):
+            exe = process.info.get("exe")
+            if exe and os.path.normcase(os.path.abspath(exe)) == target and process.pid != os.getpid():
+                processes.append(process)
+
+    if processes:
+        gone, alive = psutil.wait_procs(processes, timeout=timeout)
+        if alive:
+            raise Exception(f"The launcher is still running (PID: {', '.join(str(p.pid) for p in alive)}).")
+
+
+def link_tree(src_dir, dest_dir):
+    """
+    Mirrors 'src_dir' into 'dest_dir' using hardlinks (falls back to copies across devices).
+
+    Updated files are later renamed over the links, so the original install is never modified.
+    """
+    for root, dirs, files in os.walk(src_dir):
+        target_root = os.path.join(dest_dir, os.path.relpath(root, src_dir))
+        os.makedirs(target_root, exist_ok=True)
+        for name in files:
+            src_file = os.path.join(root, name)
+            dest_file = os.path.join(target_root, name)
+            try:
+                os.link(src_file, dest_file)
+            except OSError:
+                shutil.copy2(src_file, dest_file)
+
+
+def rename_with_retry(src, dest, retries=10, delay=0.2):
+    """Renames a directory, retrying briefly while an antivirus or indexer holds a handle."""
+    for i in range(retries):
+        try:
+            os.rename(src, dest)
+            return
+        except OSError:
+            if i == retries - 1:
+                raise
+            time.sleep(delay)
+
+
+def leave_install_directory():
+    """
+    Moves the working directory out of the install directory: the launcher starts the updater from it,
+    and Windows cannot rename a directory that is a process's cwd.
+    """
+    os.chdir(tempfile.gettempdir())
+
+
+def swap_directories(base_dir, staging_dir, previous_dir):
+    """
+    Switches the staged version in: install -> previous, staging -> install.
+    If the second rename fails the previous version is restored.
+    """
+    if os.path.exists(previous_dir):
+        shutil.rmtree(previous_dir)
+    rename_with_retry(base_dir, previous_dir)
+    try:
+        rename_with_retry(staging_dir, base_dir)
+    except Exception:
+        rename_with_retry(previous_dir, base_dir)
+        raise
+
+
+def rollback(main_exe_path):
+    """
+    Restores the version kept in '<install>.previous' by the last update.
+    """
+    base_dir = os.path.dirname(os.path.abspath(main_exe_path))
+    previous_dir = base_dir + PREVIOUS_SUFFIX
+    failed_dir = base_dir + STAGING_SUFFIX
+    if not os.path.isdir(previous_dir):
+        raise Exception("There is no previous version to restore.")
+    if os.path.exists(failed_dir):
+        shutil.rmtree(failed_dir)
+    rename_with_retry(base_dir, failed_dir)
+    try:
+        rename_with_retry(previous_dir, base_dir)
+    except Exception:
+        rename_with_retry(failed_dir, base_dir)
+        raise
+    shutil.rmtree(failed_dir, ignore_errors=True)
+
+
+
 def main():
     # Arguments passed from the main app:
     # 1: Path to the downloaded ZIP file
     # 2: Path to the main executable (launcher.exe)
-    
-    if len(sys.argv) < 3:
-        print("Usage: updater.exe <zip_path> <main_exe_path>")
+    # 3: (Optional) Path to the delta update plan (JSON)
+    # --pid <pid>: PID of the launcher to wait for
+    #
+    # Release tooling: updater.exe --build-manifest <build_dir> <output.json> [version]
+    # Rollback: updater.exe --rollback <main_exe_path>
+
+    if len(sys.argv) >= 4 and sys.argv[1] == "--build-manifest":
+        manifest = build_manifest(sys.argv[2], sys.argv[4] if len(sys.argv) > 4 else "")
+        with open(sys.argv[3], "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Manifest written: {sys.argv[3]} ({len(manifest['files'])} files)")
+        sys.exit(0)
+
+    if len(sys.argv) >= 3 and sys.argv[1] == "--rollback":
+        try:
+            main_exe_path = os.path.abspath(sys.argv[2])
+            leave_install_directory()
+            wait_for_parent_exit(None, main_exe_path)
+            rollback(main_exe_path)
+            show_message("Rollback Completed", "The previous version has been restored.", is_error=False)
+            sys.exit(0)
+        except Exception as e:
+            show_message("Rollback Error", f"An error occurred while restoring the previous version:\n{e}", is_error=True)
+            sys.exit(1)
+
+    args = sys.argv[1:]
+    parent_pid = None
+    if "--pid" in args:
+        index = args.index("--pid")
+        parent_pid = int(args[index + 1])
+        del args[index:index + 2]
+
+    if len(args) < 2:
+        print("Usage: updater.exe <zip_path> <main_exe_path> [plan_path] [--pid <pid>]")
         time.sleep(2)
         sys.exit(1)
 
-    zip_path = sys.argv[1]
-    main_exe_path = sys.argv[2]
-    base_dir = os.path.dirname(main_exe_path)
-    temp_extract_folder = os.path.join(base_dir, "temp_update_extract")
+    zip_path = os.path.abspath(args[0])
+    main_exe_path = os.path.abspath(args[1])
+    plan_path = os.path.abspath(args[2]) if len(args) > 2 else None
+    leave_install_directory()
+    base_dir = os.path.dirname(os.path.abspath(main_exe_path))
+    staging_dir = base_dir + STAGING_SUFFIX
+    previous_dir = base_dir + PREVIOUS_SUFFIX
 
     print(f"Target: {main_exe_path}")
-    print("Waiting for main application to close...")
-    
-    # --- WAIT FOR FILE LOCK RELEASE ---
-    max_retries = 10
-    for i in range(max_retries):
-        try:
-            test_rename = main_exe_path + ".check"
-            if os.path.exists(main_exe_path):
-                os.rename(main_exe_path, test_rename)
-                os.rename(test_rename, main_exe_path)
-            break
-        except OSError:
-            print(f"Waiting for file release... ({i+1}/{max_retries})")
-            time.sleep(1)
-    
+
     try:
-        # Extract ZIP
-        print(f"Extracting update to {temp_extract_folder}...")
-        if os.path.exists(temp_extract_folder):
-            shutil.rmtree(temp_extract_folder)
-        
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_extract_folder)
-            
-        # Overwrite files in the main directory
-        print("Overwriting files...")
-        for root, dirs, files in os.walk(temp_extract_folder):
-            rel_path = os.path.relpath(root, temp_extract_folder)
-            dest_folder = os.path.join(base_dir, rel_path)
-            
-            if not os.path.exists(dest_folder):
-                os.makedirs(dest_folder)
-                
-            for file in files:
-                src_file = os.path.join(root, file)
-                dest_file = os.path.join(dest_folder, file)
-                
-                # CRITICAL: Do not try to overwrite the updater itself if it's running
-                if os.path.abspath(dest_file) == os.path.abspath(sys.argv[0]):
-                    continue
-
-                if os.path.exists(dest_file):
-                    try:
-                        os.remove(dest_file)
-                    except Exception as e:
-                        print(f"Warning removing {dest_file}: {e}")
+        # Delta update: only the files that changed since the installed version
+        plan = None
+        if plan_path and os.path.exists(plan_path):
+            with open(plan_path, "r", encoding="utf-8") as f:
+                plan = json.load(f)
 
-                shutil.copy2(src_file, dest_file)
+        # --- BUILD THE NEW VERSION NEXT TO THE CURRENT ONE ---
+        # The launcher can still be running: the install directory is only read here.
+        print(f"Staging update in {staging_dir}...")
+        if os.path.exists(staging_dir):
+            shutil.rmtree(staging_dir)
+        link_tree(base_dir, staging_dir)
+
+        if plan is not None:
+            print(f"Applying delta update ({len(plan.get('changed', []))} changed, {len(plan.get('removed', []))} removed)...")
+            apply_plan(zip_path, staging_dir, plan)
+        else:
+            # Stream every file of the ZIP straight into the staging directory
+            jobs = plan_jobs(zip_path, staging_dir)
+            extract_members(zip_path, jobs)
+            # The stored manifest lists the files of the previous release
+            if resolve_inside(staging_dir, MANIFEST_FILE) not in {dest_file for _, dest_file, _ in jobs}:
+                store_manifest(staging_dir, None)
+
+        # --- WAIT FOR THE LAUNCHER TO EXIT ---
+        print("Waiting for main application to close...")
+        wait_for_parent_exit(parent_pid, main_exe_path)
+
+        # --- SWITCH VERSIONS ---
+        print("Switching to the new version...")
+        swap_directories(base_dir, staging_dir, previous_dir)
+        print(f"Previous version kept in {previous_dir}")
 
         # Cleanup
         print("Cleaning up...")
         try:
-            shutil.rmtree(temp_extract_folder)
+            if plan_path and os.path.exists(plan_path):
+                os.remove(plan_path)
             if os.path.exists(zip_path):
                 os.remove(zip_path)
         except Exception as cleanup_error:
@@ -144,12 +445,13 @@ def main():
 
     except Exception as e:
         print(f"Update failed: {e}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
         show_message(
             "Update Error", 
-            f"An error occurred while applying the update:\n{e}", 
+            f"An error occurred while applying the update:\n{e}\nThe installed version was not modified.", 
             is_error=True
         )
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
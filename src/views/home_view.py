@@ -8,14 +8,20 @@ from modules.launcher import *
 from modules.refresh_handler import *
 from modules.utils import system_ram, open_file, get_app_path
 from modules.updater import has_update, download_launcher_update
+from modules.cache_server import start_cache_server
+from modules.profiling import profiled
+from modules.prefetch import prefetcher
+from modules.app_logging import get_log_file_path
 from widgets.app import WindowTittleBar
 from widgets.RotatingText import HighlightRotatingText
 import minecraft_launcher_lib as mll
 import threading
-import datetime
 import re
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 
 ## ----- FLET UI -----
 
@@ -24,6 +30,7 @@ class HomeView():
     def __init__(self, page: ft.Page, launcher_profiles_view: ft.View):
         self.page = page
         self.ready = False
+        self.game_running = False
 
         self.installed_options: list[ft.DropdownOption] = []
         self.versions_options: list[ft.DropdownOption] = []
@@ -161,6 +168,42 @@ class HomeView():
             on_change=lambda e: app_settings.save_settings(AppData.CHECK_UPDATES_ON_STARTUP, e.control.value)
         )
 
+        self.mirror_input = ft.TextField(
+            label="LAN mirror URL",
+            hint_text="Empty to use the public servers",
+            width=350,
+            border_color=ft.Colors.WHITE24,
+            color=ft.Colors.WHITE,
+            focused_bgcolor="#4A4A4A",
+            focused_border_color=ft.Colors.PRIMARY,
+            value=app_settings.get_setting(AppData.MIRROR_URL)
+        )
+
+        self.serve_cache_switch = ft.Switch(
+            label=f"Share game files on the LAN (port {app_settings.get_setting(AppData.SERVE_CACHE_PORT)}): ",
+            label_position=ft.LabelPosition.LEFT,
+            label_style=ft.TextStyle(size=15, weight=ft.FontWeight.BOLD),
+            value=app_settings.get_setting(AppData.SERVE_CACHE),
+            on_change=lambda e: self.set_cache_server(e.control.value)
+        )
+        self.cache_server = None
+
+        self.backup_worlds_switch = ft.Switch(
+            label="Back up worlds after playing: ",
+            label_position=ft.LabelPosition.LEFT,
+            label_style=ft.TextStyle(size=15, weight=ft.FontWeight.BOLD),
+            value=app_settings.get_setting(AppData.BACKUP_WORLDS),
+            on_change=lambda e: app_settings.save_settings(AppData.BACKUP_WORLDS, e.control.value)
+        )
+
+        self.profiling_switch = ft.Switch(
+            label="Profile the launcher (logs/profiles): ",
+            label_position=ft.LabelPosition.LEFT,
+            label_style=ft.TextStyle(size=15, weight=ft.FontWeight.BOLD),
+            value=app_settings.get_setting(AppData.PROFILING),
+            on_change=lambda e: app_settings.save_settings(AppData.PROFILING, e.control.value)
+        )
+
         self.progress_bar = ft.ProgressBar(value=0, width=400, border_radius=5)
 
         self.progress_window = ft.AlertDialog(
@@ -191,7 +234,7 @@ class HomeView():
             content=ft.Tabs(
                 selected_index=0,
                 animation_duration=0,
-                height=360,
+                height=400,
                 width=400,
                 expand=True,
                 animate_size=ft.Animation(duration=300, curve=ft.AnimationCurve.EASE_OUT),
@@ -212,6 +255,7 @@ class HomeView():
                                 self.maximum_ram_text,
                                 self.system_ram_text,
                                 self.maximum_ram_slider,
+                                self.backup_worlds_switch,
                                 # ft.Text("JVM arguments:", size=15, weight=ft.FontWeight.BOLD)
                             ]
                         )
@@ -227,6 +271,10 @@ class HomeView():
                                 self.check_for_updates_button,
                                 self.check_on_startup,
                                 ft.Divider(),
+                                self.mirror_input,
+                                self.serve_cache_switch,
+                                self.profiling_switch,
+                                ft.Divider(),
                                 ft.Text(f"App Name: {app_name}", size=12),
                                 ft.Text(f"App Version: {app_version}", size=12),
                                 ft.Text("Environment: " + ("Development" if dev_mode else "Production"), size=12),
@@ -274,7 +322,7 @@ class HomeView():
                 ),
                 actions=[
                     ft.TextButton("Repair version", visible=True, on_click=self.repair_version),
-                    ft.TextButton("View logs", on_click=lambda e: open_file(f"logs/launcher-{datetime.date.today()}.log")),
+                    ft.TextButton("View logs", on_click=lambda e: open_file(get_log_file_path())),
                     ft.TextButton("Close", on_click=lambda e: self.page.close(self.error_game_window))
                 ]
             )
@@ -320,7 +368,9 @@ class HomeView():
                         weight="bold"
                     ),
                     width_factor=22,
-                    interval=2
+                    interval=2,
+                    render_mode="pooled",
+                    pause_when=self.is_view_covered
                 )
                 ],
             padding=10,
@@ -366,6 +416,12 @@ class HomeView():
         )
 
 
+    def is_view_covered(self) -> bool:
+        """Whether the home view is hidden by another route, a dialog or a running game."""
+        dialogs = [self.progress_window, self.settings_window, self.username_window, self.error_game_window, self.updater_window]
+        return self.game_running or self.page.route != "/" or any(dialog.open for dialog in dialogs)
+
+
     def close_username_window(self, e: ft.Control = None):
         self.username_input.value = app_settings.get_setting(AppData.USERNAME)
         self.username_input.error_text = None
@@ -375,8 +431,10 @@ class HomeView():
         self.minecraft_directory_input.value = app_settings.return_mc_directory()
         self.java_directory_input.value = app_settings.get_setting(AppData.EXECUTABLE_PATH)
         self.maximum_ram_slider.value = int(re.search(r"\d+", app_settings.get_setting(AppData.JVM_ARGUMENTS)[0]).group())
+        self.mirror_input.value = app_settings.get_setting(AppData.MIRROR_URL)
         self.minecraft_directory_input.error_text = None
         self.java_directory_input.error_text = None
+        self.mirror_input.error_text = None
         self.settings_window.content.selected_index = 0
         self.page.close(self.settings_window)
         self.refresh_settings_tab_window()
@@ -384,8 +442,8 @@ class HomeView():
 
 
 
+    @profiled("HomeView.refresh_ui")
     def refresh_ui(self, e: ft.Control = None):
-        versions = get_versions()
         last_played = app_settings.get_setting(AppData.LAST_PLAYED)
         launcher_profiles_exists = mll.vanilla_launcher.do_vanilla_launcher_profiles_exists(app_settings.return_mc_directory())
         if launcher_profiles_exists:
@@ -423,7 +481,7 @@ class HomeView():
                     app_settings.save_settings(AppData.LAST_PLAYED, "latest-release")
 
         except Exception as e:
-            print(f"Error: {e}")
+            logger.error(f"Error: {e}")
 
         # Set play button text based on Minecraft installation status
         self.refresh_play_button()
@@ -445,7 +503,35 @@ class HomeView():
         self.refresh_ram_slider()
 
         if self.ready == False:
-            self.check_for_updates(open_dialog_window=False, on_startup=app_settings.get_setting(AppData.CHECK_UPDATES_ON_STARTUP))
+            if app_settings.get_setting(AppData.SERVE_CACHE):
+                self.set_cache_server(True)
+
+            # Resume the installs left in the queue by the last session
+            if install_queue.pending():
+                self.ui_install_versions([job["version"] for job in install_queue.pending()])
+
+            # Run in a thread so the update check never delays the first paint
+            self.ready = True
+            thread = threading.Thread(target=self.check_for_updates, kwargs={"open_dialog_window": False, "on_startup": app_settings.get_setting(AppData.CHECK_UPDATES_ON_STARTUP)})
+            thread.daemon = True
+            thread.start()
+
+
+    def set_cache_server(self, enabled: bool):
+        """Starts or stops the LAN cache server and saves the setting."""
+        app_settings.save_settings(AppData.SERVE_CACHE, enabled)
+        try:
+            if enabled and not self.cache_server:
+                self.cache_server = start_cache_server()
+            elif not enabled and self.cache_server:
+                self.cache_server.shutdown()
+                self.cache_server.server_close()
+                self.cache_server = None
+        except Exception as e:
+            self.serve_cache_switch.value = False
+            self.status_text.value = f"Error starting the cache server: {e}"
+            app_settings.save_settings(AppData.SERVE_CACHE, False)
+        self.page.update()
 
 
     def refresh_ram_slider(self, e: ft.Control = None):
@@ -466,25 +552,22 @@ class HomeView():
     def refresh_settings_tab_window(self, e: ft.Control = None):
         selected_index = self.settings_window.content.selected_index
         if selected_index == 0:
-            self.settings_window.content.height = 360
+            self.settings_window.content.height = 400
         elif selected_index == 1:
-            self.settings_window.content.height = 320
+            self.settings_window.content.height = 440
         self.page.update()
 
 
     def refresh_play_button(self, e: ft.Control = None):
         if mll.utils.is_minecraft_installed(app_settings.return_mc_directory()):
-            versions = [v["id"] for v in get_versions()["installed"]]
-            if self.installed_dropdown.value == "latest-release":
-                version = mll.utils.get_latest_version()["release"]
-            elif self.installed_dropdown.value == "latest-snapshot":
-                version = mll.utils.get_latest_version()["snapshot"]
-            else:
-                version = self.installed_dropdown.value
+            versions = get_installed_version_ids()
+            version = resolve_version_id(self.installed_dropdown.value)
             self.play_button.text = "PLAY" if version in versions else "INSTALL"
         else:
             self.play_button.text = "INSTALL"
         self.play_button.update()
+        if self.play_button.text == "INSTALL":
+            prefetcher.select(self.installed_dropdown.value)
 
 
 
@@ -503,8 +586,13 @@ class HomeView():
     def set_settings(self, e: ft.Control = None):
         minecraft_directory: str = self.minecraft_directory_input.value
         java_directory: str = self.java_directory_input.value
+        mirror_url: str = self.mirror_input.value.strip()
         maximum_ram: int = round(self.maximum_ram_slider.value)
-        if not os.path.exists(minecraft_directory) and minecraft_directory != "":
+        if mirror_url and not mirror_url.startswith(("http://", "https://")):
+            self.mirror_input.error_text = "Enter a valid URL (http://host:port)"
+            self.page.update()
+            return
+        elif not os.path.exists(minecraft_directory) and minecraft_directory != "":
             self.minecraft_directory_input.error_text = "Enter a valid directory"
             self.page.update()
             return
@@ -516,50 +604,65 @@ class HomeView():
             app_settings.save_settings(AppData.MC_DIRECTORY, minecraft_directory)
             app_settings.save_settings(AppData.EXECUTABLE_PATH, java_directory)
             app_settings.save_settings(AppData.JVM_ARGUMENTS, [f"-Xmx{maximum_ram}G", f"-Xms{maximum_ram}G"])
+            app_settings.save_settings(AppData.MIRROR_URL, mirror_url)
             self.minecraft_directory_input.error_text = None
             self.java_directory_input.error_text = None
+            self.mirror_input.error_text = None
             self.page.close(self.settings_window)
             refresh()
         
 
     
-    def ui_launch_game(self, e: ft.Control = None):
+    def ui_launch_game(self, e: ft.Control = None, profile_name: str = None):
         selected_version = self.return_current_version(save_version=True)
         if not is_version_installed(selected_version):
             self.ui_install_game(None, selected_version)
             return
+        if profile_name is None:
+            profile_name = self.return_current_profile_name()
         
         # Run in a thread to avoid blocking the Flet UI
         buttons_to_disable = [self.play_button, self.installed_dropdown, self.versions_button, self.settings_button, self.username_button]
-        thread = threading.Thread(target=launch_game, args=(self, selected_version, self.status_text, buttons_to_disable, self.play_button))
+        thread = threading.Thread(target=self.run_game, args=(selected_version, buttons_to_disable, profile_name))
         thread.daemon = True
         thread.start()
+
+
+    def run_game(self, selected_version: str, buttons_to_disable: list, profile_name: str = None):
+        self.game_running = True
+        try:
+            launch_game(self, selected_version, self.status_text, buttons_to_disable, self.play_button, profile_name)
+        finally:
+            self.game_running = False
     
 
     def ui_install_game(self, e: ft.Control = None, selected_version: str = None):
         if not selected_version:
             self.status_text.value = "Please select a version."
             return
-        self.progress_window.title = "Installing Version: " + selected_version
+        self.ui_install_versions([selected_version])
+
+
+    def ui_install_versions(self, version_ids: list[str]):
+        """Queues the versions and opens the progress window (the install queue runs in the background)."""
+        self.progress_window.title = "Installing Version: " + ", ".join(version_ids)
         self.page.open(self.progress_window)
         self.page.update()
-        buttons_to_disable = [self.play_button, self.installed_dropdown, self.versions_button, self.settings_button, self.username_button]
-        thread = threading.Thread(target=install_version, args=(self.page, selected_version, buttons_to_disable, self.progress_window, self.progress_bar,
-                                                                self.status_text, self.progress_text))
-        thread.daemon = True
-        thread.start()
+        # The versions button stays enabled so more versions can be queued from the launcher profiles
+        buttons_to_disable = [self.play_button, self.installed_dropdown, self.settings_button, self.username_button]
+        install_versions(self.page, version_ids, buttons_to_disable, self.progress_window, self.progress_bar, self.status_text, self.progress_text)
 
 
     def error_launch_game(self, error_message: str):
         selected_version = self.return_current_version()
-        self.error_game_window.actions[0].visible = True if mll.utils.is_vanilla_version(selected_version) else False
+        self.error_game_window.actions[0].visible = True if is_vanilla_version(selected_version) else False
         self.error_game_window.content.controls = [ft.Text(value=error_message)]
         self.page.open(self.error_game_window)
 
 
     def repair_version(self, e):
         selected_version = self.return_current_version()
-        if mll.utils.is_vanilla_version(selected_version):
+        if is_vanilla_version(selected_version):
             self.ui_install_game(e, selected_version)
         self.page.close(self.error_game_window)
         
@@ -567,6 +670,11 @@ class HomeView():
         # --- pending: add modded version repair ---
 
 
+    def return_current_profile_name(self) -> str:
+        """Returns the name of the launcher profile selected in the dropdown (None if it is not a profile)."""
+        option = next((option for option in self.installed_dropdown.options or [] if option.key == self.installed_dropdown.value), None)
+        return option.data.get("name") if option and isinstance(option.data, dict) else None
+
     def return_current_version(self, save_version: bool = False) -> str:
         selected_version = self.installed_dropdown.value
 
@@ -575,10 +683,10 @@ class HomeView():
             return
 
         if selected_version == "latest-release":
-            selected_version = mll.utils.get_latest_version()["release"]
+            selected_version = get_latest_version().get("release", selected_version)
             app_settings.save_settings(AppData.LAST_PLAYED, "latest-release") if save_version else None
         elif selected_version == "latest-snapshot":
-            selected_version = mll.utils.get_latest_version()["snapshot"]
+            selected_version = get_latest_version().get("snapshot", selected_version)
             app_settings.save_settings(AppData.LAST_PLAYED, "latest-snapshot") if save_version else None
         else:
             # Save the last played version
@@ -590,11 +698,12 @@ class HomeView():
     def ui_update_launcher(self, e: ft.Control = None):
         self.update_launcher_button.disabled = True
         self.page.update()
-        latest_version = has_update()[1]
+        has_update_result = has_update()
+        latest_version = has_update_result[1]
         self.update_launcher_button.disabled = False
         self.page.update()
         self.page.close(self.updater_window)
-        if not has_update()[0] or not latest_version:
+        if not has_update_result[0] or not latest_version:
             self.status_text.value = "No updates available."
             self.page.update()
             return
@@ -617,7 +726,8 @@ class HomeView():
             ft.ProgressRing(color=ft.Colors.ON_SURFACE, width=20, height=20)
             ])
         self.page.update()
-        has_update_result = has_update()
+        # Manual checks revalidate the cached release metadata, startup checks respect the check interval
+        has_update_result = has_update(force=e is not None)
         if has_update_result[0]:
             self.status_text.value = f"New Update available! Latest version: {has_update_result[1]}"
             tittle_bar.remove_custom_actions()
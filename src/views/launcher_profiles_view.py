@@ -5,9 +5,17 @@
 import flet as ft
 from modules.app_config import *
 from modules.launcher import *
+from modules.mod_sets import list_mod_sets, capture_mod_set, get_profile_mod_set, set_profile_mod_set
+from modules.profiling import profiled
+from modules.version_ids import parse_version_id, build_version_id
+from modules.prefetch import prefetcher
 from widgets.ui import *
 from widgets.app import WindowTittleBar
 import minecraft_launcher_lib as mll
+import logging
+import re
+
+logger = logging.getLogger(__name__)
 
 
 ## ----- FLET UI -----
@@ -89,6 +97,19 @@ class LauncherProfilesView():
             on_change=self.refresh_loader_versions
         )
 
+        self.mod_set_dropdown = ft.Dropdown(
+            label="Mod set",
+            hint_text="Mods linked into the 'mods' folder when this profile starts",
+            options=[],
+            width=300,
+            expand=True,
+            bgcolor="#3C3C3C",
+            border_color=ft.Colors.WHITE24,
+            color=ft.Colors.WHITE,
+            on_change=self.on_mod_set_change
+        )
+        self.editing_profile: str = None # Name of the profile being viewed
+
         self.confirm_button = ft.FilledButton(
             text="Apply",
             on_click=lambda e: self.set_launcher_profile(),
@@ -121,6 +142,7 @@ class LauncherProfilesView():
                     self.version_category_dropdown,
                     self.loader_version_dropdown,
                     self.version_dropdown,
+                    self.mod_set_dropdown,
                     self.confirm_button
                 ]
             ),
@@ -168,13 +190,14 @@ class LauncherProfilesView():
         Refreshes the available loader versions in the dropdown based on the selected game version.
         """
         if self.version_type_dropdown.value == "vanilla":
+            prefetcher.select(self.version_dropdown.value)
             return
-        mod_loader = mll.mod_loader.get_mod_loader(self.version_type_dropdown.value)
-        if mod_loader:
-            loader_versions = mod_loader.get_loader_versions(self.version_dropdown.value, stable_only=True)
+        if self.version_type_dropdown.value in mll.mod_loader.list_mod_loader():
+            loader_versions = get_loader_versions(self.version_type_dropdown.value, self.version_dropdown.value, stable_only=True)
             self.loader_version_dropdown.options = [ft.DropdownOption(v) for v in loader_versions]
             if loader_versions:
                 self.loader_version_dropdown.value = loader_versions[0]
+                prefetcher.select(build_version_id(self.version_type_dropdown.value, loader_versions[0], self.version_dropdown.value))
             else:
                 self.loader_version_dropdown.value = None
         self.page.update()
@@ -209,8 +232,7 @@ class LauncherProfilesView():
 
             # Load all loader versions
             versions = get_versions(version_type=self.version_type_dropdown.value)
-            mod_loader = mll.mod_loader.get_mod_loader(self.version_type_dropdown.value)
-            if mod_loader:
+            if self.version_type_dropdown.value in mll.mod_loader.list_mod_loader():
                 mod_loader_versions = versions["version"]
                 self.versions_options = [ft.DropdownOption(v) for v in mod_loader_versions]
             else:
@@ -224,7 +246,7 @@ class LauncherProfilesView():
                 self.refresh_loader_versions()
 
         except Exception as e:
-            print(f"Error: {e}")
+            logger.error(f"Error: {e}")
 
         finally:
             self.version_dropdown.disabled = False
@@ -234,6 +256,43 @@ class LauncherProfilesView():
 
 
 
+    def refresh_mod_sets(self, profile_name: str = None):
+        """
+        Refreshes the mod set dropdown ("None", the existing mod sets and a new set from the current mods folder).
+        """
+        self.mod_set_dropdown.options = [ft.DropdownOption("", "None")] + [ft.DropdownOption(name) for name in list_mod_sets()]
+        self.mod_set_dropdown.options.append(ft.DropdownOption("__capture__", "New from the mods folder"))
+        self.mod_set_dropdown.value = get_profile_mod_set(profile_name) or ""
+
+
+
+    def on_mod_set_change(self, e: ft.Control = None):
+        """
+        Saves the mod set of the profile being viewed (new profiles save it in set_launcher_profile).
+        """
+        if self.editing_profile:
+            self.apply_mod_set(self.editing_profile)
+            self.page.update()
+
+
+
+    def apply_mod_set(self, profile_name: str):
+        """
+        Assigns the selected mod set to a launcher profile. "New from the mods folder" saves the current mods folder as a mod set named after the profile.
+        """
+        mod_set = self.mod_set_dropdown.value
+        try:
+            if mod_set == "__capture__":
+                mod_set = re.sub(r"[^\w .-]", "_", profile_name).strip(". ") or "profile"
+                capture_mod_set(mod_set)
+                self.refresh_mod_sets()
+                self.mod_set_dropdown.value = mod_set
+            set_profile_mod_set(profile_name, mod_set or None)
+        except Exception as e:
+            logger.error(f"Error saving the mod set: {e}")
+
+
+
     def edit_launcher_profile(self, e: ft.Control = None, edit_profile: mll.types.VanillaLauncherProfile = None):
         """
         Updates UI controls based on the given launcher profile.
@@ -255,7 +314,7 @@ class LauncherProfilesView():
                 self.version_category_dropdown.value = category
 
                 # Retrieve the latest version based on the category
-                latest_versions = mll.utils.get_latest_version()
+                latest_versions = get_latest_version()
                 latest_version = latest_versions.get(category)
                 self.version_dropdown.options = [ft.DropdownOption(latest_version)]
                 self.version_dropdown.value = latest_version
@@ -269,34 +328,19 @@ class LauncherProfilesView():
                 self.version_dropdown.options = [ft.DropdownOption(edit_profile["version"])]
                 self.version_dropdown.value = edit_profile["version"]
 
-                if mll.utils.is_vanilla_version(edit_profile["version"]):
+                if is_vanilla_version(edit_profile["version"]):
                     self.version_type_dropdown.value = "vanilla"
                     # Iterate through the versions dictionary to identify the version category
                     for category, version_list in get_versions().items():
                         if self.version_dropdown.value in version_list:
                             self.version_category_dropdown.value = category
-                            print(f"Category: {category}, version: {self.version_dropdown.value}")
+                            logger.debug(f"Category: {category}, version: {self.version_dropdown.value}")
                             break
                     self.version_category_dropdown.visible = True
                     self.loader_version_dropdown.visible = False
 
-                elif any(elem in edit_profile["version"] for elem in ["fabric", "forge", "quilt"]):
-                    if "fabric-loader" in edit_profile["version"]:
-                        loader = "fabric"
-                    elif "quilt-loader" in edit_profile["version"]:    
-                        loader = "quilt"
-                    elif "-forge-" in edit_profile["version"]:
-                        loader = "forge"
-
-                    version_items = edit_profile["version"].split("-")
-                    print(version_items)
-                    if loader == "fabric" or loader == "quilt":
-                        version = version_items[3]
-                        loader_version = version_items[2]
-                    elif loader == "forge":
-                        version = version_items[0]
-                        loader_version = version_items[2]
-
+                elif parse_version_id(edit_profile["version"]):
+                    loader, loader_version, version = parse_version_id(edit_profile["version"])
                     self.version_type_dropdown.value = loader
                     self.version_dropdown.options = [ft.DropdownOption(version)]
                     self.version_dropdown.value = self.version_dropdown.options[0].key
@@ -311,6 +355,11 @@ class LauncherProfilesView():
                     self.loader_version_dropdown.visible = False
                     self.version_category_dropdown.visible = False
 
+            # The mod set can still be changed
+            self.editing_profile = edit_profile["name"] if version_type == "custom" else None
+            self.refresh_mod_sets(self.editing_profile)
+            self.mod_set_dropdown.visible = version_type == "custom"
+
             # Disable UI controls to prevent further editing
             self.profile_name_input.disabled = True
             self.version_category_dropdown.disabled = True
@@ -325,6 +374,10 @@ class LauncherProfilesView():
             self.version_category_dropdown.value = "release"
             self.version_type_dropdown.value = "vanilla"
 
+            self.editing_profile = None
+            self.refresh_mod_sets()
+            self.mod_set_dropdown.visible = True
+
             # Enable necessary UI controls for a new profile
             self.version_category_dropdown.visible = True
             self.profile_name_input.disabled = False
@@ -351,7 +404,7 @@ class LauncherProfilesView():
                     launcher_profile["versionType"] if launcher_profile["versionType"] in {"latest-release", "latest-snapshot"} else launcher_profile["version"])
         self.page.go("/")
         refresh()
-        app_settings.views["home_view"].ui_launch_game()
+        app_settings.views["home_view"].ui_launch_game(profile_name=launcher_profile["name"])
 
 
 
@@ -377,13 +430,11 @@ class LauncherProfilesView():
                     "name": self.profile_name_input.value if self.profile_name_input.value else f"{self.version_type_dropdown.value.capitalize()} {self.version_dropdown.value}",
                     "versionType": "custom"
                 }
-                if self.version_type_dropdown.value == "forge":
-                    profile["version"] = f"{self.version_dropdown.value}-forge-{self.loader_version_dropdown.value}"
-                else:
-                    profile["version"] = f"{self.version_type_dropdown.value}-loader-{self.loader_version_dropdown.value}-{self.version_dropdown.value}"
+                profile["version"] = build_version_id(self.version_type_dropdown.value, self.loader_version_dropdown.value, self.version_dropdown.value)
 
             mll.vanilla_launcher.add_vanilla_launcher_profile(app_settings.return_mc_directory(), profile)
-            print(f"The player profile was established: {profile['name']}")
+            self.apply_mod_set(profile["name"])
+            logger.info(f"The player profile was established: {profile['name']}")
             app_settings.save_settings(AppData.LAST_PLAYED, profile["version"])
             self.page.close(self.launcher_profiles_window)
             refresh()
@@ -395,6 +446,7 @@ class LauncherProfilesView():
 
 
 
+    @profiled("LauncherProfilesView.refresh_ui")
     def refresh_ui(self, e=None):
         """
         Refreshes the UI by loading Vanilla Launcher profiles.
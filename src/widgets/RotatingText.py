@@ -16,7 +16,8 @@ from flet import (
     app,
 )
 import asyncio
-from typing import Union
+import math
+from typing import Callable, Union
 
 
 class HighlightRotatingText(Row):
@@ -32,6 +33,8 @@ class HighlightRotatingText(Row):
         - Auto-resizing box width based on the text length.
         - Supports looping or stopping at the last phrase.
         - Fade-out + letter-by-letter animation when switching phrases.
+        - Low-overhead render modes (pooled glyphs or a single control) with a capped update rate.
+        - Pauses automatically while hidden, minimized or when 'pause_when' returns True.
 
     Args:
         static_text (str): Text displayed before the animated box.
@@ -46,6 +49,11 @@ class HighlightRotatingText(Row):
         speed (float): Delay in seconds between showing each letter.
         width_factor (int): Approximate pixels per character to calculate box width.
         static_style (TextStyle | None): Custom style for static text.
+        render_mode (str): "letters" (new control per letter), "pooled" (reuses a pool of
+            letter controls) or "single" (one control animated per phrase).
+        max_fps (int): Maximum number of updates per second sent while animating letters.
+        pause_when (Callable[[], bool] | None): Extra pause condition (e.g. a dialog is open).
+        pause_poll (float): Seconds between checks while paused.
     """
 
     def __init__(
@@ -62,6 +70,10 @@ class HighlightRotatingText(Row):
         speed: float = 0.05,
         width_factor: int = 20,
         static_style: TextStyle | None = None,
+        render_mode: str = "letters",  # "letters", "pooled", "single"
+        max_fps: int = 30,
+        pause_when: Union[Callable[[], bool], None] = None,
+        pause_poll: float = 0.5,
     ):
         super().__init__()
         self.interval = interval
@@ -73,6 +85,10 @@ class HighlightRotatingText(Row):
         self.direction = direction
         self.speed = speed
         self.width_factor = width_factor
+        self.render_mode = render_mode
+        self.max_fps = max_fps
+        self.pause_when = pause_when
+        self.pause_poll = pause_poll
         self.alignment = MainAxisAlignment.CENTER
 
         # Normalize phrases to list
@@ -82,6 +98,7 @@ class HighlightRotatingText(Row):
 
         self.index = 0
         self.running = False
+        self.glyph_pool: list[Text] = []
 
         # Static text
         self.static = Text(
@@ -102,6 +119,11 @@ class HighlightRotatingText(Row):
 
         self.controls = [self.static, self.animated_box]
 
+        # Single control used by the "single" render mode
+        if self.render_mode == "single":
+            self.single_text = self._new_letter("")
+            self.row.controls.append(self.single_text)
+
     # ------------------------------
     # Animation helpers
     # ------------------------------
@@ -117,41 +139,86 @@ class HighlightRotatingText(Row):
             return (1, 0)
         return (0, 1)
 
+    def _new_letter(self, value: str) -> Text:
+        """Create a letter control at its entry position."""
+        return Text(
+            value=value,
+            size=self.size,
+            color=self.color,
+            weight=FontWeight.BOLD if self.bold else None,
+            offset=self._get_offset(),
+            animate_offset=Animation(400, "easeOut"),
+            opacity=0,
+            animate_opacity=Animation(400, "easeOut"),
+        )
+
+    def _get_pooled_letters(self, text: str) -> list[Text]:
+        """Reuse pooled letter controls for the phrase and hide the rest."""
+        while len(self.glyph_pool) < len(text):
+            letter = self._new_letter("")
+            self.glyph_pool.append(letter)
+            self.row.controls.append(letter)
+        offset = self._get_offset()
+        for i, letter in enumerate(self.glyph_pool):
+            letter.visible = i < len(text)
+            if letter.visible:
+                letter.value = text[i]
+                letter.offset = offset
+                letter.opacity = 0
+        return self.glyph_pool[:len(text)]
+
+    def _is_paused(self) -> bool:
+        """Whether the animation should pause (hidden widget, minimized window or custom condition)."""
+        if not self.visible or not self.page:
+            return True
+        try:
+            if self.page.window.minimized:
+                return True
+        except Exception:
+            pass
+        return bool(self.pause_when and self.pause_when())
+
     async def _animate_text(self, text: str):
         """Animate letters of a single phrase into the box."""
-        self.row.controls.clear()
-
         # Adapt width dynamically
         self.animated_box.width = len(text) * self.width_factor
-        self.update()
 
-        offset = self._get_offset()
-        letters = [
-            Text(
-                value=ch,
-                size=self.size,
-                color=self.color,
-                weight=FontWeight.BOLD if self.bold else None,
-                offset=offset,
-                animate_offset=Animation(400, "easeOut"),
-                opacity=0,
-                animate_opacity=Animation(400, "easeOut"),
-            )
-            for ch in text
-        ]
-        self.row.controls.extend(letters)
+        if self.render_mode == "single":
+            # Whole phrase in one control: two updates per phrase
+            self.single_text.value = text
+            self.single_text.offset = self._get_offset()
+            self.single_text.opacity = 0
+            self.update()
+            await asyncio.sleep(max(self.speed, 1 / self.max_fps))
+            self.single_text.offset = (0, 0)
+            self.single_text.opacity = 1
+            self.update()
+            return
+
+        if self.render_mode == "pooled":
+            letters = self._get_pooled_letters(text)
+        else:
+            self.row.controls.clear()
+            letters = [self._new_letter(ch) for ch in text]
+            self.row.controls.extend(letters)
         self.update()
 
-        # Animate letters one by one
-        for letter in letters:
-            letter.offset = (0, 0)
-            letter.opacity = 1
+        # Animate letters, revealing several per update when 'speed' is faster than 'max_fps'
+        step = max(1, math.ceil((1 / self.max_fps) / self.speed)) if self.speed > 0 and self.max_fps > 0 else 1
+        for i in range(0, len(letters), step):
+            for letter in letters[i:i + step]:
+                letter.offset = (0, 0)
+                letter.opacity = 1
             self.update()
-            await asyncio.sleep(self.speed)
+            await asyncio.sleep(self.speed * step)
 
     async def _rotate(self):
         """Rotate through phrases continuously (or until stopped)."""
         while self.running:
+            if self._is_paused():
+                await asyncio.sleep(self.pause_poll)
+                continue
+
             phrase = self.phrases[self.index]
             await self._animate_text(phrase)
             await asyncio.sleep(self.interval)